@@ -0,0 +1,16 @@
+import pytest
+
+from wzdx.tools import cdot_geospatial_api, gis_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_default_api(monkeypatch):
+    """Start each test without a process-wide default GeospatialApi, so tests which patch GeospatialApi get a new default api"""
+    monkeypatch.setattr(cdot_geospatial_api, "_default_api", None)
+    monkeypatch.setattr(cdot_geospatial_api, "_default_api_created", False)
+
+
+@pytest.fixture(autouse=True)
+def reset_route_profiles():
+    """Start each test with empty shared route profiles, so profiles loaded from one test's mocked GIS responses don't leak into the next"""
+    gis_cache.ROUTE_PROFILES.clear()
@@ -119,6 +119,7 @@ def test_combine_with_wzdx_reversed(attenuator_patch):
         215,
         17.597,
         25.358,
+        cdotGeospatialApi=None,
     )
     assert actual == expected
 
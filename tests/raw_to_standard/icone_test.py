@@ -10,8 +10,8 @@ from datetime import datetime
 
 @patch.object(argparse, "ArgumentParser")
 def test_parse_navjoy_arguments(argparse_mock):
-    navjoyFile, outputFile = icone.parse_rtdh_arguments()
-    assert navjoyFile is not None and outputFile is not None
+    navjoyFile, outputFile, workers = icone.parse_rtdh_arguments()
+    assert navjoyFile is not None and outputFile is not None and workers is not None
 
 
 # --------------------------------------------------------------------------------Unit test for parse_icone_polyline function--------------------------------------------------------------------------------
@@ -23,8 +23,8 @@ def compare_lists(list1, list2):
 
 @patch.object(argparse, "ArgumentParser")
 def test_parse_navjoy_arguments(argparse_mock):
-    navjoyFile, outputFile = navjoy_568.parse_rtdh_arguments()
-    assert navjoyFile is not None and outputFile is not None
+    navjoyFile, outputFile, workers = navjoy_568.parse_rtdh_arguments()
+    assert navjoyFile is not None and outputFile is not None and workers is not None
 
 
 # --------------------------------------------------------------------------------Unit test for validate_closure function--------------------------------------------------------------------------------
@@ -279,6 +279,20 @@ def test_expand_speed_zone_1():
     assert compare_lists(expected_results.test_expand_speed_zone_1_expected, actual)
 
 
+def test_expand_speed_zone_shares_geometry():
+    event = json.loads(
+        expected_results.test_generate_standard_messages_from_string_input
+    )[0]
+    original = json.dumps(event)
+
+    actual = navjoy_568.expand_speed_zone(event)
+
+    assert len(actual) > 1
+    assert all(m["data"]["srzmap"] is event["data"]["srzmap"] for m in actual)
+    # The original message is left unchanged
+    assert json.dumps(event) == original
+
+
 def test_expand_speed_zone_2():
     event = {
         "sys_gUid": "Form568-cb0fdaf0-c27a-4bef-aabd-442615dfb2d6",
@@ -5,17 +5,27 @@ from tests.data.raw_to_standard import (
     description_arsenal,
     planned_events_test_expected_results as expected_results,
 )
-from wzdx.tools import cdot_geospatial_api, geospatial_tools
+from wzdx.tools import (
+    cdot_geospatial_api,
+    fingerprint_store,
+    geospatial_tools,
+    gis_rate_limit,
+    local_lrs,
+)
 import uuid
 import argparse
+import copy
+import io
 import json
 from unittest.mock import MagicMock, patch
 
 
 @patch.object(argparse, "ArgumentParser")
 def test_parse_navjoy_arguments(argparse_mock):
-    navjoyFile, outputFile = planned_events.parse_rtdh_arguments()
-    assert navjoyFile is not None and outputFile is not None
+    navjoyFile, outputFile, workers, fingerprintStore, gisSnapshot = (
+        planned_events.parse_rtdh_arguments()
+    )
+    assert navjoyFile is not None and outputFile is not None and workers is not None
 
 
 # --------------------------------------------------------------------------------Unit test for validate_closure function--------------------------------------------------------------------------------
@@ -122,6 +132,20 @@ def test_expand_event_directions_1():
     assert expected_results.test_expand_speed_zone_1_expected == actual
 
 
+def test_expand_event_directions_shares_geometry():
+    event = json.loads(
+        expected_results.test_generate_standard_messages_from_string_input
+    )
+    original = json.dumps(event)
+
+    actual = planned_events.expand_event_directions(event)
+
+    assert [m["properties"]["direction"] for m in actual] == ["eastbound", "westbound"]
+    assert all(m["geometry"] is event["geometry"] for m in actual)
+    # The original event is left unchanged
+    assert json.dumps(event) == original
+
+
 def test_expand_event_directions_2():
     event = {
         "type": "Feature",
@@ -186,6 +210,167 @@ def test_generate_standard_messages_from_string(_):
     assert actual_standard == expected
 
 
+@patch.object(planned_events, "create_rtdh_standard_msg")
+def test_generate_standard_messages_from_stream(create_rtdh_standard_msg):
+    create_rtdh_standard_msg.side_effect = lambda api, pd, *args: {
+        "direction": pd.get("properties/direction")
+    }
+    api = MagicMock()
+    api.get_route_and_measure_many.side_effect = lambda points: [None] * len(points)
+    event = expected_results.test_generate_standard_messages_from_string_input
+    stream = io.StringIO(json.dumps(json.loads(event)) + "\n" + event)
+
+    messages = planned_events.generate_standard_messages_from_stream(
+        api, stream, batchSize=3
+    )
+
+    # Messages are generated lazily, 1 for each lane impact direction of each event
+    assert api.get_route_and_measure_many.call_count == 0
+    assert [m["direction"] for m in messages] == [
+        "eastbound",
+        "westbound",
+        "eastbound",
+        "westbound",
+    ]
+    assert api.get_route_and_measure_many.call_count == 2
+
+
+@patch.object(planned_events, "get_event_status")
+def test_get_route_details_map_priorities(get_event_status):
+    get_event_status.side_effect = lambda message: message["properties"]["status"]
+    priorities = []
+
+    def get_route_and_measure_many(points):
+        priorities.append((gis_rate_limit.get_request_priority(), points))
+        return [None] * len(points)
+
+    api = MagicMock()
+    api.get_route_and_measure_many.side_effect = get_route_and_measure_many
+    messages = [
+        {
+            "properties": {"id": "OpenTMS-Event1", "status": status},
+            "geometry": {"type": "MultiPoint", "coordinates": [[lng, 39], [lng, 40]]},
+        }
+        for lng, status in [(-105, "planned"), (-106, "active")]
+    ]
+
+    planned_events.get_route_details_map(api, messages)
+
+    # Route details of live events are prefetched first
+    assert priorities == [
+        (gis_rate_limit.PRIORITY_LIVE, [(39, -106), (40, -106)]),
+        (gis_rate_limit.PRIORITY_PLANNED, [(39, -105), (40, -105)]),
+    ]
+
+
+def create_local_api():
+    return local_lrs.LocalGeospatialApi({})
+
+
+def get_raw_messages(count):
+    event = json.loads(
+        expected_results.test_generate_standard_messages_from_string_input
+    )
+    raw_messages = []
+    for i in range(count):
+        event["properties"]["id"] = f"OpenTMS-Event{i}"
+        raw_messages.extend(
+            planned_events.expand_event_directions(copy.deepcopy(event))
+        )
+    return raw_messages
+
+
+def test_generate_standard_messages_parallel():
+    raw_messages = get_raw_messages(8)
+
+    actual = planned_events.generate_standard_messages_parallel(
+        raw_messages, workers=2, apiFactory=create_local_api
+    )
+    expected = planned_events.generate_standard_messages_from_raw(
+        raw_messages, create_local_api()
+    )
+
+    assert len(actual) == 8
+    assert [m["event"]["source"]["id"] for m in actual] == [
+        m["event"]["source"]["id"] for m in expected
+    ]
+
+
+def test_generate_standard_messages_from_raw_isolates_failures():
+    raw_messages = get_raw_messages(3)
+    translate = planned_events.generate_rtdh_standard_message_from_raw_single
+
+    def generate(api, message, route_details_map):
+        if message["properties"]["id"] == "OpenTMS-Event1":
+            raise ValueError("Invalid event")
+        return translate(api, message, route_details_map)
+
+    with patch.object(
+        planned_events, "generate_rtdh_standard_message_from_raw_single", generate
+    ):
+        actual = planned_events.generate_standard_messages_from_raw(
+            raw_messages, create_local_api()
+        )
+
+    assert [m["event"]["source"]["id"] for m in actual] == [
+        "OpenTMS-Event0_eastbound",
+        "OpenTMS-Event2_eastbound",
+    ]
+
+
+def create_standard_msg(api, pd, isIncident, routeDetailsMap):
+    return {
+        "rtdh_timestamp": 0,
+        "rtdh_message_id": "",
+        "event": {
+            "source": {
+                "id": pd.get("properties/id") + "_" + pd.get("properties/direction")
+            },
+            "header": {"start_timestamp": 0, "end_timestamp": 0},
+            "additional_info": {
+                "route_details_start": {"Route": "025A", "Measure": 1},
+                "condition_1": True,
+            },
+        },
+    }
+
+
+def test_generate_standard_messages_incremental():
+    raw_messages = get_raw_messages(3)
+    store = fingerprint_store.FingerprintStore()
+
+    with patch.object(
+        planned_events, "create_rtdh_standard_msg", side_effect=create_standard_msg
+    ) as create_mock:
+        first = planned_events.generate_standard_messages_incremental(
+            raw_messages, store, create_local_api()
+        )
+        assert create_mock.call_count == 6
+        assert len(store) == 6
+
+        # Unchanged events are reused, with refreshed time dependent fields
+        raw_messages[2]["properties"] = {
+            **raw_messages[2]["properties"],
+            "lastUpdated": "2021-10-30T00:00:00.000+00:00",
+        }
+        second = planned_events.generate_standard_messages_incremental(
+            raw_messages[:4], store, create_local_api()
+        )
+        assert create_mock.call_count == 7
+        assert create_mock.call_args[0][1].get("properties/id") == "OpenTMS-Event1"
+
+    assert [m["event"]["source"]["id"] for m in second] == [
+        "OpenTMS-Event0_eastbound",
+        "OpenTMS-Event0_westbound",
+        "OpenTMS-Event1_eastbound",
+        "OpenTMS-Event1_westbound",
+    ]
+    assert second[0]["rtdh_message_id"] != first[0]["rtdh_message_id"]
+    assert second[0]["event"]["header"]["start_timestamp"] == 1635531964000
+    assert second[0]["event"]["additional_info"]["condition_1"] is False
+    assert len(store) == 4
+
+
 def test_get_lanes_list_1():
     lane_closures_hex = "6000"
     num_lanes = 2
@@ -535,7 +720,7 @@ class MockGeospatialApi:
             },
         ]
 
-    def get_route_between_measures(self, arg1, arg2, arg3, compressed):
+    def get_route_between_measures(self, arg1, arg2, arg3, compressed, **kwargs):
         return [[2, 3], [0, 1]]
 
 
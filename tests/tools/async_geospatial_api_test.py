@@ -0,0 +1,250 @@
+import asyncio
+import json
+import urllib.parse
+from unittest.mock import AsyncMock, MagicMock
+
+from wzdx.tools import (
+    async_geospatial_api,
+    cdot_geospatial_api,
+    gis_cache,
+    gis_rate_limit,
+    gis_retry,
+)
+
+
+class MockFetch:
+    """Async transport for a straight, northbound route 025A, with a vertex every mile (lat 39.0 + measure * 0.01)"""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.urls = []
+        self.inFlight = 0
+        self.maxInFlight = 0
+
+    async def __call__(self, url, timeout):
+        self.urls.append(url)
+        self.inFlight += 1
+        self.maxInFlight = max(self.maxInFlight, self.inFlight)
+        try:
+            await asyncio.sleep(self.delay)
+            return json.dumps(self.get_response(url))
+        finally:
+            self.inFlight -= 1
+
+    def get_response(self, url):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+        if "/ROUTE?" in url:
+            attributes = {"Route": query["routeId"][0], "MMin": 0, "MMax": 10}
+            return {"features": [{"attributes": attributes}]}
+        if "/MeasureAtPoint?" in url:
+            measure = round((float(query["y"][0]) - 39.0) / 0.01, 3)
+            attributes = {"Route": "025A", "Measure": measure, "MMin": 0, "MMax": 10}
+            attributes["Distance"] = 1
+            return {"features": [{"attributes": attributes}]}
+        if "/PointAtMeasure?" in url:
+            measure = float(query["measure"][0])
+            return {
+                "features": [{"geometry": {"x": -105.0, "y": 39.0 + measure * 0.01}}]
+            }
+        fromMeasure = float(query["fromMeasure"][0])
+        toMeasure = float(query["toMeasure"][0])
+        low, high = sorted((fromMeasure, toMeasure))
+        measures = [low] + [m for m in range(11) if low < m < high] + [high]
+        if fromMeasure > toMeasure:
+            measures.reverse()
+        paths = [[[-105.0, 39.0 + m * 0.01] for m in measures]]
+        return {"features": [{"geometry": {"paths": paths}}]}
+
+
+def get_api(fetch, **kwargs):
+    api = cdot_geospatial_api.GeospatialApi(
+        BASE_URL="https://gis", session=MagicMock(), routeProfiles=None
+    )
+    return async_geospatial_api.AsyncGeospatialApi(api, fetch=fetch, **kwargs)
+
+
+def get_session(fetch):
+    """Blocking session serving the same route as fetch"""
+
+    def get(url, timeout):
+        fetch.urls.append(url)
+        response = MagicMock()
+        response.content = json.dumps(fetch.get_response(url)).encode("utf-8")
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+def test_get_route_and_measure():
+    async def run():
+        async with get_api(MockFetch()) as api:
+            return (
+                await api.get_route_and_measure((39.05, -105.0)),
+                await api.get_route_and_measure((39.05, -105.0), 190),
+            )
+
+    route_details, route_details_heading = asyncio.run(run())
+    assert route_details == {
+        "Route": "025A",
+        "Measure": 5,
+        "MMin": 0,
+        "MMax": 10,
+        "Distance": 1,
+    }
+    assert route_details_heading["Direction"] == "-"
+
+
+def test_get_point_at_measure_and_route_between_measures():
+    async def run():
+        async with get_api(MockFetch()) as api:
+            return (
+                await api.get_point_at_measure("025A", 2),
+                await api.get_route_between_measures("025A", 4.5, 2.5),
+                await api.get_route_geometry_ahead("025A", 5, 10, 2),
+            )
+
+    latLng, linestring, ahead = asyncio.run(run())
+    assert latLng == (39.02, -105.0)
+    # Decreasing measures select the _DEC route, traversed from the higher measure
+    assert [round(c[1], 3) for c in linestring] == [39.045, 39.04, 39.03, 39.025]
+    assert ahead["start_measure"] == 5
+    assert ahead["end_measure"] == 7
+
+
+def test_concurrency_limit_and_single_flight():
+    fetch = MockFetch(delay=0.01)
+
+    async def run():
+        async with get_api(fetch, maxConcurrency=4) as api:
+            points = [(39.0 + i * 0.001, -105.0) for i in range(20)]
+            return await api.get_route_and_measure_many(points + points)
+
+    results = asyncio.run(run())
+    assert len(results) == 40
+    assert results[0] == results[20]
+    assert results[0] is not results[20]
+    assert len(fetch.urls) == 20
+    assert fetch.maxInFlight == 4
+
+
+def test_async_cache_hooks():
+    cache = {}
+
+    async def get_cached(url):
+        return cache.get(url)
+
+    async def set_cached(url, response):
+        cache[url] = response
+
+    fetch = MockFetch()
+
+    async def run():
+        api = get_api(fetch, getCachedRequest=get_cached, setCachedRequest=set_cached)
+        await api.get_point_at_measure("025A", 2)
+        await api.get_point_at_measure("025A", 2)
+        return api
+
+    api = asyncio.run(run())
+    assert len(fetch.urls) == 1
+    assert len(cache) == 1
+    assert api.api.metrics.snapshot()["totals"]["cache_hits"] == 1
+
+
+def test_circuit_breaker():
+    async def fetch(url, timeout):
+        raise ConnectionError("GIS server down")
+
+    async def run():
+        api = get_api(fetch)
+        api.api.circuitBreaker = gis_retry.CircuitBreaker(failureThreshold=2)
+        return [await api.get_point_at_measure("025A", m) for m in range(3)], api
+
+    results, api = asyncio.run(run())
+    assert results == [None, None, None]
+    assert api.api.circuitBreaker.rejected == 1
+
+
+def test_route_profiles_and_slices_match_sync():
+    def get_sync_api(session):
+        return cdot_geospatial_api.GeospatialApi(
+            BASE_URL="https://gis",
+            session=session,
+            singleFlight=cdot_geospatial_api.SingleFlight(),
+            routeProfiles=gis_cache.RouteProfileCache(),
+            routeSlices=gis_cache.RouteSliceCache(),
+        )
+
+    syncFetch = MockFetch()
+    syncApi = get_sync_api(get_session(syncFetch))
+    expected = (
+        syncApi.get_route_and_measure((39.05, -105.0), 190),
+        syncApi.get_route_between_measures("025A", 4.5, 2.5),
+        syncApi.get_route_geometry_ahead("025A", 5, 10, 2),
+    )
+
+    fetch = MockFetch()
+
+    async def run():
+        api = get_sync_api(MagicMock())
+        async with async_geospatial_api.AsyncGeospatialApi(api, fetch=fetch) as api:
+            return (
+                await api.get_route_and_measure((39.05, -105.0), 190),
+                await api.get_route_between_measures("025A", 4.5, 2.5),
+                await api.get_route_geometry_ahead("025A", 5, 10, 2),
+            )
+
+    assert asyncio.run(run()) == expected
+    assert expected[0]["Direction"] == "-"
+    # Direction and geometry ahead come from the route profile, sections of route from the cached windows
+    assert sorted(fetch.urls) == sorted(syncFetch.urls)
+    assert not any("fromMeasure=4.5" in url for url in fetch.urls)
+
+
+def test_circuit_breaker_half_open_trial_released():
+    async def fetch(url, timeout):
+        await asyncio.Event().wait()
+
+    clock = {"now": 0}
+    breaker = gis_retry.CircuitBreaker(
+        failureThreshold=1, resetTimeout=30, clock=lambda: clock["now"]
+    )
+    breaker.record_failure()
+    clock["now"] = 30
+
+    async def run():
+        api = get_api(fetch)
+        api.api.circuitBreaker = breaker
+        limiter = MagicMock()
+        limiter.acquire_async = AsyncMock(return_value=False)
+        api.api.rateLimiter = limiter
+        # Timing out on the rate limit doesn't claim the half-open trial
+        assert await api.get_point_at_measure("025A", 1) is None
+
+        # Neither does a trial request which is cancelled
+        limiter.acquire_async.return_value = True
+        url = api.api._get_point_at_measure_url("025A", 2)
+        task = asyncio.ensure_future(api._fetch_cached_web_request(url, 15, "test"))
+        await asyncio.sleep(0.01)
+        assert not breaker.allow_request()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert breaker.state == breaker.HALF_OPEN
+        assert breaker.allow_request()
+
+    asyncio.run(run())
+
+
+def test_rate_limiter():
+    fetch = MockFetch()
+
+    async def run():
+        api = get_api(fetch)
+        api.api.rateLimiter = gis_rate_limit.TokenBucketRateLimiter(rate=200, burst=1)
+        return await asyncio.gather(
+            *[api.get_point_at_measure("025A", m) for m in range(5)]
+        )
+
+    assert asyncio.run(run())[2] == (39.02, -105.0)
+    assert len(fetch.urls) == 5
@@ -1,4 +1,17 @@
-from wzdx.tools import cdot_geospatial_api
+import concurrent.futures
+import json
+import threading
+import time
+import urllib.parse
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wzdx.tools import cdot_geospatial_api, geospatial_tools, gis_cache, gis_stub_server
+
+# GIS responses recorded from a GisStubServer serving 2D geometry, for a route with measures which are not proportional to
+# distance, see `local_lrs_test.RECORDED_RESPONSES`
+RECORDED_RESPONSES = "./tests/data/tools/gis_recorded_responses.ndjson"
 
 
 def test_get_routes_list():
@@ -95,3 +108,305 @@ def test_get_route_between_measures_compressed_allow_reversal():
         routeId, startMeasure, endMeasure, compressed=True
     )
     assert len(actual) == 81
+
+
+def test_create_session_pool_sizes():
+    session = cdot_geospatial_api.create_session(poolConnections=4, poolMaxSize=8)
+    adapter = session.get_adapter("https://dtdapps.codot.gov")
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 8
+    assert session.headers["Connection"] == "keep-alive"
+
+
+def test_session_created_on_first_request():
+    api = cdot_geospatial_api.GeospatialApi()
+    assert api._session is None
+
+    session = api.session
+    assert session is api.session
+    api.close()
+    assert api._session is None
+
+
+def test_make_web_request_uses_shared_session():
+    session = MagicMock()
+    session.get.return_value.content = b'{"routes": []}'
+    api_1 = cdot_geospatial_api.GeospatialApi(session=session)
+    api_2 = cdot_geospatial_api.GeospatialApi(session=session)
+
+    assert api_1.get_routes_list() == []
+    assert api_2.get_routes_list() == []
+    assert session.get.call_count == 2
+
+    # Shared sessions are owned by the caller, and are not closed by the api
+    api_1.close()
+    session.close.assert_not_called()
+
+
+def test_get_route_and_measure_many():
+    def get_route_and_measure(latLng, heading=None, tolerance=10000):
+        if latLng == (2, 2):
+            raise ValueError("invalid point")
+        return {"Route": "070A", "Measure": latLng[0], "Direction": heading}
+
+    api = cdot_geospatial_api.GeospatialApi()
+    with patch.object(
+        api, "get_route_and_measure", side_effect=get_route_and_measure
+    ) as mock:
+        actual = api.get_route_and_measure_many(
+            [(3, 3), (1, 1, 90), (2, 2), (3, 3)], maxWorkers=2
+        )
+
+    assert actual == [
+        {"Route": "070A", "Measure": 3, "Direction": None},
+        {"Route": "070A", "Measure": 1, "Direction": 90},
+        None,
+        {"Route": "070A", "Measure": 3, "Direction": None},
+    ]
+    # Duplicate points are only requested once, but returned as separate objects
+    assert mock.call_count == 3
+    assert actual[0] is not actual[3]
+
+
+def test_get_route_and_measure_many_memo():
+    memo = gis_cache.RouteMeasureMemo()
+    memo.set((5, 4), None, 10000, {"Route": "memo", "Measure": 5})
+    api = cdot_geospatial_api.GeospatialApi(routeMeasureMemo=memo)
+    with patch.object(
+        api,
+        "_get_route_and_measure",
+        side_effect=lambda latLng, heading, tolerance: {
+            "Route": "070A",
+            "Measure": latLng[0],
+        },
+    ) as mock:
+        actual = api.get_route_and_measure_many(
+            [(1, 0), (5, 4), (1, 0.0000001), (3, 2)]
+        )
+
+    # Memoized points, and points in the same memo grid cell, are not looked up again
+    assert sorted(call.args[0] for call in mock.call_args_list) == [(1, 0), (3, 2)]
+    assert actual == [
+        {"Route": "070A", "Measure": 1},
+        {"Route": "memo", "Measure": 5},
+        {"Route": "070A", "Measure": 1},
+        {"Route": "070A", "Measure": 3},
+    ]
+    assert memo.get((3, 2)) == (True, {"Route": "070A", "Measure": 3})
+
+
+def test_get_route_and_measure_many_empty():
+    assert cdot_geospatial_api.GeospatialApi().get_route_and_measure_many([]) == []
+
+
+def test_make_cached_web_request_single_flight():
+    started = threading.Event()
+    release = threading.Event()
+
+    def get(url, timeout):
+        started.set()
+        release.wait(5)
+        response = MagicMock()
+        response.content = b'{"routes": [{"routeID": "070A"}]}'
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    singleFlight = cdot_geospatial_api.SingleFlight()
+    api = cdot_geospatial_api.GeospatialApi(session=session, singleFlight=singleFlight)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(api.get_routes_list)
+        started.wait(5)
+        followers = [executor.submit(api.get_routes_list) for _ in range(3)]
+        while singleFlight.coalesced < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == [[{"routeID": "070A"}]] * 4
+    assert session.get.call_count == 1
+
+    # Completed requests are not coalesced
+    release.set()
+    api.get_routes_list()
+    assert session.get.call_count == 2
+
+
+def test_single_flight_exception():
+    singleFlight = cdot_geospatial_api.SingleFlight()
+    with pytest.raises(ValueError):
+        singleFlight.do("url", MagicMock(side_effect=ValueError("failed")))
+    assert singleFlight.do("url", lambda: "ok") == "ok"
+
+
+def get_mock_route_session():
+    def get(url, timeout):
+        response = MagicMock()
+        if "/ROUTE?" in url:
+            attributes = {"Route": "025A", "MMin": 0, "MMax": 10}
+            response.content = json.dumps(
+                {"features": [{"attributes": attributes}]}
+            ).encode("utf-8")
+        elif "/MeasureAtPoint?" in url:
+            attributes = {"Route": "025A", "Measure": 5, "MMin": 0, "MMax": 10}
+            attributes["Distance"] = 1
+            response.content = json.dumps(
+                {"features": [{"attributes": attributes}]}
+            ).encode("utf-8")
+        else:
+            # Straight, northbound route, with a vertex every mile
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+            fromMeasure = float(query["fromMeasure"][0])
+            toMeasure = float(query["toMeasure"][0])
+            low, high = sorted((fromMeasure, toMeasure))
+            measures = [low] + [m for m in range(11) if low < m < high] + [high]
+            if fromMeasure > toMeasure:
+                measures.reverse()
+            paths = [[[-105.0, 39.0 + m * 0.01, m] for m in measures]]
+            geometry = {"hasM": True, "paths": paths}
+            if "returnM=true" not in url:
+                geometry = {"paths": [[point[:2] for point in paths[0]]]}
+            response.content = json.dumps(
+                {"features": [{"geometry": geometry}]}
+            ).encode("utf-8")
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+def test_get_route_and_measure_heading_route_profile():
+    session = get_mock_route_session()
+    api = cdot_geospatial_api.GeospatialApi(
+        session=session, routeProfiles=gis_cache.RouteProfileCache()
+    )
+
+    assert api.get_route_and_measure((39.05, -105.0), 10)["Direction"] == "+"
+    assert api.get_route_and_measure((39.06, -105.0), 190)["Direction"] == "-"
+
+    # The route geometry is only requested once, for the route profile
+    urls = [call.args[0] for call in session.get.call_args_list]
+    assert len([url for url in urls if "RouteBetweenMeasures" in url]) == 1
+    assert len(urls) == 3
+
+
+def test_get_route_geometry_ahead_route_profile():
+    session = get_mock_route_session()
+    api = cdot_geospatial_api.GeospatialApi(
+        session=session, routeProfiles=gis_cache.RouteProfileCache()
+    )
+
+    actual = api.get_route_geometry_ahead("025A", 5, 180, 2)
+    assert actual["start_measure"] == 5
+    assert actual["end_measure"] == 3
+
+    # Route details and direction come from the route profile, without point lookups
+    urls = [call.args[0] for call in session.get.call_args_list]
+    assert not [url for url in urls if "PointAtMeasure" in url]
+    assert not [url for url in urls if "MeasureAtPoint" in url]
+
+
+def test_route_profile_direction_recorded_responses():
+    fixtures = gis_stub_server.load_fixtures(RECORDED_RESPONSES)
+    lookups = 0
+    with gis_stub_server.GisStubServer(fixtures=fixtures) as server:
+
+        def get_api(routeProfiles):
+            return cdot_geospatial_api.GeospatialApi(
+                BASE_URL=server.base_url,
+                singleFlight=cdot_geospatial_api.SingleFlight(),
+                routeProfiles=routeProfiles,
+            )
+
+        api = get_api(None)
+        profileApi = get_api(gis_cache.RouteProfileCache())
+        for url in fixtures:
+            if not url.startswith("MeasureAtPoint"):
+                continue
+            query = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(url).query))
+            latLng = (float(query["y"]), float(query["x"]))
+            route_details = api.get_route_and_measure(latLng)
+            section = api.get_route_between_measures(
+                route_details["Route"],
+                *api._get_direction_measures(route_details),
+                adjustRoute=False,
+            )
+            bearing = geospatial_tools.get_heading_from_coordinates(section)
+            for offset in [-120, -60, 60, 120]:
+                heading = round(bearing + offset) % 360
+                expected = api.get_route_and_measure(latLng, heading)
+                actual = profileApi.get_route_and_measure(latLng, heading)
+                assert actual["Direction"] == expected["Direction"]
+                lookups += 1
+        api.close()
+        profileApi.close()
+    assert lookups == 64
+
+
+def test_get_route_and_measure_heading_route_slices():
+    session = get_mock_route_session()
+    api = cdot_geospatial_api.GeospatialApi(
+        session=session,
+        routeProfiles=None,
+        routeSlices=gis_cache.RouteSliceCache(windowMiles=5),
+    )
+
+    assert api.get_route_and_measure((39.05, -105.0), 10)["Direction"] == "+"
+    assert api.get_route_and_measure((39.06, -105.0), 190)["Direction"] == "-"
+
+    # The route bearing is sliced from the cached window around the measure, not the whole route
+    urls = [call.args[0] for call in session.get.call_args_list]
+    route_urls = [url for url in urls if "RouteBetweenMeasures" in url]
+    assert len(route_urls) == 1
+    assert "fromMeasure=0&toMeasure=5&" in route_urls[0]
+
+
+def test_get_route_between_measures_route_slices():
+    session = get_mock_route_session()
+    routeSlices = gis_cache.RouteSliceCache(windowMiles=5)
+    api = cdot_geospatial_api.GeospatialApi(session=session, routeSlices=routeSlices)
+
+    actual = api.get_route_between_measures("025A", 2.5, 4.5)
+    assert [c[1] for c in actual[1:-1]] == [39.03, 39.04]
+    assert abs(actual[0][1] - 39.025) < 0.0001
+    assert abs(actual[-1][1] - 39.045) < 0.0001
+
+    # Sections spanning windows are joined, and _DEC sections are reversed
+    assert [c[1] for c in api.get_route_between_measures("025A", 4, 6)] == [
+        39.04,
+        39.05,
+        39.06,
+    ]
+    dec = api.get_route_between_measures("025A_DEC", 6, 4, adjustRoute=False)
+    assert dec[0][1] > dec[-1][1]
+
+    urls = [call.args[0] for call in session.get.call_args_list]
+    assert len([url for url in urls if "/ROUTE?" in url]) == 2
+    assert len([url for url in urls if "RouteBetweenMeasures" in url]) == 4
+
+
+def test_configure_default_api():
+    api = cdot_geospatial_api.GeospatialApi(session=MagicMock())
+    cdot_geospatial_api.configure_default_api(api)
+    try:
+        assert cdot_geospatial_api.get_default_api() is api
+    finally:
+        cdot_geospatial_api.configure_default_api(None)
+
+    assert cdot_geospatial_api.get_default_api() is not api
+
+
+def test_get_default_api_shared():
+    cdot_geospatial_api.configure_default_api(None)
+    api = cdot_geospatial_api.get_default_api()
+
+    # One default api (and HTTP session) serves every call
+    assert cdot_geospatial_api.get_default_api() is api
+    session = api.session
+
+    with patch.object(session, "close") as close:
+        cdot_geospatial_api.configure_default_api(None)
+    close.assert_called_once()
+    assert cdot_geospatial_api.get_default_api() is not api
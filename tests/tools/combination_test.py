@@ -1,5 +1,5 @@
 from unittest.mock import Mock, patch
-from wzdx.tools import combination, cdot_geospatial_api
+from wzdx.tools import combination, cdot_geospatial_api, gis_rate_limit
 import json
 
 
@@ -640,3 +640,184 @@ def test_identify_overlapping_features_wzdx_invalid_route_none(
     }
     actual = combination.identify_overlapping_features_wzdx([wzdx_1], [wzdx_2])
     assert len(actual) == 0
+
+
+class MockGeospatialApiMany:
+    def __init__(self):
+        self.points = []
+
+    def get_route_and_measure_many(self, points):
+        self.points = points
+        return [{"Route": "route", "Measure": lat} for lat, lng in points]
+
+
+def test_get_route_details_map():
+    api = MockGeospatialApiMany()
+    with patch.object(cdot_geospatial_api, "GeospatialApi", side_effect=lambda: api):
+        actual = combination.get_route_details_map(
+            [[[0, 1], [2, 3]], [[2, 3], [4, 5]], None]
+        )
+
+    assert api.points == [(1, 0), (3, 2), (5, 4)]
+    assert actual == {
+        (1, 0): {"Route": "route", "Measure": 1},
+        (3, 2): {"Route": "route", "Measure": 3},
+        (5, 4): {"Route": "route", "Measure": 5},
+    }
+
+
+def test_get_route_details_map_priorities():
+    priorities = []
+
+    def get_route_and_measure_many(points):
+        priorities.append((gis_rate_limit.get_request_priority(), points))
+        return [{"Route": "route", "Measure": lat} for lat, lng in points]
+
+    api = Mock()
+    api.get_route_and_measure_many.side_effect = get_route_and_measure_many
+    actual = combination.get_route_details_map(
+        [[[0, 1], [2, 3]], [[2, 3], [4, 5]], [[6, 7]]],
+        api,
+        [
+            gis_rate_limit.PRIORITY_PLANNED,
+            gis_rate_limit.PRIORITY_LIVE,
+            gis_rate_limit.PRIORITY_BACKFILL,
+        ],
+    )
+
+    # Live points are looked up first, and shared points with the highest priority of their events
+    assert priorities == [
+        (gis_rate_limit.PRIORITY_LIVE, [(3, 2), (5, 4)]),
+        (gis_rate_limit.PRIORITY_PLANNED, [(1, 0)]),
+        (gis_rate_limit.PRIORITY_BACKFILL, [(7, 6)]),
+    ]
+    assert actual == {
+        (1, 0): {"Route": "route", "Measure": 1},
+        (3, 2): {"Route": "route", "Measure": 3},
+        (5, 4): {"Route": "route", "Measure": 5},
+        (7, 6): {"Route": "route", "Measure": 7},
+    }
+
+
+def test_get_route_details_for_coordinates_lngLat_map():
+    route_details_map = {
+        (1, 0): {"Route": "route", "Measure": 1},
+        (3, 2): {"Route": "route", "Measure": 3},
+    }
+    actual = combination.get_route_details_for_coordinates_lngLat(
+        [[0, 1], [2, 3]], route_details_map
+    )
+    assert actual == (route_details_map[(1, 0)], route_details_map[(3, 2)])
+    # Pre-fetched route details are copied, so the map is not modified by callers
+    assert actual[0] is not route_details_map[(1, 0)]
+
+
+def test_get_route_details_api():
+    api = Mock()
+    api.get_route_and_measure.return_value = {"Route": "070A", "Measure": 1}
+
+    with patch.object(cdot_geospatial_api, "GeospatialApi") as default_api:
+        actual = combination.get_route_details(39.0, -105.0, cdotGeospatialApi=api)
+        default_api.assert_not_called()
+    assert actual == {"Route": "070A", "Measure": 1}
+    api.get_route_and_measure.assert_called_with((39.0, -105.0))
+
+
+def test_get_route_details_default_api():
+    api = Mock()
+    api.get_route_and_measure.return_value = {"Route": "070A", "Measure": 1}
+
+    cdot_geospatial_api.configure_default_api(api)
+    try:
+        actual = combination.get_route_details_for_wzdx(
+            {"geometry": {"coordinates": [[-105.0, 39.0], [-105.0, 39.1]]}}
+        )
+    finally:
+        cdot_geospatial_api.configure_default_api(None)
+    assert actual == ({"Route": "070A", "Measure": 1}, {"Route": "070A", "Measure": 1})
+    assert api.get_route_and_measure.call_count == 2
+
+
+def test_get_route_details_map_for_wzdx():
+    api = MockGeospatialApiMany()
+    with_details = {
+        "features": [
+            {
+                "geometry": {"coordinates": [[6, 7], [8, 9]]},
+                "properties": {
+                    "route_details_start": {"Route": "route"},
+                    "route_details_end": {"Route": "route"},
+                },
+            }
+        ]
+    }
+    without_details = {
+        "features": [{"geometry": {"coordinates": [[0, 1], [2, 3]]}, "properties": {}}]
+    }
+
+    actual = combination.get_route_details_map_for_wzdx(
+        [[with_details], [without_details]], api
+    )
+
+    # Messages which already carry route details are not looked up
+    assert api.points == [(1, 0), (3, 2)]
+    assert actual == {
+        (1, 0): {"Route": "route", "Measure": 1},
+        (3, 2): {"Route": "route", "Measure": 3},
+    }
+
+
+def test_identify_overlapping_features_wzdx_route_details_map():
+    api = Mock()
+    wzdx_1 = {
+        "features": [
+            {
+                "id": "1",
+                "geometry": {"coordinates": [[0, 1], [0, 2]]},
+                "properties": {
+                    "start_date": "2022-01-01T00:00:00Z",
+                    "end_date": "2022-01-02T00:00:00Z",
+                    "core_details": {"direction": "northbound"},
+                },
+            }
+        ]
+    }
+    wzdx_2 = {
+        "features": [
+            {
+                "id": "2",
+                "geometry": {"coordinates": [[0, 1.5], [0, 2.5]]},
+                "properties": {
+                    "start_date": "2022-01-01T00:00:00Z",
+                    "end_date": "2022-01-02T00:00:00Z",
+                    "core_details": {"direction": "northbound"},
+                },
+            }
+        ]
+    }
+    route_details_map = {
+        (lat, 0): {"Route": "route_1", "Measure": lat} for lat in [1, 2, 1.5, 2.5]
+    }
+
+    actual = combination.identify_overlapping_features_wzdx(
+        [wzdx_1], [wzdx_2], api, route_details_map
+    )
+
+    assert actual == [(wzdx_1, wzdx_2)]
+    api.get_route_and_measure.assert_not_called()
+
+
+def test_is_missing_route_details():
+    def get_feature(**properties):
+        return {"properties": properties}
+
+    assert combination.is_missing_route_details(get_feature())
+    assert not combination.is_missing_route_details(
+        get_feature(route_details_start={"Route": "route"})
+    )
+    assert not combination.is_missing_route_details(
+        get_feature(
+            route_details_start={"Route": "route"},
+            route_details_end={"Route": "route"},
+        )
+    )
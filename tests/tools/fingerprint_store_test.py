@@ -0,0 +1,55 @@
+import gzip
+import json
+
+from wzdx.tools import fingerprint_store
+
+
+def test_get_fingerprint_ignores_key_order():
+    assert fingerprint_store.get_fingerprint(
+        {"a": 1, "b": [1, 2]}
+    ) == fingerprint_store.get_fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint_store.get_fingerprint(
+        {"a": 1}
+    ) != fingerprint_store.get_fingerprint({"a": 2})
+
+
+def test_get_set():
+    store = fingerprint_store.FingerprintStore()
+    store.set("event_eastbound", "abc", {"message": 1})
+
+    assert store.get("event_eastbound", "abc") == {"message": 1}
+    assert store.get("event_eastbound", "def") is None
+    assert store.get("event_westbound", "abc") is None
+    assert store.hits == 1
+    assert store.misses == 2
+
+
+def test_retain():
+    store = fingerprint_store.FingerprintStore()
+    store.set("a", "1", {})
+    store.set("b", "2", {})
+    store.set("c", "3", {})
+
+    assert store.retain(["a", "c", "d"]) == 1
+    assert len(store) == 2
+    assert store.get("b", "2") is None
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / "fingerprints.json.gz")
+    store = fingerprint_store.FingerprintStore(path)
+    store.set("a", "1", {"message": {"id": "a"}})
+    store.save()
+
+    with gzip.open(path, "rt") as f:
+        assert json.load(f)["version"] == fingerprint_store.STORE_VERSION
+    assert fingerprint_store.FingerprintStore(path).get("a", "1") == {
+        "message": {"id": "a"}
+    }
+
+
+def test_load_other_version(tmp_path):
+    path = tmp_path / "fingerprints.json"
+    path.write_text(json.dumps({"version": 0, "entries": {"a": {}}}))
+
+    assert len(fingerprint_store.FingerprintStore(str(path))) == 0
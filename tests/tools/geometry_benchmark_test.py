@@ -0,0 +1,39 @@
+from wzdx.tools import geometry_benchmark
+
+
+def test_generate_path():
+    path = geometry_benchmark.generate_path(100)
+
+    assert len(path) == 100
+    assert path == geometry_benchmark.generate_path(100)
+
+
+def test_benchmark_compression():
+    result = geometry_benchmark.benchmark_compression(
+        geometry_benchmark.generate_path(200), repeat=1
+    )
+
+    assert result["vertices"] == 200
+    assert 2 < result["compressed"] < 200
+    assert result["identical"]
+    assert result["iterative"] > 0 and result["vectorized"] > 0
+
+
+def test_compare_simplification():
+    reports = geometry_benchmark.compare_simplification(
+        geometry_benchmark.generate_path(500), 5
+    )
+
+    assert [report["method"] for report in reports] == ["j2945", "douglas-peucker"]
+    assert all(report["removed_vertices"] > 0 for report in reports)
+
+
+def test_benchmark_buffer():
+    result = geometry_benchmark.benchmark_buffer(
+        geometry_benchmark.generate_path(100), 20, repeat=1
+    )
+
+    assert result["vertices"] == 100
+    assert result["geodesic_difference"] < 0.001
+    assert result["projected_difference"] < 20
+    assert result["iterative"] > 0 and result["projected"] > 0
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from wzdx.tools import geometry_benchmark, geometry_simplification
+
+
+def get_valid_path():
+    wzdx = json.loads(open("./tests/data/path_compression_valid_path.json").read())
+    return wzdx["features"][0]["geometry"]["coordinates"]
+
+
+def test_simplify_j2945():
+    path = get_valid_path()
+
+    result = geometry_simplification.simplify(path, "j2945")
+
+    assert result.vertices == 80
+    assert result.removedVertices == len(path) - 80
+    assert result.coordinates[0] == path[0] and result.coordinates[-1] == path[-1]
+
+
+def test_simplify_douglas_peucker_max_deviation():
+    path = geometry_benchmark.generate_path(2000)
+
+    for maxDeviation in [1, 5, 30]:
+        result = geometry_simplification.simplify(path, "douglas-peucker", maxDeviation)
+        assert result.maxDeviation <= maxDeviation
+        assert 2 <= result.vertices < len(path)
+        assert all(point in path for point in result.coordinates)
+
+    # Larger deviations remove more vertices
+    assert (
+        geometry_simplification.simplify(path, "douglas-peucker", 30).vertices
+        < geometry_simplification.simplify(path, "douglas-peucker", 1).vertices
+    )
+
+
+def test_simplify_douglas_peucker_keeps_duplicate_end_points():
+    path = [[-105.0, 39.0], [-105.0, 39.001], [-105.0, 39.002], [-105.0, 39.002]]
+
+    actual = geometry_simplification.simplify_path(path, "douglas-peucker", 1)
+
+    assert actual[0] == path[0] and actual[-1] == path[-1]
+
+
+def test_simplify_report():
+    path = [[-105.0, 39.0], [-105.0, 39.001], [-105.0, 39.002]]
+
+    report = geometry_simplification.simplify(path, "douglas-peucker", 1).report()
+
+    assert report == {
+        "method": "douglas-peucker",
+        "original_vertices": 3,
+        "vertices": 2,
+        "removed_vertices": 1,
+        "max_deviation": 0.0,
+    }
+
+
+def test_register_method():
+    geometry_simplification.register_method("ends", lambda path, _: [path[0], path[-1]])
+    path = geometry_benchmark.generate_path(10)
+
+    assert geometry_simplification.simplify_path(path, "ends") == [path[0], path[-1]]
+
+    del geometry_simplification.SIMPLIFICATION_METHODS["ends"]
+
+
+def test_simplify_unknown_method():
+    with pytest.raises(ValueError):
+        geometry_simplification.simplify_path([[0, 0], [1, 1]], "unknown")
@@ -195,6 +195,55 @@ def test_getDist():
     assert abs(actual - expected) < 5
 
 
+def test_get_headings():
+    origins = [[0, 0], [0, 0], [-105.0, 39.0]]
+    destinations = [[0, 1], [1, 0], [-105.1, 39.1]]
+
+    actual = geospatial_tools.get_headings(origins, destinations)
+
+    assert actual.shape == (3,)
+    for i in range(3):
+        assert actual[i] == geospatial_tools.get_heading_from_coordinates(
+            [origins[i], destinations[i]]
+        )
+
+    # A single destination is broadcast against all origins
+    assert list(geospatial_tools.get_headings([[0, -1], [-1, 0]], [0, 0]).round(6)) == [
+        0,
+        90,
+    ]
+
+
+def test_get_distances():
+    origins = [(-105.49113132299999, 37.19060215300004), (0, 0)]
+    destinations = [(-105.43320319899999, 37.30655150100006), (0, 1)]
+
+    actual = geospatial_tools.get_distances(origins, destinations)
+
+    assert list(actual) == [
+        geospatial_tools.getDist(origins[0], destinations[0]),
+        geospatial_tools.getDist(origins[1], destinations[1]),
+    ]
+    # Ellipsoidal distances are within 1% of the spherical distances
+    geodesic = geospatial_tools.get_geodesic_distances(origins, destinations)
+    assert all(abs(geodesic / actual - 1) < 0.01)
+
+
+def test_get_end_points():
+    origin = [-105.49113132299999, 37.19060215300004]
+
+    actual = geospatial_tools.get_end_points(origin, [21.6697, 0], [13.88 * 1000, 0])
+
+    assert actual.shape == (2, 2)
+    assert abs(actual[0][0] - -105.43320319899999) < 0.0001
+    assert abs(actual[0][1] - 37.30655150100006) < 0.0001
+    assert abs(actual[1] - origin).max() < 1e-9
+
+    geodesic = geospatial_tools.get_geodesic_end_points(origin, 21.6697, 13.88 * 1000)
+    assert abs(geodesic[0] - -105.43320319899999) < 0.001
+    assert abs(geodesic[1] - 37.30655150100006) < 0.001
+
+
 ################################# Random Testing #################################
 def get_color(val):
     if val < 5:
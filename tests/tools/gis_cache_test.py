@@ -0,0 +1,261 @@
+import json
+from unittest.mock import MagicMock
+
+import time_machine
+
+from wzdx.tools import cdot_geospatial_api, gis_cache
+
+BASE_URL = "https://dtdapps.codot.gov/server/rest/services/LRS/Routes_withDEC/MapServer/exts/LrsServerRounded"
+ROUTE_URL = f"{BASE_URL}/ROUTE?routeId=070A&outSR=4326&f=pjson"
+ROUTES_URL = f"{BASE_URL}/ROUTES?f=pjson"
+
+
+def test_get_endpoint():
+    assert gis_cache.get_endpoint(ROUTE_URL) == "ROUTE"
+    assert gis_cache.get_endpoint(ROUTES_URL) == "ROUTES"
+
+
+def test_cache_get_set(tmp_path):
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"))
+    assert cache.get(ROUTE_URL) is None
+    cache.set(ROUTE_URL, '{"features": []}')
+    assert cache.get(ROUTE_URL) == '{"features": []}'
+    assert cache.get_stats() == {
+        "entries": 1,
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+    }
+
+
+def test_cache_persistent(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    gis_cache.SqliteRequestCache(path).set(ROUTE_URL, '{"features": []}')
+    assert gis_cache.SqliteRequestCache(path).get(ROUTE_URL) == '{"features": []}'
+
+
+def test_cache_ignores_errors(tmp_path):
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"))
+    cache.set(ROUTE_URL, '{"error": {"code": 500}}')
+    cache.set(ROUTES_URL, "<html>Service Unavailable</html>")
+    assert len(cache) == 0
+
+
+def test_cache_ttl(tmp_path):
+    cache = gis_cache.SqliteRequestCache(
+        str(tmp_path / "cache.sqlite"), endpointTtls={"ROUTES": 60}, defaultTtl=3600
+    )
+    with time_machine.travel(1700000000, tick=False):
+        cache.set(ROUTE_URL, "{}")
+        cache.set(ROUTES_URL, "{}")
+    with time_machine.travel(1700000000 + 120, tick=False):
+        assert cache.get(ROUTES_URL) is None
+        assert cache.get(ROUTE_URL) == "{}"
+        assert cache.purge_expired() == 1
+    assert len(cache) == 1
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"), maxEntries=2)
+    with time_machine.travel(1700000000, tick=False):
+        cache.set(f"{ROUTE_URL}&a", "{}")
+    with time_machine.travel(1700000001, tick=False):
+        cache.set(f"{ROUTE_URL}&b", "{}")
+    with time_machine.travel(1700000002, tick=False):
+        # Access a, so b is the least recently used
+        cache.get(f"{ROUTE_URL}&a")
+    with time_machine.travel(1700000003, tick=False):
+        cache.set(f"{ROUTE_URL}&c", "{}")
+        assert cache.get(f"{ROUTE_URL}&a") == "{}"
+        assert cache.get(f"{ROUTE_URL}&b") is None
+        assert cache.get(f"{ROUTE_URL}&c") == "{}"
+
+
+def test_cache_import_export(tmp_path):
+    recorded = tmp_path / "recorded.json"
+    recorded.write_text(json.dumps({ROUTE_URL: {"features": []}, ROUTES_URL: "{}"}))
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"))
+    assert cache.import_from_file(str(recorded)) == 2
+
+    exported = str(tmp_path / "exported.ndjson")
+    assert cache.export_to_file(exported) == 2
+    warm = gis_cache.SqliteRequestCache(str(tmp_path / "warm.sqlite"))
+    assert warm.import_from_file(exported) == 2
+    assert warm.get(ROUTE_URL) == '{"features": []}'
+
+
+def test_cache_geospatial_api_hooks(tmp_path):
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"))
+    session = MagicMock()
+    session.get.return_value.content = b'{"routes": [{"routeID": "070A"}]}'
+    api = cdot_geospatial_api.GeospatialApi(
+        getCachedRequest=cache.get, setCachedRequest=cache.set, session=session
+    )
+
+    assert api.get_routes_list() == [{"routeID": "070A"}]
+    assert api.get_routes_list() == [{"routeID": "070A"}]
+    assert session.get.call_count == 1
+
+
+def test_route_measure_memo_quantized():
+    memo = gis_cache.RouteMeasureMemo(gridMeters=1)
+    lookup = MagicMock(return_value={"Route": "070A", "Measure": 1.0})
+
+    # Points ~1cm apart share one lookup, points ~100m apart do not
+    assert memo.get_or_lookup((39.5, -105.0), None, 10000, lookup)["Measure"] == 1.0
+    assert memo.get_or_lookup((39.5000001, -105.0000001), None, 10000, lookup)
+    assert lookup.call_count == 1
+    memo.get_or_lookup((39.501, -105.0), None, 10000, lookup)
+    memo.get_or_lookup((39.5, -105.0), 90, 10000, lookup)
+    assert lookup.call_count == 3
+    assert memo.get_stats() == {
+        "entries": 3,
+        "hits": 1,
+        "misses": 3,
+        "hit_rate": 0.25,
+    }
+
+
+def test_route_measure_memo_copies():
+    memo = gis_cache.RouteMeasureMemo()
+    memo.set((39.5, -105.0), None, 10000, {"Route": "070A"})
+    _, route_details = memo.get((39.5, -105.0))
+    route_details["Route"] = "modified"
+    assert memo.get((39.5, -105.0)) == (True, {"Route": "070A"})
+
+
+def test_route_measure_memo_lru_and_failures():
+    memo = gis_cache.RouteMeasureMemo(maxEntries=2)
+    memo.set((39.0, -105.0), None, 10000, {})
+    memo.set((39.1, -105.0), None, 10000, {})
+    memo.get((39.0, -105.0))
+    memo.set((39.2, -105.0), None, 10000, {})
+    memo.set((39.3, -105.0), None, 10000, None)
+
+    assert memo.get((39.0, -105.0))[0]
+    assert not memo.get((39.1, -105.0))[0]
+    assert not memo.get((39.3, -105.0))[0]
+    assert len(memo) == 2
+
+
+def test_route_measure_memo_geospatial_api():
+    session = MagicMock()
+    session.get.return_value.content = json.dumps(
+        {
+            "features": [
+                {
+                    "attributes": {
+                        "Route": "070A",
+                        "Measure": 1,
+                        "MMin": 0,
+                        "MMax": 10,
+                        "Distance": 0.1,
+                    }
+                }
+            ]
+        }
+    ).encode("utf-8")
+    memo = gis_cache.RouteMeasureMemo()
+    api_1 = cdot_geospatial_api.GeospatialApi(session=session, routeMeasureMemo=memo)
+    api_2 = cdot_geospatial_api.GeospatialApi(session=session, routeMeasureMemo=memo)
+
+    assert api_1.get_route_and_measure((39.5, -105.0))["Route"] == "070A"
+    assert api_2.get_route_and_measure((39.5000001, -105.0))["Route"] == "070A"
+    assert session.get.call_count == 1
+
+
+def test_parsed_response_cache_copies():
+    cache = gis_cache.ParsedResponseCache()
+    linestring = [[-105.0, 39.0], [-105.1, 39.1]]
+    cache.set("linestring", linestring)
+    cache.set("route_details", {"Route": "070A", "MMin": 0.0})
+    cache.set("point", (39.0, -105.0))
+    cache.set("routes", [{"routeID": "070A"}])
+    cache.set("failed", None)
+
+    # The cache is not affected by changes to the original, or returned, objects
+    linestring[0][0] = 0
+    _, cached_linestring = cache.get("linestring")
+    cached_linestring.reverse()
+    cache.get("route_details")[1]["Route"] = "modified"
+
+    assert cache.get("linestring") == (True, [[-105.0, 39.0], [-105.1, 39.1]])
+    assert cache.get("route_details") == (True, {"Route": "070A", "MMin": 0.0})
+    assert cache.get("point") == (True, (39.0, -105.0))
+    assert cache.get("routes") == (True, [{"routeID": "070A"}])
+    assert cache.get("failed") == (False, None)
+
+
+def test_parsed_response_cache_lru():
+    cache = gis_cache.ParsedResponseCache(maxEntries=1)
+    cache.set("a", {})
+    cache.set("b", {})
+    assert cache.get("a") == (False, None)
+    assert cache.get_stats() == {"entries": 1, "hits": 0, "misses": 1, "hit_rate": 0}
+
+
+def test_parsed_response_cache_geospatial_api():
+    session = MagicMock()
+    session.get.return_value.content = json.dumps(
+        {"features": [{"geometry": {"paths": [[[-105.0, 39.0], [-105.1, 39.1]]]}}]}
+    ).encode("utf-8")
+    getCachedRequest = MagicMock(return_value=None)
+    api = cdot_geospatial_api.GeospatialApi(
+        getCachedRequest=getCachedRequest,
+        session=session,
+        parsedCache=gis_cache.ParsedResponseCache(),
+    )
+
+    first = api.get_route_between_measures("070A", 1, 2)
+    first.reverse()
+    second = api.get_route_between_measures("070A", 1, 2)
+
+    assert second == [[-105.0, 39.0], [-105.1, 39.1]]
+    assert session.get.call_count == 1
+    assert getCachedRequest.call_count == 1
+
+
+def test_cache_eviction_interval(tmp_path):
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"), maxEntries=500)
+    assert cache.evictionInterval == 5
+
+    for i in range(504):
+        with time_machine.travel(1700000000 + i, tick=False):
+            cache.set(f"{ROUTE_URL}&{i}", "{}")
+    # The cache is only counted every evictionInterval inserts
+    assert len(cache) == 504
+
+    with time_machine.travel(1700000504, tick=False):
+        cache.set(f"{ROUTE_URL}&504", "{}")
+        assert len(cache) == 500
+        assert cache.get(f"{ROUTE_URL}&0") is None
+        assert cache.get(f"{ROUTE_URL}&504") == "{}"
+
+
+def test_route_profile_cache_failed_loads():
+    now = [0]
+    cache = gis_cache.RouteProfileCache(failedLoadTtl=60, clock=lambda: now[0])
+    load = MagicMock(return_value=None)
+
+    assert cache.get_or_load("https://gis", "025A", load) is None
+    assert cache.get_or_load("https://gis", "025A", load) is None
+    # Failed loads are not retried for every event on the route
+    assert load.call_count == 1
+
+    now[0] = 61
+    load.return_value = "profile"
+    assert cache.get_or_load("https://gis", "025A", load) == "profile"
+    assert cache.get_or_load("https://gis", "025A", load) == "profile"
+    assert load.call_count == 2
+
+
+def test_route_slice_cache_route_details_lru():
+    cache = gis_cache.RouteSliceCache(maxRoutes=2)
+    for routeId in ["025A", "070A"]:
+        cache.set_route_details("https://gis", routeId, {"Route": routeId})
+    assert cache.get_route_details("https://gis", "025A") == {"Route": "025A"}
+
+    # The least recently used route details are evicted
+    cache.set_route_details("https://gis", "076A", {"Route": "076A"})
+    assert cache.get_route_details("https://gis", "070A") is None
+    assert cache.get_route_details("https://gis", "025A") == {"Route": "025A"}
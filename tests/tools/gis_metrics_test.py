@@ -0,0 +1,102 @@
+from unittest.mock import MagicMock
+
+import requests
+
+from wzdx.tools import cdot_geospatial_api, gis_metrics
+
+
+def test_latency_histogram_percentiles():
+    histogram = gis_metrics.LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1000)
+
+    assert histogram.count == 1000
+    assert abs(histogram.percentile(50) - 0.5) <= 0.5 * 0.05
+    assert abs(histogram.percentile(95) - 0.95) <= 0.95 * 0.05
+    assert abs(histogram.percentile(99) - 0.99) <= 0.99 * 0.05
+    assert histogram.percentile(100) == 1
+    assert abs(histogram.mean() - 0.5005) < 1e-9
+
+    # Memory does not grow with the number of recorded values
+    buckets = len(histogram.buckets)
+    for _ in range(10000):
+        histogram.record(0.25)
+    assert len(histogram.buckets) == buckets
+
+
+def test_latency_histogram_empty():
+    histogram = gis_metrics.LatencyHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.mean() is None
+
+
+def test_gis_metrics_snapshot_export():
+    metrics = gis_metrics.GisMetrics()
+    metrics.record_request("MeasureAtPoint", 0.2)
+    metrics.record_request("MeasureAtPoint", 0.4)
+    metrics.record_cache_hit("MeasureAtPoint")
+    metrics.record_timeout("ROUTE")
+    metrics.record_error("ROUTE")
+
+    snapshot = metrics.snapshot()
+    # Failed attempts count as requests
+    assert snapshot["totals"] == {
+        "requests": 5,
+        "cache_hits": 1,
+        "cache_misses": 4,
+        "errors": 1,
+        "timeouts": 1,
+    }
+    measure = snapshot["endpoints"]["MeasureAtPoint"]
+    assert measure["latency"]["count"] == 2
+    assert measure["latency"]["max_ms"] == 400
+    assert set(measure["latency"]) == {
+        "count",
+        "mean_ms",
+        "max_ms",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+    }
+
+    points = metrics.export()
+    assert {
+        "metric": "wzdx/gis/cache_hits",
+        "labels": {"endpoint": "MeasureAtPoint"},
+        "value": 1,
+    } in points
+    # Endpoints without responses have no latency points
+    assert not [
+        p
+        for p in points
+        if p["labels"]["endpoint"] == "ROUTE" and "latency" in p["metric"]
+    ]
+
+    metrics.reset()
+    assert metrics.snapshot()["endpoints"] == {}
+
+
+def test_geospatial_api_metrics():
+    response = '{"features": [{"attributes": {"Route": "070A", "MMin": 0, "MMax": 1}}]}'
+    session = MagicMock()
+    session.get.return_value.content = response.encode("utf-8")
+    cached = {"https://gis/ROUTE?routeId=070A&outSR=4326&f=pjson": response}
+    api = cdot_geospatial_api.GeospatialApi(
+        getCachedRequest=lambda url: cached.get(url),
+        BASE_URL="https://gis",
+        session=session,
+    )
+
+    api.get_route_details("070A")
+    api.get_route_details("025A")
+    session.get.side_effect = requests.exceptions.Timeout()
+    api.get_route_details("036A")
+    session.get.side_effect = requests.exceptions.ConnectionError()
+    api.get_route_details("036A")
+
+    route = api.metrics.snapshot()["endpoints"]["ROUTE"]
+    assert route["requests"] == 4
+    assert route["cache_hits"] == 1
+    assert route["cache_misses"] == 3
+    assert route["timeouts"] == 1
+    assert route["errors"] == 1
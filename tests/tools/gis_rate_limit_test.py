@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from wzdx.tools import cdot_geospatial_api, gis_rate_limit
+
+
+def test_get_event_priority():
+    assert gis_rate_limit.get_event_priority("active") == gis_rate_limit.PRIORITY_LIVE
+    assert gis_rate_limit.get_event_priority("pending") == gis_rate_limit.PRIORITY_LIVE
+    assert (
+        gis_rate_limit.get_event_priority("planned") == gis_rate_limit.PRIORITY_PLANNED
+    )
+    assert gis_rate_limit.get_event_priority(None) == gis_rate_limit.PRIORITY_PLANNED
+
+
+def test_request_priority():
+    assert gis_rate_limit.get_request_priority() == gis_rate_limit.DEFAULT_PRIORITY
+    with gis_rate_limit.request_priority(gis_rate_limit.PRIORITY_BACKFILL):
+        assert gis_rate_limit.get_request_priority() == gis_rate_limit.PRIORITY_BACKFILL
+    assert gis_rate_limit.get_request_priority() == gis_rate_limit.DEFAULT_PRIORITY
+
+
+def test_rate_limiter_burst_and_timeout():
+    limiter = gis_rate_limit.TokenBucketRateLimiter(rate=1, burst=3)
+    assert all(limiter.acquire(timeout=0) for _ in range(3))
+    assert not limiter.acquire(timeout=0.01)
+
+    with pytest.raises(ValueError):
+        gis_rate_limit.TokenBucketRateLimiter(rate=0)
+
+
+def test_rate_limiter_priority_order():
+    limiter = gis_rate_limit.TokenBucketRateLimiter(rate=10, burst=1)
+    limiter.acquire()
+    order = []
+
+    def acquire(name, priority):
+        limiter.acquire(priority)
+        order.append(name)
+
+    # Lower priority requests are queued first, and are still served last
+    threads = []
+    for name, priority in [("backfill", 2), ("planned", 1), ("live", 0)]:
+        thread = threading.Thread(target=acquire, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        while len(limiter._waiters) < len(threads):
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["live", "planned", "backfill"]
+    assert limiter.waited == 3
+
+
+def test_get_route_and_measure_many_priority():
+    priorities = []
+
+    def acquire(timeout):
+        priorities.append(gis_rate_limit.get_request_priority())
+        return True
+
+    limiter = MagicMock()
+    limiter.acquire.side_effect = acquire
+    session = MagicMock()
+    session.get.return_value.content = b'{"features": []}'
+    api = cdot_geospatial_api.GeospatialApi(
+        session=session,
+        singleFlight=cdot_geospatial_api.SingleFlight(),
+        rateLimiter=limiter,
+    )
+
+    with gis_rate_limit.request_priority(gis_rate_limit.PRIORITY_LIVE):
+        api.get_route_and_measure_many([(39.0, -105.0), (39.1, -105.0)])
+
+    # Lookups on worker threads keep the priority of the caller
+    assert priorities == [gis_rate_limit.PRIORITY_LIVE] * 2
+
+
+def test_rate_limiter_acquire_async():
+    limiter = gis_rate_limit.TokenBucketRateLimiter(rate=100, burst=1)
+    limiter.acquire()
+    order = []
+
+    async def acquire(name, priority):
+        assert await limiter.acquire_async(priority)
+        order.append(name)
+
+    async def run():
+        threads = threading.active_count()
+        tasks = [
+            asyncio.ensure_future(acquire(f"{name}{i}", priority))
+            for name, priority in [("backfill", 2), ("live", 0)]
+            for i in range(5)
+        ]
+        await asyncio.sleep(0)
+        # Waiters sleep on the event loop, without holding a thread each
+        assert threading.active_count() == threads
+        await asyncio.gather(*tasks)
+        assert not await limiter.acquire_async(timeout=0)
+
+    asyncio.run(run())
+    assert order == [f"live{i}" for i in range(5)] + [f"backfill{i}" for i in range(5)]
+    assert limiter.waited == 10
@@ -0,0 +1,186 @@
+import random
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from wzdx.tools import cdot_geospatial_api, gis_retry
+
+ROUTE_RESPONSE = (
+    b'{"features": [{"attributes": {"Route": "070A", "MMin": 0, "MMax": 1}}]}'
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def get_api(session, **kwargs):
+    return cdot_geospatial_api.GeospatialApi(
+        BASE_URL="https://gis",
+        session=session,
+        singleFlight=cdot_geospatial_api.SingleFlight(),
+        **kwargs,
+    )
+
+
+def test_retry_policy_get_delay():
+    policy = gis_retry.RetryPolicy(baseDelay=0.5, maxDelay=3, jitter=False)
+    assert [policy.get_delay(i) for i in range(4)] == [0.5, 1, 2, 3]
+
+    policy = gis_retry.RetryPolicy(baseDelay=0.5, maxDelay=3, rng=random.Random(1))
+    for i in range(10):
+        assert 0 <= policy.get_delay(i) <= min(3, 0.5 * 2**i)
+
+    # Each policy gets its own random number generator
+    assert gis_retry.RetryPolicy().rng is not gis_retry.RetryPolicy().rng
+
+
+def test_deadline():
+    clock = FakeClock()
+    deadline = gis_retry.Deadline(10, clock=clock)
+    assert deadline.remaining() == 10
+    clock.now = 12
+    assert deadline.remaining() == 0
+    assert deadline.expired()
+
+
+def test_circuit_breaker():
+    clock = FakeClock()
+    breaker = gis_retry.CircuitBreaker(failureThreshold=2, resetTimeout=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+
+    # One trial request after the reset timeout, which re-opens the circuit on failure
+    clock.now = 30
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+
+    clock.now = 60
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.allow_request()
+
+
+@patch("time.sleep")
+def test_make_cached_web_request_retry(sleep):
+    session = MagicMock()
+    response = MagicMock()
+    response.content = ROUTE_RESPONSE
+    session.get.side_effect = [
+        requests.exceptions.ConnectionError(),
+        requests.exceptions.Timeout(),
+        response,
+    ]
+    api = get_api(
+        session, retryPolicy=gis_retry.RetryPolicy(maxRetries=2, jitter=False)
+    )
+
+    assert api.get_route_details("070A")["Route"] == "070A"
+    assert session.get.call_count == 3
+    assert [c.args[0] for c in sleep.call_args_list] == [0.5, 1]
+
+
+@patch("time.sleep")
+def test_make_cached_web_request_circuit_breaker(sleep):
+    session = MagicMock()
+    session.get.side_effect = requests.exceptions.ConnectionError()
+    breaker = gis_retry.CircuitBreaker(failureThreshold=3)
+    api = get_api(
+        session, retryPolicy=gis_retry.RetryPolicy(maxRetries=1), circuitBreaker=breaker
+    )
+
+    assert api.get_route_details("070A") is None
+    assert api.get_route_details("025A") is None
+    assert breaker.state == breaker.OPEN
+    assert session.get.call_count == 3
+
+    # Open circuit fails fast, without reaching the GIS server
+    assert api.get_route_details("036A") is None
+    assert session.get.call_count == 3
+
+
+def test_make_cached_web_request_deadline():
+    session = MagicMock()
+    session.get.return_value.content = ROUTE_RESPONSE
+    api = get_api(session)
+
+    api.start_deadline(60)
+    assert api.get_route_details("070A")["Route"] == "070A"
+    assert session.get.call_args.kwargs["timeout"] <= 15
+
+    api.start_deadline(0)
+    assert api.get_route_details("025A") is None
+    assert session.get.call_count == 1
+
+    api.clear_deadline()
+    assert api.get_route_details("025A")["Route"] == "070A"
+
+
+def test_make_cached_web_request_rate_limit_timeout_half_open():
+    session = MagicMock()
+    session.get.return_value.content = ROUTE_RESPONSE
+    clock = FakeClock()
+    breaker = gis_retry.CircuitBreaker(failureThreshold=1, resetTimeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 30
+    limiter = MagicMock()
+    limiter.acquire.return_value = False
+    api = get_api(session, circuitBreaker=breaker, rateLimiter=limiter)
+
+    # Timing out on the rate limit doesn't claim the half-open trial
+    assert api.get_route_details("070A") is None
+    assert session.get.call_count == 0
+
+    limiter.acquire.return_value = True
+    assert api.get_route_details("070A")["Route"] == "070A"
+    assert breaker.state == breaker.CLOSED
+
+
+def test_is_client_error():
+    def get_error(status):
+        return requests.exceptions.HTTPError(response=MagicMock(status_code=status))
+
+    assert gis_retry.is_client_error(get_error(404))
+    assert not gis_retry.is_client_error(get_error(503))
+    assert not gis_retry.is_client_error(requests.exceptions.ConnectionError())
+
+
+@patch("time.sleep")
+def test_make_cached_web_request_http_errors(sleep):
+    def get_session(status):
+        session = MagicMock()
+        session.get.return_value.raise_for_status.side_effect = (
+            requests.exceptions.HTTPError(response=MagicMock(status_code=status))
+        )
+        return session
+
+    breaker = gis_retry.CircuitBreaker(failureThreshold=2)
+    retryPolicy = gis_retry.RetryPolicy(maxRetries=2, jitter=False)
+
+    # Client errors fail immediately, and don't count against the GIS server
+    session = get_session(400)
+    api = get_api(session, retryPolicy=retryPolicy, circuitBreaker=breaker)
+    assert api.get_route_details("070A") is None
+    assert session.get.call_count == 1
+    assert breaker.failures == 0
+    sleep.assert_not_called()
+
+    # Server errors are retried
+    session = get_session(503)
+    api = get_api(session, retryPolicy=retryPolicy, circuitBreaker=breaker)
+    assert api.get_route_details("070A") is None
+    assert session.get.call_count == 2
+    assert breaker.state == breaker.OPEN
+    assert sleep.call_count == 2
@@ -0,0 +1,76 @@
+import json
+
+from wzdx.tools import cdot_geospatial_api, gis_retry, gis_stub_server
+
+
+def get_api(server):
+    return cdot_geospatial_api.GeospatialApi(
+        BASE_URL=server.base_url,
+        singleFlight=cdot_geospatial_api.SingleFlight(),
+        routeProfiles=None,
+    )
+
+
+def test_synthetic_routes():
+    routes = gis_stub_server.build_synthetic_routes(routeCount=2, lengthMiles=10)
+    with gis_stub_server.GisStubServer(routes=routes) as server:
+        api = get_api(server)
+
+        assert [route["routeID"] for route in api.get_routes_list()] == [
+            "001A",
+            "001A_DEC",
+            "002A",
+            "002A_DEC",
+        ]
+        assert api.get_route_details("002A") == {"Route": "002A", "MMin": 0, "MMax": 10}
+
+        latLng = api.get_point_at_measure("001A", 5)
+        route_details = api.get_route_and_measure(latLng)
+        assert route_details["Route"] == "001A"
+        assert abs(route_details["Measure"] - 5) < 0.01
+
+        # Decreasing measures select the _DEC carriageway
+        linestring = api.get_route_between_measures("001A", 6, 4)
+        assert linestring[0][1] > linestring[-1][1]
+        assert server.requests == 5
+        api.close()
+
+
+def test_fixtures(tmp_path):
+    path = tmp_path / "fixtures.ndjson"
+    url = "https://gis/LrsServerRounded/ROUTE?routeId=070A&outSR=4326&f=pjson"
+    response = {"features": [{"attributes": {"Route": "070A", "MMin": 0, "MMax": 1}}]}
+    path.write_text(json.dumps({"url": url, "response": response}) + "\n")
+
+    fixtures = gis_stub_server.load_fixtures(str(path))
+    with gis_stub_server.GisStubServer(fixtures=fixtures) as server:
+        api = get_api(server)
+        assert api.get_route_details("070A")["Route"] == "070A"
+        api.close()
+
+        status, response = server.get_response("/LrsServerRounded/ROUTE?routeId=025A")
+        assert status == 404
+        assert "error" in response
+
+
+def test_error_injection():
+    server = gis_stub_server.GisStubServer(errorRate=0.5, jitter=0.01, seed=1)
+    failures = [server.should_fail() for _ in range(1000)]
+    delays = [server.get_delay() for _ in range(1000)]
+
+    assert 400 < sum(failures) < 600
+    assert server.errors == sum(failures)
+    assert abs(sum(delays) / len(delays) - 0.01) < 0.002
+    server.stop()
+
+
+def test_injected_errors_are_retried():
+    routes = gis_stub_server.build_synthetic_routes(routeCount=1, lengthMiles=10)
+    with gis_stub_server.GisStubServer(routes=routes, errorRate=1) as server:
+        api = get_api(server)
+        api.retryPolicy = gis_retry.RetryPolicy(maxRetries=2, baseDelay=0)
+
+        assert api.get_route_details("001A") is None
+        assert server.requests == 3
+        assert api.metrics.snapshot()["totals"]["errors"] == 3
+        api.close()
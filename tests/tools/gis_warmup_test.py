@@ -0,0 +1,138 @@
+import json
+import urllib.parse
+from unittest.mock import MagicMock, patch
+
+from tests.data.raw_to_standard import planned_events_test_expected_results
+from wzdx.raw_to_standard import planned_events
+from wzdx.tools import (
+    cdot_geospatial_api,
+    gis_cache,
+    gis_stub_server,
+    gis_warmup,
+    local_lrs,
+)
+from wzdx.tools.linear_referencing import MeasuredLine
+
+
+def get_response(url):
+    """GIS responses for a straight, northbound route 025A, with a vertex every mile (lat 39.0 + measure * 0.01)"""
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    if "/ROUTES?" in url:
+        return {"routes": [{"routeID": "025A", "MMin": 0, "MMax": 10}]}
+    if "/ROUTE?" in url:
+        attributes = {"Route": query["routeId"][0], "MMin": 0, "MMax": 10}
+        return {"features": [{"attributes": attributes}]}
+    if "/MeasureAtPoint?" in url:
+        measure = round((float(query["y"][0]) - 39.0) / 0.01, 3)
+        attributes = {"Route": "025A", "Measure": measure, "MMin": 0, "MMax": 10}
+        attributes["Distance"] = 1
+        return {"features": [{"attributes": attributes}]}
+    if "returnM=true" in url:
+        paths = [[[-105.0, 39.0 + m * 0.01, m] for m in range(11)]]
+        return {"features": [{"geometry": {"hasM": True, "paths": paths}}]}
+    paths = [[[-105.0, 39.0 + m * 0.01] for m in range(11)]]
+    return {"features": [{"geometry": {"paths": paths}}]}
+
+
+def get_api(cache, progress):
+    session = MagicMock()
+
+    def get(url, timeout):
+        response = MagicMock()
+        response.content = json.dumps(get_response(url)).encode("utf-8")
+        return response
+
+    session.get.side_effect = get
+    return cdot_geospatial_api.GeospatialApi(
+        getCachedRequest=cache.get,
+        setCachedRequest=progress.wrap_set_cached_request(cache.set),
+        BASE_URL="https://gis",
+        session=session,
+        singleFlight=cdot_geospatial_api.SingleFlight(),
+        routeProfiles=None,
+    )
+
+
+def test_warm_up(tmp_path):
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"))
+    progress = gis_warmup.WarmupProgress()
+    api = get_api(cache, progress)
+
+    snapshot = gis_warmup.warm_up(api, maxWorkers=4, progress=progress)
+
+    assert list(snapshot["routes"]) == ["025A"]
+    assert progress.routes == 1
+    assert progress.failedRoutes == 0
+    assert progress.responses == 3
+    assert progress.bytes > 0
+    assert cache.get_stats()["entries"] == 3
+
+    # The snapshot answers lookups offline
+    path = str(tmp_path / "routes.json.gz")
+    local_lrs.save_snapshot(snapshot, path)
+    local_api = local_lrs.LocalGeospatialApi.from_snapshot_file(path)
+    assert local_api.get_route_and_measure((39.05, -105.0))["Measure"] == 5.0
+
+
+def test_translate_after_warm_up(tmp_path):
+    # Route along the planned event, from its start to its end point
+    start, end = [-108.279106, 39.195663], [-108.218549, 39.302392]
+    routes = {
+        "070A": MeasuredLine.from_measure_range([start, end], 20, 28),
+        "070A_DEC": MeasuredLine.from_measure_range(
+            [[end[0] + 0.0004, end[1]], [start[0] + 0.0004, start[1]]], 28, 20
+        ),
+    }
+    with gis_stub_server.GisStubServer(routes=routes) as server:
+        api = cdot_geospatial_api.GeospatialApi(
+            BASE_URL=server.base_url,
+            singleFlight=cdot_geospatial_api.SingleFlight(),
+            routeProfiles=None,
+        )
+        snapshot = gis_warmup.warm_up(api, ["070A", "070A_DEC"])
+        api.close()
+    path = str(tmp_path / "routes.json.gz")
+    local_lrs.save_snapshot(snapshot, path)
+
+    local_api = planned_events.create_geospatial_api(path)
+    with patch.object(cdot_geospatial_api, "create_session") as create_session:
+        messages = planned_events.generate_standard_messages_from_string(
+            local_api,
+            planned_events_test_expected_results.test_generate_standard_messages_from_string_input,
+        )
+
+    route_details = messages[0]["event"]["additional_info"]["route_details_start"]
+    assert route_details["Route"] == "070A"
+    assert abs(route_details["Measure"] - 20) < 0.01
+    # Every route lookup is answered from the snapshot, without GIS requests
+    create_session.assert_not_called()
+
+
+def test_get_feed_route_ids(tmp_path):
+    cache = gis_cache.SqliteRequestCache(str(tmp_path / "cache.sqlite"))
+    progress = gis_warmup.WarmupProgress()
+    api = get_api(cache, progress)
+    feed = {
+        "features": [
+            {
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": [[-105.0, 39.01], [-105.0, 39.02], [-105.0, 39.03]],
+                }
+            },
+            {"geometry": {"type": "Point", "coordinates": [-105.0, 39.05]}},
+        ]
+    }
+
+    assert gis_warmup.get_feed_coordinates(feed) == [
+        (39.01, -105.0),
+        (39.03, -105.0),
+        (39.05, -105.0),
+    ]
+    assert gis_warmup.get_feed_route_ids(api, feed) == ["025A"]
+
+
+def test_format_bytes():
+    assert gis_warmup.format_bytes(10) == "10 B"
+    assert gis_warmup.format_bytes(1536) == "1.5 KB"
+    assert gis_warmup.format_bytes(3 * 1024**2) == "3.0 MB"
@@ -0,0 +1,46 @@
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from wzdx.tools import json_stream
+
+VALUES = [{"a": [1, 2, {"b": "x]},"}]}, 12345, "s t", None, True, [1, [2]], 1.5e3]
+
+
+@pytest.mark.parametrize("chunkSize", [1, 3, 64])
+def test_iter_json_values_array(chunkSize):
+    for text in [json.dumps(VALUES), json.dumps(VALUES, indent=2), "[]"]:
+        stream = io.StringIO(text)
+        actual = list(json_stream.iter_json_values(stream, chunkSize))
+        assert actual == json.loads(text)
+
+
+@pytest.mark.parametrize("chunkSize", [1, 3, 64])
+def test_iter_json_values_ndjson(chunkSize):
+    text = "\n".join(json.dumps(value) for value in VALUES) + "\n"
+    actual = list(json_stream.iter_json_values(io.StringIO(text), chunkSize))
+    assert actual == VALUES
+    assert list(json_stream.iter_json_values(io.StringIO(""))) == []
+
+
+def test_iter_json_values_invalid():
+    for text in ["[1, 2", "[1 2]", '{"a":']:
+        with pytest.raises(json.JSONDecodeError):
+            list(json_stream.iter_json_values(io.StringIO(text), 2))
+
+
+def test_iter_json_values_large_value(monkeypatch):
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [[[-105.0, 39.0 + i * 1e-4]] * 2 for i in range(5000)],
+    }
+    text = json.dumps([polygon, {"escaped": 'a\\"]}' * 100}])
+    decoder = MagicMock(wraps=json_stream._decoder)
+    monkeypatch.setattr(json_stream, "_decoder", decoder)
+
+    # Each value spans many chunks, and is only decoded once it is complete
+    actual = list(json_stream.iter_json_values(io.StringIO(text), 16))
+    assert actual == json.loads(text)
+    assert decoder.raw_decode.call_count == 2
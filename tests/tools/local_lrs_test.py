@@ -0,0 +1,198 @@
+import json
+import urllib.parse
+
+from wzdx.tools import (
+    cdot_geospatial_api,
+    gis_stub_server,
+    linear_referencing,
+    local_lrs,
+)
+from wzdx.tools.geospatial_tools import GEOD
+from wzdx.tools.linear_referencing import MeasuredLine
+
+# Synthetic north/south route, ~11km long, with a parallel _DEC carriageway ~40m to the east
+COORDINATES = [[-105.0, 39.0 + i * 0.01] for i in range(11)]
+COORDINATES_DEC = [[-104.9995, 39.1 - i * 0.01] for i in range(11)]
+
+# GIS responses recorded from a GisStubServer serving 2D geometry (measuredGeometry=False) for route 101A, which runs east,
+# curves to the south and has measures which are not proportional to distance: 0.8 per mile after mile 5, and a 1.5 mile
+# measure equation at mile 7. Includes every request of `build_snapshot`, and lookups with headings on both carriageways
+RECORDED_RESPONSES = "./tests/data/tools/gis_recorded_responses.ndjson"
+
+
+def get_api(server):
+    return cdot_geospatial_api.GeospatialApi(
+        BASE_URL=server.base_url,
+        singleFlight=cdot_geospatial_api.SingleFlight(),
+        routeProfiles=None,
+    )
+
+
+def get_local_api():
+    return local_lrs.LocalGeospatialApi(
+        {
+            "025A": MeasuredLine.from_measure_range(COORDINATES, 0, 10),
+            "025A_DEC": MeasuredLine.from_measure_range(COORDINATES_DEC, 10, 0),
+        }
+    )
+
+
+def test_measured_line_point_at_measure():
+    line = MeasuredLine.from_measure_range(COORDINATES, 0, 10)
+    lng, lat = line.point_at_measure(5)
+    assert lng == -105.0
+    assert abs(lat - 39.05) < 0.0001
+
+
+def test_measured_line_locate():
+    line = MeasuredLine.from_measure_range(COORDINATES, 0, 10)
+    measure, distance, closest = line.locate(-104.999, 39.05)
+    assert abs(measure - 5) < 0.001
+    assert abs(distance - 86.5) < 1
+    assert closest[0] == -105.0
+
+
+def test_measured_line_from_measure_samples():
+    # A 1 mile measure equation between lat 39.04 and 39.06
+    samples = [(0, -105.0, 39.0), (1, -105.0, 39.02), (2, -105.0, 39.04)]
+    samples += [(4, -105.0, 39.06), (5, -105.0, 39.08), (6, -105.0, 39.1)]
+    line = MeasuredLine.from_measure_samples(COORDINATES, samples)
+
+    assert line.point_at_measure(1) == [-105.0, 39.02]
+    assert abs(line.point_at_measure(3)[1] - 39.05) < 0.0001
+    # Only the interval with the measure equation is sampled again
+    assert linear_referencing.get_refine_measures(COORDINATES, samples) == [3.0]
+
+
+def test_get_route_and_measure():
+    actual = get_local_api().get_route_and_measure((39.05, -105.0001))
+    assert actual["Route"] == "025A"
+    assert actual["Measure"] == 5.0
+    assert actual["MMin"] == 0.0
+    assert actual["MMax"] == 10.0
+    assert actual["Distance"] == 8.66
+
+
+def test_get_route_and_measure_dec():
+    actual = get_local_api().get_route_and_measure((39.05, -104.9994))
+    assert actual["Route"] == "025A_DEC"
+    assert actual["Measure"] == 5.0
+
+
+def test_get_route_and_measure_heading():
+    api = get_local_api()
+    assert api.get_route_and_measure((39.05, -105.0001), 10)["Direction"] == "+"
+    assert api.get_route_and_measure((39.05, -105.0001), 170)["Direction"] == "-"
+
+
+def test_get_route_and_measure_out_of_tolerance():
+    assert get_local_api().get_route_and_measure((39.05, -104.9), tolerance=100) == {}
+
+
+def test_get_point_at_measure():
+    api = get_local_api()
+    lat, lng = api.get_point_at_measure("025A", 2.5)
+    assert abs(lat - 39.025) < 0.0001 and lng == -105.0
+    assert api.get_point_at_measure("025A", 11) is None
+    assert api.get_point_at_measure("unknown", 1) is None
+
+
+def test_get_route_between_measures():
+    actual = get_local_api().get_route_between_measures("025A", 2.5, 4.5)
+    assert [c[1] for c in actual[1:-1]] == [39.03, 39.04]
+    assert abs(actual[0][1] - 39.025) < 0.0001
+    assert abs(actual[-1][1] - 39.045) < 0.0001
+
+
+def test_get_route_between_measures_dec():
+    actual = get_local_api().get_route_between_measures("025A", 4.5, 2.5)
+    assert all(c[0] == -104.9995 for c in actual)
+    assert [c[1] for c in actual[1:-1]] == [39.04, 39.03]
+
+    # Measure order is normalized, as with the GIS server
+    assert actual == get_local_api().get_route_between_measures(
+        "025A_DEC", 2.5, 4.5, adjustRoute=False
+    )
+
+
+def test_get_route_between_measures_compressed():
+    api = get_local_api()
+
+    # Straight route, only the end points are kept
+    actual = api.get_route_between_measures(
+        "025A", 2.5, 6.5, compressed=True, compressionMethod="douglas-peucker"
+    )
+    assert actual == [
+        api.get_route_between_measures("025A", 2.5, 6.5)[0],
+        api.get_route_between_measures("025A", 2.5, 6.5)[-1],
+    ]
+
+
+def test_build_snapshot_round_trip(tmp_path):
+    routes = {"025A": MeasuredLine.from_measure_range(COORDINATES, 0, 10)}
+    with gis_stub_server.GisStubServer(routes=routes) as server:
+        api = get_api(server)
+        snapshot = local_lrs.build_snapshot(api)
+        api.close()
+        # Vertex measures are returned with the geometry (returnM), no samples are needed
+        assert server.requests == 3
+
+    path = str(tmp_path / "routes.json.gz")
+    local_lrs.save_snapshot(snapshot, path)
+    local_api = local_lrs.LocalGeospatialApi.from_snapshot_file(path)
+
+    assert local_api.get_routes_list() == [{"Route": "025A", "MMin": 0, "MMax": 10}]
+    assert local_api.get_route_and_measure((39.05, -105.0))["Measure"] == 5.0
+
+
+def test_build_snapshot_recorded_responses():
+    fixtures = gis_stub_server.load_fixtures(RECORDED_RESPONSES)
+    with gis_stub_server.GisStubServer(fixtures=fixtures) as server:
+        api = get_api(server)
+        snapshot = local_lrs.build_snapshot(api, ["101A", "101A_DEC"])
+        api.close()
+    local_api = local_lrs.LocalGeospatialApi.from_snapshot(snapshot)
+    assert local_api.get_route_details("101A") == {
+        "Route": "101A",
+        "MMin": 10.0,
+        "MMax": 24.608,
+    }
+
+    lookups = 0
+    for url, response in fixtures.items():
+        query = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(url).query))
+        response = json.loads(response)
+        if url.startswith("MeasureAtPoint"):
+            expected = response["features"][0]["attributes"]
+            actual = local_api.get_route_and_measure(
+                (float(query["y"]), float(query["x"])),
+                tolerance=int(query["tolerance"]),
+            )
+            assert actual["Route"] == expected["Route"]
+            assert abs(actual["Measure"] - expected["Measure"]) <= 0.002
+            lookups += 1
+        elif url.startswith("PointAtMeasure"):
+            expected = response["features"][0]["geometry"]
+            lat, lng = local_api.get_point_at_measure(
+                query["routeId"], float(query["measure"])
+            )
+            _, __, distance = GEOD.inv(lng, lat, expected["x"], expected["y"])
+            assert distance < 1
+            lookups += 1
+    assert lookups == 86
+
+    # Measures spread along the route by distance are more than a mile off after the measure equation at mile 7
+    line = local_api.routes["101A"]
+    spread = MeasuredLine.from_measure_range(line.coordinates, line.mMin, line.mMax)
+    lng, lat = line.point_at_measure(18.5)
+    assert abs(spread.locate(lng, lat)[0] - 18.5) > 1
+
+
+def test_local_api_has_no_session():
+    api = get_local_api()
+    api.get_route_and_measure((39.05, -105.0), 0)
+    api.get_route_between_measures("025A", 2.5, 6.5)
+    api.close()
+
+    # The local api never reaches the GIS server, so no HTTP session is created
+    assert api._session is None
@@ -0,0 +1,50 @@
+import os
+
+from wzdx.tools import cdot_geospatial_api, parallel
+
+
+def square_shard(shard):
+    if 13 in shard:
+        raise ValueError("Invalid item")
+    return [(item * item, os.getpid()) for item in shard]
+
+
+def get_default_api_url(shard):
+    return [cdot_geospatial_api.get_default_api().BASE_URL for _ in shard]
+
+
+def create_api():
+    return cdot_geospatial_api.GeospatialApi(BASE_URL="https://worker-gis")
+
+
+def test_map_shards_order():
+    items = list(range(12))
+    results = parallel.map_shards(square_shard, items, workers=3, shardSize=2)
+
+    assert [result for result, _ in results] == [i * i for i in items]
+    assert all(pid != os.getpid() for _, pid in results)
+
+
+def test_map_shards_isolates_failed_shards():
+    results = parallel.map_shards(square_shard, list(range(20)), workers=2, shardSize=5)
+
+    # The shard containing 13 fails, without affecting the other shards
+    assert [result for result, _ in results] == [
+        i * i for i in list(range(10)) + list(range(15, 20))
+    ]
+
+
+def test_map_shards_in_process():
+    results = parallel.map_shards(square_shard, [1, 2, 3], workers=1)
+    assert results == [(1, os.getpid()), (4, os.getpid()), (9, os.getpid())]
+
+
+def test_init_worker_api():
+    results = parallel.map_shards(
+        get_default_api_url,
+        [1, 2, 3, 4],
+        workers=2,
+        initializer=parallel.init_worker_api,
+        initargs=(create_api,),
+    )
+    assert results == ["https://worker-gis"] * 4
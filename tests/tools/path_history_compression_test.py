@@ -1,5 +1,5 @@
 import json
-from wzdx.tools import path_history_compression
+from wzdx.tools import geometry_benchmark, path_history_compression
 import unittest
 
 
@@ -33,3 +33,16 @@ def test_generage_compressed_path_short():
 
     compressed = path_history_compression.generate_compressed_path(path)
     assert len(compressed) == 3
+
+
+def test_generate_compressed_path_matches_iterative():
+    wzdx = json.loads(open("./tests/data/path_compression_valid_path.json").read())
+    paths = [wzdx["features"][0]["geometry"]["coordinates"]]
+    paths.extend(geometry_benchmark.generate_path(1000, seed) for seed in range(5))
+    # Densely sampled straight road, evaluated in windows
+    paths.append([[-105.0 + i * 0.000001, 39.0 + i * 0.000001] for i in range(500)])
+
+    for path in paths:
+        assert path_history_compression.generate_compressed_path(
+            path
+        ) == path_history_compression.generate_compressed_path_iterative(path)
@@ -35,6 +35,59 @@ def test_generate_buffer_polygon_from_linestring():
     )
 
 
+def test_generate_buffer_polygon_from_linestring_matches_iterative():
+    polyline = [
+        [-105.0, 39.0],
+        [-105.0, 39.001],
+        [-105.0, 39.001],
+        [-104.999, 39.0015],
+        [-104.998, 39.001],
+    ]
+
+    actual = polygon_tools.generate_buffer_polygon_from_linestring(polyline, 20)
+    expected = polygon_tools.generate_buffer_polygon_from_linestring_iterative(
+        polyline, 20
+    )
+
+    actual_points = polygon_tools.polygon_to_list(actual)
+    expected_points = polygon_tools.polygon_to_list(expected)
+    assert len(actual_points) == len(expected_points)
+    for actual_point, expected_point in zip(actual_points, expected_points):
+        assert abs(actual_point[0] - expected_point[0]) < 1e-12
+        assert abs(actual_point[1] - expected_point[1]) < 1e-12
+
+
+def test_generate_buffer_polygon_from_linestring_projected():
+    polyline = [
+        [-105.02518638968468, 39.776638166930375],
+        [-105.02523601055145, 39.771953483109826],
+    ]
+    width = 50
+
+    polygon = polygon_tools.generate_buffer_polygon_from_linestring(
+        polyline, width, polygon_tools.BUFFER_PROJECTED
+    )
+    geodesic = polygon_tools.generate_buffer_polygon_from_linestring(polyline, width)
+
+    # Same lat/long order and shape as the geodesic buffer, with flat caps
+    assert polygon.is_valid
+    assert polygon_tools.is_point_in_polygon([39.774, -105.0252], polygon)
+    assert abs(polygon.area / geodesic.area - 1) < 0.01
+
+    round_caps = polygon_tools.generate_buffer_polygon_from_linestring(
+        polyline, width, polygon_tools.BUFFER_PROJECTED, capStyle="round"
+    )
+    assert round_caps.area > polygon.area
+
+
+def test_generate_buffer_polygon_from_linestring_invalid():
+    assert polygon_tools.generate_buffer_polygon_from_linestring([], 10) is None
+    assert (
+        polygon_tools.generate_buffer_polygon_from_linestring([[-105.0, 39.0]], 10)
+        is None
+    )
+
+
 def test_polygon_to_list():
     expected = [[0, 0], [0, 1], [10, 1], [10, 0], [0, 0]]
     polygon = Polygon(expected)
@@ -110,3 +163,55 @@ def test_polygon_to_polyline_center_invalid_string():
     expected = None
     actual = polygon_tools.polygon_to_polyline_center(coordinates)
     assert actual == expected
+
+
+def test_polygon_index():
+    square = [[39.0, -105.0], [39.0, -104.0], [40.0, -104.0], [40.0, -105.0]]
+    index = polygon_tools.PolygonIndex(
+        {
+            "square": square,
+            "corner": Polygon(
+                [[39.5, -104.5], [39.5, -103.5], [40.5, -103.5], [40.5, -104.5]]
+            ),
+        }
+    )
+    points = [[39.2, -104.8], [39.7, -104.2], [40.2, -103.8], [38.0, -100.0]]
+
+    assert len(index) == 2
+    assert index.query(points) == [["square"], ["square", "corner"], ["corner"], []]
+    assert index.contains((39.7, -104.2)) == ["square", "corner"]
+
+    assert index.remove("square")
+    assert not index.remove("square")
+    assert "square" not in index
+    assert index.query(points) == [[], ["corner"], ["corner"], []]
+
+    assert index.insert("square", square)
+    assert index.query(points[:2]) == [["square"], ["corner", "square"]]
+
+    assert not index.insert("invalid", None)
+    assert index.query([]) == []
+    assert polygon_tools.PolygonIndex().query(points) == [[], [], [], []]
+
+
+def test_polygon_index_matches_is_point_in_polygon():
+    polygons = {
+        i: polygon_tools.generate_buffer_polygon_from_linestring(
+            [[-105.0 + i * 0.0005, 39.0], [-105.0 + i * 0.0005, 39.002]], 60
+        )
+        for i in range(10)
+    }
+    points = [[39.0 + (i % 7) * 0.0003, -105.0 + (i % 13) * 0.0004] for i in range(100)]
+
+    actual = polygon_tools.PolygonIndex(polygons).query(points)
+
+    expected = [
+        [
+            i
+            for i, polygon in polygons.items()
+            if polygon_tools.is_point_in_polygon(point, polygon)
+        ]
+        for point in points
+    ]
+    assert actual == expected
+    assert any(len(match) > 1 for match in actual)
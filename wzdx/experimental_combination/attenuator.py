@@ -7,6 +7,7 @@ from ..tools import (
     geospatial_tools,
     combination,
     date_tools,
+    gis_cache,
     wzdx_translator,
 )
 import logging
@@ -33,7 +34,7 @@ def main():
             date_tools.get_iso_string_from_datetime(datetime.now() + timedelta(days=2))
         )
 
-    combined_events = get_combined_events(geotab_avl, wzdx)
+    combined_events = get_combined_events(geotab_avl, wzdx, create_geospatial_api())
 
     if len(combined_events) == 0:
         print(
@@ -77,6 +78,18 @@ def parse_rtdh_arguments() -> tuple[str, str, str, str]:
     return args.wzdxFile, args.geotabFile, args.outputDir, args.updateDates
 
 
+def create_geospatial_api() -> cdot_geospatial_api.GeospatialApi:
+    """Create the GeospatialApi used to combine Geotab AVL positions with WZDx messages
+
+    Returns:
+        cdot_geospatial_api.GeospatialApi: configured GeospatialApi object
+    """
+    # Geotab AVL positions repeat while a vehicle is stopped. Share GIS route lookups between nearby positions
+    return cdot_geospatial_api.GeospatialApi(
+        routeMeasureMemo=gis_cache.RouteMeasureMemo()
+    )
+
+
 def validate_directionality(geotab: dict, wzdx: dict) -> bool:
     """Validate that the directionality of the Geotab and WZDx objects match
 
@@ -145,36 +158,52 @@ def validate_dates(geotab: dict, wzdx: dict) -> bool:
     return wzdx_start_date <= geotab_date <= wzdx_end_date
 
 
-def get_combined_events(geotab_msgs: list[dict], wzdx_msgs: list[dict]) -> list[dict]:
+def get_combined_events(
+    geotab_msgs: list[dict],
+    wzdx_msgs: list[dict],
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
+) -> list[dict]:
     """Combine/integrate overlapping Geotab AVL ATMA messages into WZDx messages
 
     Args:
         icone_standard_msgs (list[dict]): iCone RTDH standard messages
         wzdx_msgs (list[dict]): WZDx messages
+        cdotGeospatialApi (GeospatialApi, optional): Api for route details and geometry. Defaults to None, the process-wide default api, see `cdot_geospatial_api.configure_default_api`.
 
     Returns:
         list[dict]: Combined WZDx messages
     """
     active_wzdx_msgs = wzdx_translator.filter_active_wzdx(wzdx_msgs)
 
+    route_details_map = combination.get_route_details_map_for_wzdx(
+        [active_wzdx_msgs], cdotGeospatialApi
+    )
+
     combined_events = []
-    for i in identify_overlapping_features(geotab_msgs, active_wzdx_msgs):
+    for i in identify_overlapping_features(
+        geotab_msgs, active_wzdx_msgs, cdotGeospatialApi, route_details_map
+    ):
         geotab_msg, wzdx_msg = i
         event_status = wzdx_translator.get_event_status(wzdx_msg["features"][0])
         if event_status in ["active"]:
-            wzdx = combine_geotab_with_wzdx(geotab_msg, wzdx_msg)
+            wzdx = combine_geotab_with_wzdx(geotab_msg, wzdx_msg, cdotGeospatialApi)
             combined_events.append(wzdx)
     return combined_events
 
 
 def identify_overlapping_features(
-    geotab_msgs: list[dict], wzdx_msgs: list[dict]
+    geotab_msgs: list[dict],
+    wzdx_msgs: list[dict],
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
+    routeDetailsMap: dict = None,
 ) -> list[tuple[dict, dict]]:
     """Identify overlapping Geotab AVL ATMA and WZDx messages
 
     Args:
         geotab_msgs (list[dict]): Geotab avl messages
         wzdx_msgs (list[dict]): WZDx messages
+        cdotGeospatialApi (GeospatialApi, optional): Api for route details. Defaults to None, the process-wide default api.
+        routeDetailsMap (dict, optional): Pre-fetched WZDx route details, see `combination.get_route_details_map_for_wzdx`. Defaults to None.
 
     Returns:
         list[tuple[dict, dict]]: List of tuples of Geotab and WZDx messages that overlap
@@ -185,8 +214,11 @@ def identify_overlapping_features(
     for geotab_msg in geotab_msgs:
         geometry = geotab_msg["avl_location"]["position"]
 
-        route_details = cdot_geospatial_api.GeospatialApi().get_route_and_measure(
-            (geometry["latitude"], geometry["longitude"])
+        route_details = combination.get_route_details(
+            geometry["latitude"],
+            geometry["longitude"],
+            None,
+            cdotGeospatialApi,
         )
         if not route_details:
             logging.debug(
@@ -220,9 +252,11 @@ def identify_overlapping_features(
                 f"Missing route_details for WZDx object: {wzdx['features'][0]['id']}"
             )
             continue
-        if not wzdx.get("route_details_start") or not wzdx.get("route_details_end"):
+        if combination.is_missing_route_details(wzdx["features"][0]):
             route_details_start, route_details_end = (
-                combination.get_route_details_for_wzdx(wzdx["features"][0])
+                combination.get_route_details_for_wzdx(
+                    wzdx["features"][0], routeDetailsMap, cdotGeospatialApi
+                )
             )
 
             if not route_details_start or not route_details_end:
@@ -279,12 +313,17 @@ def identify_overlapping_features(
     return matching_routes
 
 
-def combine_geotab_with_wzdx(geotab_avl: dict, wzdx_wzdx: dict) -> dict:
+def combine_geotab_with_wzdx(
+    geotab_avl: dict,
+    wzdx_wzdx: dict,
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
+) -> dict:
     """Combine Geotab AVL ATMA message with WZDx message. Converts WZDx message to planned-moving-area, with geometry and mile markers from ATMA position and speed.
 
     Args:
         geotab_avl (dict): Geotab AVL ATMA message
         wzdx_wzdx (dict): WZDx message
+        cdotGeospatialApi (GeospatialApi, optional): Api for route geometry. Defaults to None, the process-wide default api.
 
     Returns:
         dict: Combined WZDx message
@@ -303,7 +342,12 @@ def combine_geotab_with_wzdx(geotab_avl: dict, wzdx_wzdx: dict) -> dict:
     mMin = min(event_start_marker, event_end_marker)
     mMax = max(event_start_marker, event_end_marker)
     geometry, startMarker, endMarker = get_geometry_for_distance_ahead(
-        distance_ahead, route_details, bearing, mMin, mMax
+        distance_ahead,
+        route_details,
+        bearing,
+        mMin,
+        mMax,
+        cdotGeospatialApi=cdotGeospatialApi,
     )
     combined_feature["properties"]["beginning_milepost"] = startMarker
     combined_feature["properties"]["ending_milepost"] = endMarker
@@ -350,7 +394,12 @@ def combine_geotab_with_wzdx(geotab_avl: dict, wzdx_wzdx: dict) -> dict:
 
 
 def get_geometry_for_distance_ahead(
-    distance_ahead: float, route_details: dict, bearing: float, mMin: float, mMax: float
+    distance_ahead: float,
+    route_details: dict,
+    bearing: float,
+    mMin: float,
+    mMax: float,
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
 ) -> tuple[list[list[float]], float, float]:
     """Get the geometry for a distance ahead on a route, within the bounds of mile markers
 
@@ -360,11 +409,12 @@ def get_geometry_for_distance_ahead(
         bearing (float): Vehicle bearing
         mMin (float): Minimum mile marker of event, to generate geometry within
         mMax (float): Maximum mile marker of event, to generate geometry within
+        cdotGeospatialApi (GeospatialApi, optional): Api for route geometry. Defaults to None, the process-wide default api.
 
     Returns:
         tuple[list[list[float]], float, float]: Geometry, start mile marker, end mile marker
     """
-    route_ahead = cdot_geospatial_api.GeospatialApi().get_route_geometry_ahead(
+    route_ahead = combination.get_api(cdotGeospatialApi).get_route_geometry_ahead(
         route_details["Route"],
         route_details["Measure"],
         bearing,
@@ -5,7 +5,13 @@ from datetime import datetime, timedelta
 import glob
 from typing import Literal
 
-from ..tools import combination, wzdx_translator, geospatial_tools, date_tools
+from ..tools import (
+    cdot_geospatial_api,
+    combination,
+    wzdx_translator,
+    geospatial_tools,
+    date_tools,
+)
 
 PROGRAM_NAME = "ExperimentalCombinationIcone"
 PROGRAM_VERSION = "1.0"
@@ -121,13 +127,16 @@ def get_direction(
 
 
 def get_combined_events(
-    icone_standard_msgs: list[dict], wzdx_msgs: list[dict]
+    icone_standard_msgs: list[dict],
+    wzdx_msgs: list[dict],
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
 ) -> list[dict]:
     """Combine/integrate overlapping iCone messages into WZDx messages
 
     Args:
         icone_standard_msgs (list[dict]): iCone RTDH standard messages
         wzdx_msgs (list[dict]): WZDx messages
+        cdotGeospatialApi (GeospatialApi, optional): Api for route details. Defaults to None, the process-wide default api, see `cdot_geospatial_api.configure_default_api`.
 
     Returns:
         list[dict]: Combined WZDx messages
@@ -138,8 +147,11 @@ def get_combined_events(
         wzdx_msgs, ["pending", "completed_recently"]
     )
 
+    route_details_map = combination.get_route_details_map_for_wzdx(
+        [filtered_wzdx_msgs], cdotGeospatialApi
+    )
     for i in identify_overlapping_features_icone(
-        icone_standard_msgs, filtered_wzdx_msgs
+        icone_standard_msgs, filtered_wzdx_msgs, cdotGeospatialApi, route_details_map
     ):
         icone_msg, wzdx_msg = i
         event_status = wzdx_translator.get_event_status(wzdx_msg["features"][0])
@@ -212,17 +224,21 @@ def combine_icone_with_wzdx(
         return None
 
 
-def get_route_details_for_icone(coordinates: list[list[float]]) -> tuple[dict, dict]:
+def get_route_details_for_icone(
+    coordinates: list[list[float]],
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
+) -> tuple[dict, dict]:
     """Get route details for iCone message
 
     Args:
         coordinates (list[list[float]]): List of coordinates
+        cdotGeospatialApi (GeospatialApi, optional): Api for route details. Defaults to None, the process-wide default api.
 
     Returns:
         tuple[dict, dict]: Route details for start and end coordinates
     """
     route_details_start = combination.get_route_details(
-        coordinates[0][1], coordinates[0][0]
+        coordinates[0][1], coordinates[0][0], cdotGeospatialApi=cdotGeospatialApi
     )
 
     if len(coordinates) == 1 or (
@@ -231,7 +247,7 @@ def get_route_details_for_icone(coordinates: list[list[float]]) -> tuple[dict, d
         route_details_end = None
     else:
         route_details_end = combination.get_route_details(
-            coordinates[-1][1], coordinates[-1][0]
+            coordinates[-1][1], coordinates[-1][0], cdotGeospatialApi=cdotGeospatialApi
         )
 
     return route_details_start, route_details_end
@@ -283,13 +299,18 @@ def validate_dates(icone: dict, wzdx: dict) -> bool:
 
 
 def identify_overlapping_features_icone(
-    icone_standard_msgs: list[dict], wzdx_msgs: list[dict]
+    icone_standard_msgs: list[dict],
+    wzdx_msgs: list[dict],
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
+    routeDetailsMap: dict = None,
 ) -> list[tuple[dict, dict]]:
     """Identify overlapping iCone and WZDx messages
 
     Args:
         icone_standard_msgs (list[dict]): iCone RTDH standard messages
         wzdx_msgs (list[dict]): WZDx messages
+        cdotGeospatialApi (GeospatialApi, optional): Api for route details. Defaults to None, the process-wide default api.
+        routeDetailsMap (dict, optional): Pre-fetched WZDx route details, see `combination.get_route_details_map_for_wzdx`. Defaults to None.
 
     Returns:
         list[tuple[dict, dict]]: Overlapping iCone and WZDx messages
@@ -307,7 +328,7 @@ def identify_overlapping_features_icone(
             icone["event"].get("additional_info", {}).get("route_details_end")
         )
         route_details_start, route_details_end = get_route_details_for_icone(
-            icone["event"]["geometry"]
+            icone["event"]["geometry"], cdotGeospatialApi
         )
 
         if not route_details_start:
@@ -350,9 +371,11 @@ def identify_overlapping_features_icone(
                 f"Missing route_details for WZDx object: {wzdx['features'][0]['id']}"
             )
             continue
-        if not wzdx.get("route_details_start") and not wzdx.get("route_details_end"):
+        if combination.is_missing_route_details(wzdx["features"][0]):
             route_details_start, route_details_end = (
-                combination.get_route_details_for_wzdx(wzdx["features"][0])
+                combination.get_route_details_for_wzdx(
+                    wzdx["features"][0], routeDetailsMap, cdotGeospatialApi
+                )
             )
 
             if not route_details_start or not route_details_end:
@@ -1,7 +1,7 @@
 import argparse
 import json
 
-from ..tools import combination, date_tools, wzdx_translator
+from ..tools import cdot_geospatial_api, combination, date_tools, wzdx_translator
 from datetime import datetime, timedelta
 
 PROGRAM_NAME = "ExperimentalCombinationNavjoy568"
@@ -74,13 +74,16 @@ def parse_rtdh_arguments() -> tuple[str, str, str, str]:
 
 
 def get_combined_events(
-    navjoy_wzdx_msgs: list[dict], wzdx_msgs: list[dict]
+    navjoy_wzdx_msgs: list[dict],
+    wzdx_msgs: list[dict],
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
 ) -> list[dict]:
     """Combine/integrate overlapping Navjoy 568 messages into WZDx messages
 
     Args:
         navjoy_wzdx_msgs (list[dict]): Navjoy 568 messages
         wzdx_msgs (list[dict]): WZDx messages
+        cdotGeospatialApi (GeospatialApi, optional): Api for route details. Defaults to None, the process-wide default api, see `cdot_geospatial_api.configure_default_api`.
 
     Returns:
         list[dict]: Combined WZDx messages
@@ -88,8 +91,11 @@ def get_combined_events(
     combined_events = []
     active_navjoy_wzdx_msgs = wzdx_translator.filter_active_wzdx(navjoy_wzdx_msgs)
     active_wzdx_msgs = wzdx_translator.filter_active_wzdx(wzdx_msgs)
+    route_details_map = combination.get_route_details_map_for_wzdx(
+        [active_navjoy_wzdx_msgs, active_wzdx_msgs], cdotGeospatialApi
+    )
     for i in combination.identify_overlapping_features_wzdx(
-        active_navjoy_wzdx_msgs, active_wzdx_msgs
+        active_navjoy_wzdx_msgs, active_wzdx_msgs, cdotGeospatialApi, route_details_map
     ):
         navjoy_msg, wzdx_msg = i
         event_status = wzdx_translator.get_event_status(wzdx_msg["features"][0])
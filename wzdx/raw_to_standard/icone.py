@@ -6,8 +6,17 @@ import time
 import uuid
 import xml.etree.ElementTree as ET
 from collections import OrderedDict
-
-from ..tools import date_tools, geospatial_tools, wzdx_translator, combination
+from typing import Callable
+
+from ..tools import (
+    cdot_geospatial_api,
+    date_tools,
+    geospatial_tools,
+    wzdx_translator,
+    combination,
+    gis_cache,
+    parallel,
+)
 from ..util.collections import PathDict
 
 PROGRAM_NAME = "iConeRawToStandard"
@@ -15,9 +24,15 @@ PROGRAM_VERSION = "1.0"
 
 
 def main():
-    input_file, output_dir = parse_rtdh_arguments()
+    input_file, output_dir, workers = parse_rtdh_arguments()
     input_file_contents = open(input_file, "r").read()
-    generated_messages = generate_standard_messages_from_string(input_file_contents)
+    if workers > 1:
+        generated_messages = generate_standard_messages_parallel(
+            generate_raw_messages(input_file_contents), workers
+        )
+    else:
+        cdot_geospatial_api.configure_default_api(create_geospatial_api())
+        generated_messages = generate_standard_messages_from_string(input_file_contents)
 
     generated_files_list = []
     features = []
@@ -55,6 +70,19 @@ def main():
         )
 
 
+def create_geospatial_api() -> cdot_geospatial_api.GeospatialApi:
+    """Create the GeospatialApi used to translate iCone incidents. Also used to create the api of each worker process, see
+    `generate_standard_messages_parallel`
+
+    Returns:
+        cdot_geospatial_api.GeospatialApi: configured GeospatialApi object
+    """
+    # iCone devices report their position repeatedly, with GPS noise. Share GIS route lookups between nearby positions
+    return cdot_geospatial_api.GeospatialApi(
+        routeMeasureMemo=gis_cache.RouteMeasureMemo()
+    )
+
+
 def generate_standard_messages_from_string(input_file_contents: str):
     """Generate RTDH standard messages from iCone XML string
 
@@ -62,14 +90,69 @@ def generate_standard_messages_from_string(input_file_contents: str):
         input_file_contents: iCone XML string data
     """
     raw_messages = generate_raw_messages(input_file_contents)
+    route_details_map = combination.get_route_details_map(
+        [get_coordinates_from_raw(message) for message in raw_messages]
+    )
     standard_messages = []
     for message in raw_messages:
         standard_messages.append(
-            generate_rtdh_standard_message_from_raw_single(message)
+            generate_rtdh_standard_message_from_raw_single(message, route_details_map)
         )
     return standard_messages
 
 
+def generate_standard_messages_parallel(
+    raw_messages: list[bytes],
+    workers: int,
+    apiFactory: Callable[[], cdot_geospatial_api.GeospatialApi] = create_geospatial_api,
+) -> list[dict]:
+    """Generate RTDH standard messages from iCone incidents in a pool of worker processes, each with its own GeospatialApi.
+    Messages are returned in input order, and incidents which fail are logged and skipped
+
+    Args:
+        raw_messages: xml strings of iCone incidents, see `generate_raw_messages`
+        workers: number of worker processes
+        apiFactory: picklable (module level) function creating the api of each worker. Defaults to `create_geospatial_api`.
+
+    Returns:
+        list[dict]: RTDH standard messages
+    """
+    if workers <= 1:
+        return generate_standard_messages_from_raw(raw_messages)
+    return parallel.map_shards(
+        generate_standard_messages_from_raw,
+        raw_messages,
+        workers,
+        initializer=parallel.init_worker_api,
+        initargs=(apiFactory,),
+    )
+
+
+def generate_standard_messages_from_raw(raw_messages: list[bytes]) -> list[dict]:
+    """Generate RTDH standard messages from iCone incidents, logging and skipping incidents which fail to translate
+
+    Args:
+        raw_messages: xml strings of iCone incidents, see `generate_raw_messages`
+
+    Returns:
+        list[dict]: RTDH standard messages
+    """
+    route_details_map = combination.get_route_details_map(
+        [get_coordinates_from_raw(message) for message in raw_messages]
+    )
+    standard_messages = []
+    for message in raw_messages:
+        try:
+            standard_messages.append(
+                generate_rtdh_standard_message_from_raw_single(
+                    message, route_details_map
+                )
+            )
+        except Exception as e:
+            logging.error(f"Failed to translate iCone incident: {e}", exc_info=True)
+    return standard_messages
+
+
 def generate_raw_messages(message: str):
     """Parse iCone XML string and return list of validated xml incidents
 
@@ -92,27 +175,43 @@ def generate_raw_messages(message: str):
     return messages
 
 
-def generate_rtdh_standard_message_from_raw_single(raw_message_xml: str) -> dict:
+def generate_rtdh_standard_message_from_raw_single(
+    raw_message_xml: str, routeDetailsMap: dict = None
+) -> dict:
     """Generate RTDH standard message from iCone XML string
 
     Args:
         raw_message_xml: xml string iCone incident
+        routeDetailsMap: Optional pre-fetched GIS route details, see `combination.get_route_details_map`. Defaults to None.
 
     Returns:
         dict: RTDH standard message
     """
     obj = wzdx_translator.parse_xml_to_dict(raw_message_xml)
     pd = PathDict(obj)
-    standard_message = create_rtdh_standard_msg(pd)
+    standard_message = create_rtdh_standard_msg(pd, routeDetailsMap)
     return standard_message
 
 
+def get_coordinates_from_raw(raw_message_xml: str) -> list[list[float]]:
+    """Get incident coordinates (long/lat) from iCone XML string
+
+    Args:
+        raw_message_xml: xml string iCone incident
+
+    Returns:
+        list[list[float]]: incident coordinates
+    """
+    pd = PathDict(wzdx_translator.parse_xml_to_dict(raw_message_xml))
+    return pd.get("incident/location/polyline", parse_icone_polyline)
+
+
 # parse script command line arguments
-def parse_rtdh_arguments() -> tuple[str, str]:
+def parse_rtdh_arguments() -> tuple[str, str, int]:
     """Parse command line arguments for iCone to RTDH Standard translation
 
     Returns:
-        tuple[str, str]: iCone file path, output directory
+        tuple[str, str, int]: iCone file path, output directory, number of worker processes
     """
     parser = argparse.ArgumentParser(
         description="Translate iCone data to RTDH Standard"
@@ -125,8 +224,16 @@ def parse_rtdh_arguments() -> tuple[str, str]:
         "--outputDir", required=False, default="./", help="output directory"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        required=False,
+        default=1,
+        help="number of worker processes",
+    )
+
     args = parser.parse_args()
-    return args.iconeFile, args.outputDir
+    return args.iconeFile, args.outputDir, args.workers
 
 
 # function to parse polyline to geometry line string
@@ -169,11 +276,12 @@ def get_sensor_list(incident: dict | OrderedDict):
     return devices
 
 
-def create_rtdh_standard_msg(pd: PathDict):
+def create_rtdh_standard_msg(pd: PathDict, routeDetailsMap: dict = None):
     """Create RTDH standard message from iCone incident pathDict
 
     Args:
         pd: iCone incident pathDict
+        routeDetailsMap: Optional pre-fetched GIS route details, see `combination.get_route_details_map`. Defaults to None.
     """
     devices = get_sensor_list(pd.get("incident"))
     start_time = pd.get(
@@ -195,7 +303,9 @@ def create_rtdh_standard_msg(pd: PathDict):
     coordinates = pd.get("incident/location/polyline", parse_icone_polyline)
 
     route_details_start, route_details_end = (
-        combination.get_route_details_for_coordinates_lngLat(coordinates)
+        combination.get_route_details_for_coordinates_lngLat(
+            coordinates, routeDetailsMap
+        )
     )
 
     direction = get_direction(
@@ -1,17 +1,20 @@
 import argparse
-import copy
 import json
 import logging
 import time
 import uuid
 from collections import OrderedDict
+from typing import Callable
 
 from ..tools import (
     array_tools,
+    cdot_geospatial_api,
     date_tools,
     geospatial_tools,
+    gis_rate_limit,
     polygon_tools,
     combination,
+    parallel,
 )
 from ..util.collections import PathDict
 
@@ -89,9 +92,14 @@ NUMBERED_KEY_NAMES = [
 
 
 def main():
-    navjoy_file, output_dir = parse_rtdh_arguments()
+    navjoy_file, output_dir, workers = parse_rtdh_arguments()
     input_file_contents = open(navjoy_file, "r").read()
-    generated_messages = generate_standard_messages_from_string(input_file_contents)
+    if workers > 1:
+        generated_messages = generate_standard_messages_parallel(
+            generate_raw_messages(input_file_contents), workers
+        )
+    else:
+        generated_messages = generate_standard_messages_from_string(input_file_contents)
 
     generated_files_list = []
     for message in generated_messages:
@@ -106,12 +114,13 @@ def main():
 
 
 # parse script command line arguments
-def parse_rtdh_arguments() -> tuple[str, str]:
+def parse_rtdh_arguments() -> tuple[str, str, int]:
     """Parse command line arguments for NavJoy 568 to RTDH Standard translation
 
     Returns:
         str: navjoy file path
         str: output directory path
+        int: number of worker processes
     """
     parser = argparse.ArgumentParser(
         description="Translate NavJoy 568 data to RTDH Standard"
@@ -124,8 +133,16 @@ def parse_rtdh_arguments() -> tuple[str, str]:
         "--outputDir", required=False, default="./", help="output directory"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        required=False,
+        default=1,
+        help="number of worker processes",
+    )
+
     args = parser.parse_args()
-    return args.navjoyFile, args.outputDir
+    return args.navjoyFile, args.outputDir, args.workers
 
 
 # take in individual message, spit out list of altered unique messages to be translated
@@ -148,22 +165,22 @@ def expand_speed_zone(message: dict) -> list[dict]:
     """
     try:
         messages = []
+        data = message.get("data", {})
         for key_set in NUMBERED_KEY_NAMES:
-            if not message.get("data", {}).get(key_set["street_name"]):
+            if not data.get(key_set["street_name"]):
                 continue
-            new_message = copy.deepcopy(message)
+            # Copy on write: only the data is copied, the srzmap geometry and all other values are shared with the original message
+            new_data = dict(data)
             for key, value in key_set.items():
-                new_message.get("data", {})[CORRECT_KEY_NAMES[key]] = message.get(
-                    "data", {}
-                ).get(value)
+                new_data[CORRECT_KEY_NAMES[key]] = data.get(value)
 
-            directions = new_message.get("data", {}).get("directionOfTraffic")
+            directions = new_data.get("directionOfTraffic")
             if directions:
-                del new_message.get("data", {})["directionOfTraffic"]
+                del new_data["directionOfTraffic"]
             for direction in get_directions_from_string(directions):
-                new_message_dir = copy.deepcopy(new_message)
-                new_message_dir.get("data", {})["direction"] = direction
-                messages.append(new_message_dir)
+                messages.append(
+                    {**message, "data": {**new_data, "direction": direction}}
+                )
         return messages
     except Exception as e:
         logging.error(e)
@@ -204,14 +221,87 @@ def generate_standard_messages_from_string(input_file_contents: str) -> list[dic
         list[dict]: List of RTDH standard messages
     """
     raw_messages = generate_raw_messages(input_file_contents)
+    route_details_map = get_route_details_map(raw_messages)
     standard_messages = []
     for message in raw_messages:
         standard_messages.append(
-            generate_rtdh_standard_message_from_raw_single(message)
+            generate_rtdh_standard_message_from_raw_single(message, route_details_map)
         )
     return standard_messages
 
 
+def generate_standard_messages_parallel(
+    raw_messages: list[dict],
+    workers: int,
+    apiFactory: Callable[[], cdot_geospatial_api.GeospatialApi] = None,
+) -> list[dict]:
+    """Generate RTDH standard messages from raw 568 messages in a pool of worker processes, each with its own GeospatialApi.
+    Messages are returned in input order, and messages which fail are logged and skipped
+
+    Args:
+        raw_messages (list[dict]): List of raw 568 messages, see `generate_raw_messages`
+        workers (int): Number of worker processes
+        apiFactory (() => GeospatialApi, optional): Picklable (module level) function creating the api of each worker. Defaults to None, GeospatialApi().
+
+    Returns:
+        list[dict]: List of RTDH standard messages
+    """
+    if workers <= 1:
+        return generate_standard_messages_from_raw(raw_messages)
+    return parallel.map_shards(
+        generate_standard_messages_from_raw,
+        raw_messages,
+        workers,
+        initializer=parallel.init_worker_api,
+        initargs=(apiFactory,),
+    )
+
+
+def generate_standard_messages_from_raw(raw_messages: list[dict]) -> list[dict]:
+    """Generate RTDH standard messages from raw 568 messages, logging and skipping messages which fail to translate
+
+    Args:
+        raw_messages (list[dict]): List of raw 568 messages, see `generate_raw_messages`
+
+    Returns:
+        list[dict]: List of RTDH standard messages
+    """
+    route_details_map = get_route_details_map(raw_messages)
+    standard_messages = []
+    for message in raw_messages:
+        try:
+            standard_messages.append(
+                generate_rtdh_standard_message_from_raw_single(
+                    message, route_details_map
+                )
+            )
+        except Exception as e:
+            logging.error(
+                f"Failed to translate 568 message {message.get('sys_gUid')}: {e}",
+                exc_info=True,
+            )
+    return standard_messages
+
+
+def get_route_details_map(raw_messages: list[dict]) -> dict[tuple[float, float], dict]:
+    """Get GIS route details for the start and end points of all raw 568 messages in concurrent batches, live events first,
+    see `combination.get_route_details_map`
+
+    Args:
+        raw_messages (list[dict]): List of raw 568 messages, see `generate_raw_messages`
+
+    Returns:
+        dict[tuple[float, float], dict]: GIS route details, keyed by (lat, long)
+    """
+    return combination.get_route_details_map(
+        [get_coordinates(PathDict(message)) for message in raw_messages],
+        priorities=[
+            gis_rate_limit.get_event_priority(get_event_status(PathDict(message)))
+            for message in raw_messages
+        ],
+    )
+
+
 def generate_raw_messages(message_string: str) -> list[dict]:
     """Validate and generate raw messages from 568 message string, using the `expand_speed_zone` method
 
@@ -233,17 +323,20 @@ def generate_raw_messages(message_string: str) -> list[dict]:
     return messages
 
 
-def generate_rtdh_standard_message_from_raw_single(obj: dict) -> dict:
+def generate_rtdh_standard_message_from_raw_single(
+    obj: dict, routeDetailsMap: dict = None
+) -> dict:
     """Generate RTDH standard message from raw 568 message using `create_rtdh_standard_msg`
 
     Args:
         obj (dict): 568 message object
+        routeDetailsMap (dict, optional): Pre-fetched GIS route details, see `combination.get_route_details_map`. Defaults to None.
 
     Returns:
         dict: RTDH standard message
     """
     pd = PathDict(obj)
-    standard_message = create_rtdh_standard_msg(pd)
+    standard_message = create_rtdh_standard_msg(pd, routeDetailsMap)
     return standard_message
 
 
@@ -275,15 +368,16 @@ def get_polygon_index(map):
             return i
 
 
-def create_rtdh_standard_msg(pd: PathDict) -> dict:
-    """Create RTDH standard message from raw 568 message object
+def get_coordinates(pd: PathDict) -> list[list[float]]:
+    """Get coordinates from the srzmap LineString of a raw 568 message, falling back to the center line of the srzmap Polygon
 
     Args:
         pd (PathDict): raw 568 message object
 
     Returns:
-        dict: RTDH standard message
+        list[list[float]]: coordinates (long/lat), or None if no geometry is found
     """
+    coordinates = None
     map = pd.get("data/srzmap", default=[])
     index = get_linestring_index(map)
     if index is not None:
@@ -296,6 +390,34 @@ def create_rtdh_standard_msg(pd: PathDict) -> dict:
             coordinates = array_tools.get_2d_list(polygon)
             if coordinates:
                 coordinates = polygon_tools.polygon_to_polyline_center(coordinates)
+    return coordinates
+
+
+def get_event_status(pd: PathDict) -> str | None:
+    """Get the current status of a raw 568 message, see `date_tools.get_event_status`
+
+    Args:
+        pd (PathDict): raw 568 message object
+
+    Returns:
+        str | None: event status
+    """
+    start_date = pd.get("data/workStartDate", date_tools.parse_datetime_from_iso_string)
+    end_date = pd.get("data/workStartDate", date_tools.parse_datetime_from_iso_string)
+    return date_tools.get_event_status(start_date, end_date)
+
+
+def create_rtdh_standard_msg(pd: PathDict, routeDetailsMap: dict = None) -> dict:
+    """Create RTDH standard message from raw 568 message object
+
+    Args:
+        pd (PathDict): raw 568 message object
+        routeDetailsMap (dict, optional): Pre-fetched GIS route details, see `combination.get_route_details_map`. Defaults to None.
+
+    Returns:
+        dict: RTDH standard message
+    """
+    coordinates = get_coordinates(pd)
 
     direction = pd.get("data/direction", default="unknown")
 
@@ -307,11 +429,8 @@ def create_rtdh_standard_msg(pd: PathDict) -> dict:
         direction == REVERSED_DIRECTION_MAP.get(polyline_direction)
         and direction != "undefined"
     ):
-        coordinates.reverse()
-
-    route_details_start, route_details_end = (
-        combination.get_route_details_for_coordinates_lngLat(coordinates)
-    )
+        # Not reversed in place, the srzmap geometry is shared between directions, see `expand_speed_zone`
+        coordinates = coordinates[::-1]
 
     start_date = pd.get("data/workStartDate", date_tools.parse_datetime_from_iso_string)
     end_date = pd.get("data/workStartDate", date_tools.parse_datetime_from_iso_string)
@@ -320,6 +439,12 @@ def create_rtdh_standard_msg(pd: PathDict) -> dict:
 
     condition_1 = event_status in ["active", "pending", "planned"]
 
+    route_details_start, route_details_end = (
+        combination.get_route_details_for_coordinates_lngLat(
+            coordinates, routeDetailsMap
+        )
+    )
+
     return {
         "rtdh_timestamp": time.time(),
         "rtdh_message_id": str(uuid.uuid4()),
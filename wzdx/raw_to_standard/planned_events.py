@@ -1,11 +1,13 @@
 import argparse
 import copy
 import datetime
+import functools
 import json
 import logging
 import re
+import itertools
 import time
-from typing import Literal
+from typing import Callable, Iterator, Literal, TextIO
 import uuid
 from collections import OrderedDict
 
@@ -24,8 +26,15 @@ from wzdx.models.type_of_work import TypeOfWork
 
 from ..tools import (
     cdot_geospatial_api,
+    combination,
     date_tools,
+    fingerprint_store,
+    geometry_simplification,
     geospatial_tools,
+    gis_rate_limit,
+    json_stream,
+    local_lrs,
+    parallel,
     polygon_tools,
     wzdx_translator,
 )
@@ -53,23 +62,45 @@ WORK_ZONE_INCIDENT_TYPES = {
     "Emergency Roadwork": {"Traffic": True},
 }
 INCIDENT_ID_REGEX = "^OpenTMS-Incident"
+DEFAULT_STREAM_BATCH_SIZE = 500  # raw messages per route details prefetch
 
 
 def main():
-    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = (
-        cdot_geospatial_api.GeospatialApi()
-    )
-    source_file, output_dir = parse_rtdh_arguments()
-    input_file_contents = open(source_file, "r").read()
-    generated_messages = generate_standard_messages_from_string(
-        cdotGeospatialApi, input_file_contents
+    source_file, output_dir, workers, fingerprint_store_path, gis_snapshot_path = (
+        parse_rtdh_arguments()
     )
+    # Picklable, so each worker process creates its own api from the same snapshot
+    api_factory = functools.partial(create_geospatial_api, gis_snapshot_path)
+
+    with open(source_file, "r") as input_file:
+        if fingerprint_store_path:
+            # Only translate events which changed since the previous run
+            store = fingerprint_store.FingerprintStore(fingerprint_store_path)
+            raw_messages = list(generate_raw_messages_from_stream(input_file))
+            generated_messages = generate_standard_messages_incremental(
+                raw_messages,
+                store,
+                api_factory() if workers <= 1 else None,
+                workers,
+                api_factory,
+            )
+            store.save()
+        elif workers > 1:
+            raw_messages = list(generate_raw_messages_from_stream(input_file))
+            generated_messages = generate_standard_messages_parallel(
+                raw_messages, workers, api_factory
+            )
+        else:
+            # Stream events from the input file, and write each message as soon as it is generated
+            generated_messages = generate_standard_messages_from_stream(
+                api_factory(), input_file
+            )
 
-    generated_files_list = []
-    for message in generated_messages:
-        output_path = f"{output_dir}/standard_planned_event_{message['event']['source']['id']}.json"
-        open(output_path, "w+").write(json.dumps(message, indent=2))
-        generated_files_list.append(output_path)
+        generated_files_list = []
+        for message in generated_messages:
+            output_path = f"{output_dir}/standard_planned_event_{message['event']['source']['id']}.json"
+            open(output_path, "w+").write(json.dumps(message, indent=2))
+            generated_files_list.append(output_path)
 
     if generated_files_list:
         print(f"Successfully generated standard message files: {generated_files_list}")
@@ -78,12 +109,15 @@ def main():
 
 
 # parse script command line arguments
-def parse_rtdh_arguments() -> tuple[str, str]:
+def parse_rtdh_arguments() -> tuple[str, str, int, str | None, str | None]:
     """Parse command line arguments for Planned Events to RTDH Standard translation
 
     Returns:
         str: planned event file path
         str: output directory path
+        int: number of worker processes
+        str | None: fingerprint store file path, for incremental translation
+        str | None: GIS route snapshot file path, for offline route lookups
     """
     parser = argparse.ArgumentParser(
         description="Translate Planned Event data to RTDH Standard"
@@ -95,9 +129,51 @@ def parse_rtdh_arguments() -> tuple[str, str]:
     parser.add_argument(
         "--outputDir", required=False, default="./", help="output directory"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        required=False,
+        default=1,
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--fingerprintStore",
+        required=False,
+        default=None,
+        help="fingerprint store file path, only events changed since the previous run are translated",
+    )
+    parser.add_argument(
+        "--gisSnapshot",
+        required=False,
+        default=None,
+        help="GIS route snapshot file path (see gis_warmup), route lookups are answered locally instead of by the GIS server",
+    )
 
     args = parser.parse_args()
-    return args.plannedEventsFile, args.outputDir
+    return (
+        args.plannedEventsFile,
+        args.outputDir,
+        args.workers,
+        args.fingerprintStore,
+        args.gisSnapshot,
+    )
+
+
+def create_geospatial_api(
+    gisSnapshot: str = None,
+) -> cdot_geospatial_api.GeospatialApi:
+    """Create the GeospatialApi used to translate planned events. Also used to create the api of each worker process, see
+    `generate_standard_messages_parallel`
+
+    Args:
+        gisSnapshot (str, optional): GIS route snapshot file path, see `gis_warmup`. Defaults to None, route lookups are sent to the GIS server.
+
+    Returns:
+        cdot_geospatial_api.GeospatialApi: GeospatialApi object, a `local_lrs.LocalGeospatialApi` when gisSnapshot is set
+    """
+    if gisSnapshot:
+        return local_lrs.LocalGeospatialApi.from_snapshot_file(gisSnapshot)
+    return cdot_geospatial_api.GeospatialApi()
 
 
 def generate_standard_messages_from_string(
@@ -113,16 +189,268 @@ def generate_standard_messages_from_string(
         list[dict]: list of generated RTDH standard messages
     """
     raw_messages = generate_raw_messages(input_file_contents)
+    route_details_map = get_route_details_map(cdotGeospatialApi, raw_messages)
     standard_messages = []
     for message in raw_messages:
         standard_message = generate_rtdh_standard_message_from_raw_single(
-            cdotGeospatialApi, message
+            cdotGeospatialApi, message, route_details_map
         )
         if standard_message:
             standard_messages.append(standard_message)
     return standard_messages
 
 
+def generate_standard_messages_from_stream(
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi,
+    stream: TextIO,
+    batchSize: int | None = DEFAULT_STREAM_BATCH_SIZE,
+) -> Iterator[dict]:
+    """Generate standard messages from a stream of planned events, one by one. Events are parsed incrementally (see
+    `generate_raw_messages_from_stream`), and GIS route details are prefetched for one batch of events at a time, so
+    memory use is bounded by the batch size rather than the size of the feed.
+
+    Args:
+        cdotGeospatialApi (cdot_geospatial_api.GeospatialApi): customized GeospatialApi object, used for route details
+        stream (TextIO): planned events text stream, e.g. an open file
+        batchSize (int | None, optional): number of raw messages to prefetch route details for at once. None reads the whole feed into one batch. Defaults to DEFAULT_STREAM_BATCH_SIZE.
+
+    Yields:
+        dict: RTDH standard messages, in feed order
+    """
+    raw_messages = generate_raw_messages_from_stream(stream)
+    while True:
+        batch = list(itertools.islice(raw_messages, batchSize))
+        if not batch:
+            return
+        route_details_map = get_route_details_map(cdotGeospatialApi, batch)
+        for message in batch:
+            standard_message = generate_rtdh_standard_message_from_raw_single(
+                cdotGeospatialApi, message, route_details_map
+            )
+            if standard_message:
+                yield standard_message
+
+
+def generate_standard_messages_parallel(
+    raw_messages: list[dict],
+    workers: int,
+    apiFactory: Callable[[], cdot_geospatial_api.GeospatialApi] = create_geospatial_api,
+) -> list[dict]:
+    """Generate standard messages from raw messages in a pool of worker processes, each with its own GeospatialApi. Messages are
+    returned in input order, and events which fail are logged and skipped, see `generate_standard_messages_from_raw`
+
+    Args:
+        raw_messages (list[dict]): raw planned event message objects, see `generate_raw_messages`
+        workers (int): number of worker processes
+        apiFactory (() => GeospatialApi, optional): picklable (module level or functools.partial) function creating the api of each worker. Defaults to `create_geospatial_api`.
+
+    Returns:
+        list[dict]: list of generated RTDH standard messages
+    """
+    if workers <= 1:
+        return generate_standard_messages_from_raw(raw_messages, apiFactory())
+    return parallel.map_shards(
+        generate_standard_messages_from_raw,
+        raw_messages,
+        workers,
+        initializer=parallel.init_worker_api,
+        initargs=(apiFactory,),
+    )
+
+
+def generate_standard_messages_from_raw(
+    raw_messages: list[dict],
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
+) -> list[dict]:
+    """Generate standard messages from raw messages, logging and skipping events which fail to translate
+
+    Args:
+        raw_messages (list[dict]): raw planned event message objects, see `generate_raw_messages`
+        cdotGeospatialApi (cdot_geospatial_api.GeospatialApi, optional): customized GeospatialApi object, used for route details. Defaults to None, the process-wide default api.
+
+    Returns:
+        list[dict]: list of generated RTDH standard messages
+    """
+    if cdotGeospatialApi is None:
+        cdotGeospatialApi = cdot_geospatial_api.get_default_api()
+    route_details_map = get_route_details_map(cdotGeospatialApi, raw_messages)
+    standard_messages = []
+    for message in raw_messages:
+        try:
+            standard_message = generate_rtdh_standard_message_from_raw_single(
+                cdotGeospatialApi, message, route_details_map
+            )
+        except Exception as e:
+            logging.error(
+                f"Failed to translate planned event {message.get('properties', {}).get('id')}: {e}",
+                exc_info=True,
+            )
+            continue
+        if standard_message:
+            standard_messages.append(standard_message)
+    return standard_messages
+
+
+def generate_standard_messages_incremental(
+    raw_messages: list[dict],
+    fingerprintStore: fingerprint_store.FingerprintStore,
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi = None,
+    workers: int = 1,
+    apiFactory: Callable[[], cdot_geospatial_api.GeospatialApi] = create_geospatial_api,
+) -> list[dict]:
+    """Generate standard messages from raw messages, reusing the messages of events which are unchanged since the previous
+    run. Unchanged events (same fingerprint, see `get_event_fingerprint`) only have their time dependent fields refreshed,
+    see `refresh_standard_message`. New and changed events are translated, with their GIS lookups, and stored for the next
+    run. Events which are no longer in the feed are removed from the store. The store is not saved.
+
+    Args:
+        raw_messages (list[dict]): raw planned event message objects, see `generate_raw_messages`
+        fingerprintStore (fingerprint_store.FingerprintStore): store of previously generated messages
+        cdotGeospatialApi (cdot_geospatial_api.GeospatialApi, optional): customized GeospatialApi object, used for route details. Defaults to None, the process-wide default api.
+        workers (int, optional): number of worker processes translating changed events, see `generate_standard_messages_parallel`. Defaults to 1.
+        apiFactory (() => GeospatialApi, optional): picklable function creating the api of each worker process. Defaults to `create_geospatial_api`.
+
+    Returns:
+        list[dict]: list of generated RTDH standard messages, in input order
+    """
+    standard_messages = [None] * len(raw_messages)
+    changed = []
+    for index, message in enumerate(raw_messages):
+        key = get_event_key(message)
+        fingerprint = get_event_fingerprint(message)
+        value = fingerprintStore.get(key, fingerprint)
+        standard_message = refresh_standard_message(message, value) if value else None
+        if standard_message:
+            standard_messages[index] = standard_message
+        else:
+            changed.append((index, key, fingerprint))
+
+    if changed:
+        changed_messages = [raw_messages[index] for index, _, _ in changed]
+        if workers > 1:
+            translated = generate_standard_messages_parallel(
+                changed_messages, workers, apiFactory
+            )
+        else:
+            translated = generate_standard_messages_from_raw(
+                changed_messages, cdotGeospatialApi
+            )
+
+        # Events which fail or are filtered out have no message, match the generated messages by event key
+        translated_by_key = {}
+        for standard_message in translated:
+            translated_by_key.setdefault(
+                standard_message["event"]["source"]["id"], []
+            ).append(standard_message)
+        for index, key, fingerprint in changed:
+            matches = translated_by_key.get(key)
+            if not matches:
+                fingerprintStore.discard(key)
+                continue
+            standard_message = matches.pop(0)
+            standard_messages[index] = standard_message
+            # Events without GIS route details are not stored, so the lookups are retried on the next run
+            if standard_message["event"]["additional_info"].get("route_details_start"):
+                fingerprintStore.set(
+                    key,
+                    fingerprint,
+                    {
+                        "message": copy.deepcopy(standard_message),
+                        "event_status": get_event_status(raw_messages[index]),
+                    },
+                )
+            else:
+                fingerprintStore.discard(key)
+
+    removed = fingerprintStore.retain(
+        get_event_key(message) for message in raw_messages
+    )
+    logging.info(
+        f"Reused {len(raw_messages) - len(changed)} unchanged events, translated {len(changed)}, removed {removed}"
+    )
+    return [message for message in standard_messages if message]
+
+
+def get_event_key(message: dict) -> str:
+    """Get the key of a raw planned event in the fingerprint store, the event ID and direction. Matches the source ID of its
+    RTDH standard message
+
+    Args:
+        message (dict): raw planned event message object, see `expand_event_directions`
+
+    Returns:
+        str: event key
+    """
+    properties = message.get("properties", {})
+    return properties.get("id", "") + "_" + properties.get("direction", "unknown")
+
+
+def get_event_fingerprint(message: dict) -> str:
+    """Get the fingerprint of a raw planned event, covering all raw fields (including lastUpdated) and the translator version
+
+    Args:
+        message (dict): raw planned event message object
+
+    Returns:
+        str: event fingerprint
+    """
+    return fingerprint_store.get_fingerprint(
+        {"version": PROGRAM_VERSION, "message": message}
+    )
+
+
+def get_event_status(message: dict) -> str | None:
+    """Get the current status of a raw planned event, see `date_tools.get_event_status`
+
+    Args:
+        message (dict): raw planned event message object
+
+    Returns:
+        str | None: event status, None if the event has no start date
+    """
+    is_incident_msg, _ = is_incident_wz(message)
+    start_date, end_date = get_event_dates(PathDict(message), is_incident_msg)
+    if not start_date:
+        return None
+    return date_tools.get_event_status(start_date, end_date)
+
+
+def refresh_standard_message(message: dict, value: dict) -> dict | None:
+    """Refresh a stored RTDH standard message of an unchanged raw planned event, re-evaluating its time dependent fields:
+    message timestamp and ID, event start and end timestamps and condition_1
+
+    Args:
+        message (dict): raw planned event message object
+        value (dict): stored value, with the standard message and the event status it was generated with
+
+    Returns:
+        dict | None: refreshed RTDH standard message, None if the event must be translated again
+    """
+    pd = PathDict(message)
+    is_incident_msg, _ = is_incident_wz(message)
+    start_date, end_date = get_event_dates(pd, is_incident_msg)
+    if not start_date:
+        return None
+    event_status = date_tools.get_event_status(start_date, end_date)
+
+    # Completed events use their raw geometry, see `get_improved_geometry`
+    if (event_status == "completed") != (value["event_status"] == "completed"):
+        return None
+
+    standard_message = copy.deepcopy(value["message"])
+    standard_message["rtdh_timestamp"] = time.time()
+    standard_message["rtdh_message_id"] = str(uuid.uuid4())
+    header = standard_message["event"]["header"]
+    header["start_timestamp"] = date_tools.date_to_unix(start_date)
+    header["end_timestamp"] = date_tools.date_to_unix(end_date)
+    standard_message["event"]["additional_info"]["condition_1"] = event_status in [
+        "active",
+        "pending",
+        "planned",
+    ]
+    return standard_message
+
+
 # TODO: Integrate Category
 def is_incident_wz(msg: dict) -> tuple[bool, bool]:
     """Determine if a message is an incident or work zone
@@ -156,6 +484,20 @@ def generate_raw_messages(message_string: str) -> list[dict]:
     return expand_event_directions(msg)
 
 
+def generate_raw_messages_from_stream(stream: TextIO) -> Iterator[dict]:
+    """Generate raw messages from a stream of planned events using `expand_event_directions`, parsing one event at a time.
+    Supports a JSON array of events, newline delimited JSON (one event per line), or a single event.
+
+    Args:
+        stream (TextIO): planned events text stream, e.g. an open file
+
+    Yields:
+        dict: raw planned events message objects, 1 for each lane impact direction
+    """
+    for event in json_stream.iter_json_values(stream):
+        yield from expand_event_directions(event)
+
+
 # Break event into
 def expand_event_directions(message: dict) -> list[dict]:
     """Expand a message into multiple messages, one for each lane impact direction
@@ -168,21 +510,24 @@ def expand_event_directions(message: dict) -> list[dict]:
     """
     try:
         messages = []
-        laneImpacts = message.get("properties", {}).get("laneImpacts")
+        properties = message.get("properties", {})
+        laneImpacts = properties.get("laneImpacts")
         for laneImpact in laneImpacts:
-            new_message = copy.deepcopy(message)
+            # Copy on write: only the properties are copied, the geometry and all other values are shared with the original message
+            new_properties = dict(properties)
             direction_string = laneImpact["direction"]
             direction = map_direction_string(direction_string)
-            for laneImpact2 in new_message["properties"]["laneImpacts"]:
+            for laneImpact2 in laneImpacts:
                 if direction_string == laneImpact2["direction"]:
-                    new_message["properties"]["laneImpacts"] = [laneImpact2]
-                    new_message["properties"]["recorded_direction"] = (
-                        map_direction_string(message["properties"]["direction"])
+                    new_properties["laneImpacts"] = [
+                        {**laneImpact2, "direction": direction}
+                    ]
+                    new_properties["recorded_direction"] = map_direction_string(
+                        properties["direction"]
                     )
-                    new_message["properties"]["laneImpacts"][0]["direction"] = direction
                     break
-            new_message["properties"]["direction"] = direction
-            messages.append(new_message)
+            new_properties["direction"] = direction
+            messages.append({**message, "properties": new_properties})
         return messages
     except Exception as e:
         logging.error(e)
@@ -190,13 +535,16 @@ def expand_event_directions(message: dict) -> list[dict]:
 
 
 def generate_rtdh_standard_message_from_raw_single(
-    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi, obj: dict
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi,
+    obj: dict,
+    routeDetailsMap: dict = None,
 ) -> dict:
     """Generate a single RTDH standard message from a raw planned event message
 
     Args:
         cdotGeospatialApi (cdot_geospatial_api.GeospatialApi): customized GeospatialApi object, used for route details
         obj (dict): raw planned event message object
+        routeDetailsMap (dict, optional): pre-fetched GIS route details, see `get_route_details_map`. Defaults to None.
 
     Returns:
         dict: RTDH standard message object
@@ -205,7 +553,9 @@ def generate_rtdh_standard_message_from_raw_single(
     if is_incident_msg and not is_wz:
         return {}
     pd = PathDict(obj)
-    standard_message = create_rtdh_standard_msg(cdotGeospatialApi, pd, is_incident_msg)
+    standard_message = create_rtdh_standard_msg(
+        cdotGeospatialApi, pd, is_incident_msg, routeDetailsMap
+    )
     return standard_message
 
 
@@ -659,6 +1009,8 @@ def get_improved_geometry(
     route_details_start: dict,
     route_details_end: dict,
     id: str,
+    compressionMethod: str = geometry_simplification.DEFAULT_METHOD,
+    maxDeviation: float = geometry_simplification.DEFAULT_MAX_DEVIATION,
 ) -> list[list[float]]:
     """Get higher definition geometry from GIS endpoint for planned event. Do not improve geometry for completed events.
 
@@ -669,6 +1021,8 @@ def get_improved_geometry(
         route_details_start (dict): GIS route details for start of event
         route_details_end (dict): GIS route details for end of event
         id (str): ID of planned event, used for logging
+        compressionMethod (str, optional): simplification method of the route geometry, see `geometry_simplification.SIMPLIFICATION_METHODS`. Defaults to J2945/1.
+        maxDeviation (float, optional): maximum deviation of the simplified route geometry (meters). Defaults to geometry_simplification.DEFAULT_MAX_DEVIATION.
 
     Returns:
         list[list[float]]: _description_
@@ -697,6 +1051,8 @@ def get_improved_geometry(
         route_details_start["Measure"],
         route_details_end["Measure"],
         compressed=True,
+        compressionMethod=compressionMethod,
+        maxDeviation=maxDeviation,
     )
 
     finalDirection = geospatial_tools.get_road_direction_from_coordinates(
@@ -773,18 +1129,20 @@ def get_mileposts_from_description(description: str) -> tuple[str, str]:
 def get_route_details_for_coordinates_lngLat(
     cdotGeospatialApi: cdot_geospatial_api.GeospatialApi,
     coordinates: list[list[float]],
+    routeDetailsMap: dict = None,
 ) -> tuple[dict, dict]:
     """Get GIS route details for start and end coordinates
 
     Args:
         cdotGeospatialApi (cdot_geospatial_api.GeospatialApi): customized GeospatialApi object, for retrieving route details
         coordinates (list[list[float]]): planned event coordinates
+        routeDetailsMap (dict, optional): pre-fetched GIS route details, see `get_route_details_map`. Defaults to None.
 
     Returns:
         tuple[dict, dict]: GIS route details for start and end coordinates
     """
     route_details_start = get_route_details(
-        cdotGeospatialApi, coordinates[0][1], coordinates[0][0]
+        cdotGeospatialApi, coordinates[0][1], coordinates[0][0], routeDetailsMap
     )
 
     if len(coordinates) == 1 or (
@@ -793,7 +1151,7 @@ def get_route_details_for_coordinates_lngLat(
         route_details_end = None
     else:
         route_details_end = get_route_details(
-            cdotGeospatialApi, coordinates[-1][1], coordinates[-1][0]
+            cdotGeospatialApi, coordinates[-1][1], coordinates[-1][0], routeDetailsMap
         )
 
     # Update route IDs based on directionality
@@ -826,7 +1184,10 @@ def get_route_details_for_coordinates_lngLat(
 
 
 def get_route_details(
-    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi, lat: float, lng: float
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi,
+    lat: float,
+    lng: float,
+    routeDetailsMap: dict = None,
 ) -> dict:
     """Get GIS route details for a given latitude and longitude
 
@@ -834,16 +1195,50 @@ def get_route_details(
         cdotGeospatialApi (cdot_geospatial_api.GeospatialApi): customized GeospatialApi object, for retrieving route details
         lat (float): latitude
         lng (float): longitude
+        routeDetailsMap (dict, optional): pre-fetched GIS route details, see `get_route_details_map`. Defaults to None.
 
     Returns:
         dict: GIS route details
     """
+    if routeDetailsMap is not None and (lat, lng) in routeDetailsMap:
+        # Copy, since route details are modified based on directionality
+        route_details = routeDetailsMap[(lat, lng)]
+        return dict(route_details) if route_details else route_details
     return cdotGeospatialApi.get_route_and_measure((lat, lng))
 
 
+def get_route_details_map(
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi, raw_messages: list[dict]
+) -> dict[tuple[float, float], dict]:
+    """Get GIS route details for the start and end points of all raw planned events in concurrent batches, live events first,
+    see `combination.get_route_details_map`
+
+    Args:
+        cdotGeospatialApi (cdot_geospatial_api.GeospatialApi): customized GeospatialApi object, for retrieving route details
+        raw_messages (list[dict]): raw planned event message objects
+
+    Returns:
+        dict[tuple[float, float], dict]: GIS route details, keyed by (lat, long)
+    """
+    coordinates_list = []
+    priorities = []
+    for message in raw_messages:
+        is_incident_msg, is_wz = is_incident_wz(message)
+        if is_incident_msg and not is_wz:
+            continue
+        coordinates_list.append(get_linestring(message.get("geometry") or {}))
+        priorities.append(gis_rate_limit.get_event_priority(get_event_status(message)))
+    return combination.get_route_details_map(
+        coordinates_list, cdotGeospatialApi, priorities
+    )
+
+
 # isIncident is unused, could be useful later though
 def create_rtdh_standard_msg(
-    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi, pd: PathDict, isIncident: bool
+    cdotGeospatialApi: cdot_geospatial_api.GeospatialApi,
+    pd: PathDict,
+    isIncident: bool,
+    routeDetailsMap: dict = None,
 ) -> dict:
     """Create a RTDH standard message from a planned event PathDict
 
@@ -851,6 +1246,7 @@ def create_rtdh_standard_msg(
         cdotGeospatialApi (cdot_geospatial_api.GeospatialApi): customized GeospatialApi object, for retrieving route details and improved geometry
         pd (PathDict): planned event PathDict
         isIncident (bool): whether the event is an incident (modifies start_date parsing)
+        routeDetailsMap (dict, optional): pre-fetched GIS route details, see `get_route_details_map`. Defaults to None.
 
     Returns:
         dict: RTDH standard message
@@ -905,7 +1301,8 @@ def create_rtdh_standard_msg(
         direction == REVERSED_DIRECTION_MAP.get(geometry_direction)
         and direction != "unknown"
     ):
-        coordinates.reverse()
+        # Not reversed in place, the coordinates are shared between directions, see `expand_event_directions`
+        coordinates = coordinates[::-1]
         beginning_milepost = pd.get("properties/endMarker")
         ending_milepost = pd.get("properties/startMarker")
 
@@ -913,35 +1310,12 @@ def create_rtdh_standard_msg(
         pd.get("properties/routeName")
     )
 
-    now = datetime.datetime.now(datetime.timezone.utc)
-    start_date = pd.get(
-        "properties/startTime", date_tools.parse_datetime_from_iso_string
-    )
-    end_date = pd.get("properties/clearTime", date_tools.parse_datetime_from_iso_string)
-
-    if not start_date and isIncident:
-        start_date = now
-
+    start_date, end_date = get_event_dates(pd, isIncident)
     if not start_date:
         logging.warning(
             f'Unable to process event, no start date for event: {pd.get("properties/id", default="")}'
         )
         return {}
-    if not end_date:
-        end_date = pd.get(
-            "properties/estimatedClearTime",
-            date_tools.parse_datetime_from_iso_string,
-        )
-
-    if not end_date:
-        # Since there is no end date, assume still active, set end date in future (12 hours + n days until after current time)
-        end_date = start_date + datetime.timedelta(hours=12)
-
-        delta_days = (now - end_date).days
-        if delta_days > 0:
-            end_date = end_date + datetime.timedelta(days=delta_days)
-
-        end_date = end_date.replace(second=0, microsecond=0)
 
     types_of_work, work_zone_type = map_event_type(
         pd.get("properties/type", default="")
@@ -961,9 +1335,23 @@ def create_rtdh_standard_msg(
 
     condition_1 = event_status in ["active", "pending", "planned"]
 
-    route_details_start, route_details_end = get_route_details_for_coordinates_lngLat(
-        cdotGeospatialApi, coordinates
-    )
+    # Serve GIS lookups for live events before planned events, when rate limited
+    with gis_rate_limit.request_priority(
+        gis_rate_limit.get_event_priority(event_status)
+    ):
+        route_details_start, route_details_end = (
+            get_route_details_for_coordinates_lngLat(
+                cdotGeospatialApi, coordinates, routeDetailsMap
+            )
+        )
+        geometry = get_improved_geometry(
+            cdotGeospatialApi,
+            coordinates,
+            event_status,
+            route_details_start,
+            route_details_end,
+            pd.get("properties/id", default="") + "_" + direction,
+        )
 
     # Milepost Priority:
     # 1. Route Details (only if start and end are on the same route)
@@ -1002,14 +1390,7 @@ def create_rtdh_standard_msg(
                     default=0,
                 ),
             },
-            "geometry": get_improved_geometry(
-                cdotGeospatialApi,
-                coordinates,
-                event_status,
-                route_details_start,
-                route_details_end,
-                pd.get("properties/id", default="") + "_" + direction,
-            ),
+            "geometry": geometry,
             "header": {
                 "description": description,
                 "start_timestamp": date_tools.date_to_unix(start_date),
@@ -1044,6 +1425,49 @@ def create_rtdh_standard_msg(
     #     return {}
 
 
+def get_event_dates(
+    pd: PathDict, isIncident: bool
+) -> tuple[datetime.datetime | None, datetime.datetime | None]:
+    """Get the start and end date of a planned event. Incidents without a start time start now, and events without a clear
+    time are assumed to still be active, ending 12 hours (plus n days) after their start, after the current time
+
+    Args:
+        pd (PathDict): raw planned event message object
+        isIncident (bool): whether the message is an incident
+
+    Returns:
+        tuple[datetime.datetime | None, datetime.datetime | None]: start and end date, both None if the event has no start date
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    start_date = pd.get(
+        "properties/startTime", date_tools.parse_datetime_from_iso_string
+    )
+    end_date = pd.get("properties/clearTime", date_tools.parse_datetime_from_iso_string)
+
+    if not start_date and isIncident:
+        start_date = now
+
+    if not start_date:
+        return None, None
+    if not end_date:
+        end_date = pd.get(
+            "properties/estimatedClearTime",
+            date_tools.parse_datetime_from_iso_string,
+        )
+
+    if not end_date:
+        # Since there is no end date, assume still active, set end date in future (12 hours + n days until after current time)
+        end_date = start_date + datetime.timedelta(hours=12)
+
+        delta_days = (now - end_date).days
+        if delta_days > 0:
+            end_date = end_date + datetime.timedelta(days=delta_days)
+
+        end_date = end_date.replace(second=0, microsecond=0)
+
+    return start_date, end_date
+
+
 def validate_closure(obj: dict | OrderedDict) -> bool:
     """Validate the planned event object
 
@@ -0,0 +1,477 @@
+import asyncio
+import concurrent.futures
+import inspect
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from ..tools import geometry_simplification
+from .cdot_geospatial_api import ACQUIRE, SLEEP, GeospatialApi
+from .gis_cache import RouteProfileCache, get_endpoint
+from .gis_rate_limit import get_request_priority
+from .linear_referencing import MeasuredLine
+
+DEFAULT_MAX_CONCURRENCY = 100  # GIS requests in flight at once
+
+
+class AsyncGeospatialApi:
+    """asyncio client for the GIS server, with the same lookups as `GeospatialApi`. URL building, response parsing, caches,
+    metrics, retry policy and circuit breaker are shared with a wrapped `GeospatialApi`, and requests are limited to
+    maxConcurrency in flight at once.
+
+        async with AsyncGeospatialApi() as api:
+            route_details = await asyncio.gather(*[api.get_route_and_measure(p) for p in points])
+
+    Without an async transport (fetch), requests run on the pooled, keep-alive session of the wrapped api, in a thread pool
+    of maxConcurrency workers.
+    """
+
+    def __init__(
+        self,
+        api: GeospatialApi = None,
+        maxConcurrency: int = DEFAULT_MAX_CONCURRENCY,
+        getCachedRequest: Callable[[str], str | Awaitable[str]] = None,
+        setCachedRequest: Callable[[str, str], None | Awaitable[None]] = None,
+        fetch: Callable[[str, float], Awaitable[str]] = None,
+    ):
+        """Initialize the async Geospatial API
+
+        Args:
+            api (GeospatialApi, optional): Api to share configuration, caches and metrics with. Defaults to a new GeospatialApi, with a connection pool of maxConcurrency.
+            maxConcurrency (int, optional): Maximum number of GIS requests in flight. Defaults to DEFAULT_MAX_CONCURRENCY.
+            getCachedRequest ((url: str) => cached_response: str | Awaitable[str], optional): Optional sync or async cache lookup. Defaults to the getCachedRequest hook of api.
+            setCachedRequest ((url: str, response: str) => None | Awaitable[None], optional): Optional sync or async cache write. Defaults to the setCachedRequest hook of api.
+            fetch ((url: str, timeout: float) => Awaitable[str], optional): Optional async transport, returning the decoded response body. Defaults to None, requests are made with the session of api.
+        """
+        self.api = (
+            api
+            if api is not None
+            else GeospatialApi(
+                poolConnections=maxConcurrency, poolMaxSize=maxConcurrency
+            )
+        )
+        self.maxConcurrency = maxConcurrency
+        self.getCachedRequest = (
+            getCachedRequest
+            if getCachedRequest is not None
+            else self.api.getCachedRequest
+        )
+        self.setCachedRequest = (
+            setCachedRequest
+            if setCachedRequest is not None
+            else self.api.setCachedRequest
+        )
+        self.fetch = fetch
+        self._semaphore = asyncio.Semaphore(maxConcurrency)
+        self._executor = None
+        self._inFlight: dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "AsyncGeospatialApi":
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Shut down the request thread pool, and close the wrapped api"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.api.close()
+
+    async def get_route_details(self, routeId: str) -> dict | None:
+        """Get route details from route ID, see `GeospatialApi.get_route_details`"""
+        url = self.api._get_route_details_url(routeId)
+        found, route_details = self.api._get_parsed(url)
+        if found:
+            return route_details
+
+        resp = await self._make_cached_web_request(url)
+        if not resp:
+            return None
+        route_details = self.api._parse_route_details(resp)
+        self.api._set_parsed(url, route_details)
+        return route_details
+
+    async def get_route_and_measure(
+        self, latLng: tuple[float, float], heading: float = None, tolerance: int = 10000
+    ) -> dict | None:
+        """Get route ID and mile marker from lat/long and optional heading, see `GeospatialApi.get_route_and_measure`"""
+        memo = self.api.routeMeasureMemo
+        if memo is not None:
+            found, route_details = memo.get(latLng, heading, tolerance)
+            if found:
+                return route_details
+
+        url = self.api._get_route_and_measure_url(latLng, tolerance)
+        found, route_details = self.api._get_parsed(url)
+        if not found:
+            resp = await self._make_cached_web_request(url)
+            if not resp:
+                return None
+            route_details = self.api._parse_route_and_measure(resp)
+            self.api._set_parsed(url, route_details)
+
+        if route_details and heading:
+            route_details = await self._add_direction_from_heading(
+                route_details, heading
+            )
+        if memo is not None:
+            memo.set(latLng, heading, tolerance, route_details)
+        return route_details
+
+    async def _add_direction_from_heading(
+        self, route_details: dict, heading: float
+    ) -> dict:
+        """Add the route direction (+/-) to route details, see `GeospatialApi._add_direction_from_heading`"""
+        measures = self.api._get_direction_measures(route_details)
+        if not measures:
+            return route_details
+        startMeasure, endMeasure = measures
+        route = route_details["Route"]
+
+        profile = await self.get_route_profile(
+            route, route_details["MMin"], route_details["MMax"]
+        )
+        if profile:
+            coords = self.api._slice_route_profile(
+                profile, route, startMeasure, endMeasure
+            )
+        else:
+            coords = await self.get_route_between_measures(
+                route, startMeasure, endMeasure, adjustRoute=False
+            )
+        return self.api._set_direction(route_details, coords, heading)
+
+    async def get_route_profile(
+        self, routeId: str, mMin: float = None, mMax: float = None
+    ) -> MeasuredLine | None:
+        """Get the full geometry of a route with measures, from the routeProfiles cache of the wrapped api, see `GeospatialApi.get_route_profile`"""
+        if self.api.routeProfiles is None:
+            return None
+
+        async def load():
+            routeMMin, routeMMax = mMin, mMax
+            if routeMMin is None or routeMMax is None:
+                route_details = await self.get_route_details(routeId)
+                if not route_details:
+                    return None
+                routeMMin, routeMMax = route_details["MMin"], route_details["MMax"]
+            _, fromMeasure, toMeasure = self.api.normalize_route_measures(
+                routeId, routeMMin, routeMMax, adjustRoute=False
+            )
+            profile = await self.get_measured_route(routeId, fromMeasure, toMeasure)
+            if profile is None:
+                logging.warning(f"Failed to load route profile for route: {routeId}")
+            return profile
+
+        return await self._get_or_load(
+            self.api.routeProfiles, (self.api.BASE_URL, routeId), load
+        )
+
+    async def get_measured_route(
+        self, routeId: str, fromMeasure: float, toMeasure: float
+    ) -> MeasuredLine | None:
+        """Get the geometry of a section of route with its GIS measures, with measure samples requested concurrently, see `GeospatialApi.get_measured_route`"""
+        linestring = await self._request_route_between_measures(
+            routeId, fromMeasure, toMeasure, returnM=True
+        )
+        samples = None
+        if linestring and not self.api._has_measures(linestring):
+            samples = []
+            requested = set()
+            measures = self.api._get_sample_measures(fromMeasure, toMeasure)
+            while measures:
+                requested.update(measures)
+                latLngs = await asyncio.gather(
+                    *[self.get_point_at_measure(routeId, m) for m in measures]
+                )
+                samples.extend(
+                    (measure, latLng[1], latLng[0])
+                    for measure, latLng in zip(measures, latLngs)
+                    if latLng
+                )
+                measures = self.api._get_refine_measures(linestring, samples, requested)
+        line = self.api._build_measured_line(linestring, samples)
+        if line is None:
+            logging.warning(
+                f"Failed to load measured route: {routeId}, fromMeasure: {fromMeasure}, toMeasure: {toMeasure}"
+            )
+        return line
+
+    async def get_route_and_measure_many(
+        self,
+        points: list[tuple[float, float] | tuple[float, float, float]],
+        tolerance: int = 10000,
+    ) -> list[dict | None]:
+        """Get route ID and mile marker for many lat/long points concurrently, see `GeospatialApi.get_route_and_measure_many`"""
+
+        async def lookup(point):
+            heading = point[2] if len(point) > 2 else None
+            try:
+                return await self.get_route_and_measure(
+                    (point[0], point[1]), heading, tolerance
+                )
+            except Exception as e:
+                logging.warning(
+                    f"get_route_and_measure_many failed for point: {point}. Error: {e}"
+                )
+                return None
+
+        keys = self.api._get_lookup_keys(points, tolerance)
+        lookup_points = {}
+        for point, key in keys.items():
+            lookup_points.setdefault(key, point)
+        results = dict(
+            zip(
+                lookup_points.keys(),
+                await asyncio.gather(
+                    *[lookup(point) for point in lookup_points.values()]
+                ),
+            )
+        )
+        return self.api._get_lookup_results(points, keys, results)
+
+    async def get_point_at_measure(
+        self, routeId: str, measure: float
+    ) -> tuple[float, float] | None:
+        """Get lat/long points at a mile marker on route, see `GeospatialApi.get_point_at_measure`"""
+        url = self.api._get_point_at_measure_url(routeId, measure)
+        found, latLng = self.api._get_parsed(url)
+        if found:
+            return latLng
+
+        response = await self._make_cached_web_request(url)
+        if not response:
+            return None
+        latLng = self.api._parse_point_at_measure(response)
+        self.api._set_parsed(url, latLng)
+        return latLng
+
+    async def get_route_geometry_ahead(
+        self,
+        routeId: str,
+        startMeasure: float,
+        heading: float,
+        distanceAhead: float,
+        compressed: bool = False,
+        routeDetails: dict = None,
+        mMin: float = None,
+        mMax: float = None,
+    ) -> dict | None:
+        """Get route geometry ahead of a mile marker given a distance ahead and heading, see `GeospatialApi.get_route_geometry_ahead`"""
+        if not routeDetails:
+            routeDetails = self.api._get_profile_route_details(
+                await self.get_route_profile(routeId), routeId, startMeasure
+            )
+            if routeDetails:
+                routeDetails = await self._add_direction_from_heading(
+                    routeDetails, heading
+                )
+        if not routeDetails:
+            latLng = await self.get_point_at_measure(routeId, startMeasure)
+            if latLng:
+                routeDetails = await self.get_route_and_measure(latLng, heading)
+            if not latLng or not routeDetails:
+                logging.warning(
+                    f"get_route_geometry_ahead failed to get route details for routeId: {routeId}, startMeasure: {startMeasure}, heading: {heading}"
+                )
+                return None
+
+        startMeasure, endMeasure = self.api._get_measures_ahead(
+            routeDetails, startMeasure, distanceAhead, mMin, mMax
+        )
+        return {
+            "start_measure": startMeasure,
+            "end_measure": endMeasure,
+            "coordinates": await self.get_route_between_measures(
+                routeId, startMeasure, endMeasure, compressed=compressed
+            ),
+        }
+
+    async def get_route_between_measures(
+        self,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        dualCarriageway: bool = True,
+        compressed: bool = False,
+        adjustRoute: bool = True,
+        compressionMethod: str = geometry_simplification.DEFAULT_METHOD,
+        maxDeviation: float = geometry_simplification.DEFAULT_MAX_DEVIATION,
+    ) -> list[list[float]] | None:
+        """Get lat/long points between two mile markers on route, see `GeospatialApi.get_route_between_measures`"""
+        routeId, startMeasure, endMeasure = self.api.normalize_route_measures(
+            routeId, startMeasure, endMeasure, dualCarriageway, adjustRoute
+        )
+        linestring = None
+        if self.api.routeSlices is not None:
+            linestring = await self._get_route_slice(routeId, startMeasure, endMeasure)
+        if linestring is None:
+            linestring = await self._request_route_between_measures(
+                routeId, startMeasure, endMeasure
+            )
+            if linestring is None:
+                return None
+
+        if compressed:
+            linestring = geometry_simplification.simplify_path(
+                linestring, compressionMethod, maxDeviation
+            )
+        return linestring
+
+    async def _request_route_between_measures(
+        self,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        returnM: bool = False,
+    ) -> list[list[float]] | None:
+        """Request the route geometry between two (normalized) measures from the GIS server, see `GeospatialApi._request_route_between_measures`"""
+        url = self.api._get_route_between_measures_url(
+            routeId, startMeasure, endMeasure, returnM
+        )
+        found, linestring = self.api._get_parsed(url)
+        if found:
+            return linestring
+
+        response = await self._make_cached_web_request(url)
+        if not response:
+            return None
+        linestring = self.api._parse_route_between_measures(response, returnM)
+        self.api._set_parsed(url, linestring)
+        return linestring
+
+    async def _get_route_slice(
+        self, routeId: str, startMeasure: float, endMeasure: float
+    ) -> list[list[float]] | None:
+        """Cut the route geometry between two (normalized) measures out of the cached route windows of the wrapped api, see `GeospatialApi._get_route_slice`"""
+        routeSlices = self.api.routeSlices
+        baseUrl = self.api.BASE_URL
+        route_details = routeSlices.get_route_details(baseUrl, routeId)
+        if route_details is None:
+            route_details = await self.get_route_details(routeId)
+            if route_details:
+                routeSlices.set_route_details(baseUrl, routeId, route_details)
+        windows = self.api._get_route_slice_windows(
+            routeId, startMeasure, endMeasure, route_details
+        )
+        if windows is None:
+            return None
+
+        lines = []
+        for window, fromMeasure, toMeasure in windows:
+
+            async def load(fromMeasure=fromMeasure, toMeasure=toMeasure):
+                return await self.get_measured_route(routeId, fromMeasure, toMeasure)
+
+            line = await self._get_or_load(
+                routeSlices, (baseUrl, routeId, window), load
+            )
+            if line is None:
+                return None
+            lines.append(line)
+        return self.api._join_route_slices(
+            routeId, startMeasure, endMeasure, windows, lines
+        )
+
+    @staticmethod
+    async def _get_or_load(
+        cache: RouteProfileCache,
+        key: tuple,
+        load: Callable[[], Awaitable[MeasuredLine | None]],
+    ) -> MeasuredLine | None:
+        """Get a cached route profile or window, or load it with an async loader and cache it on a miss, see `RouteProfileCache.get_or_load`"""
+        found, profile = cache.lookup(key)
+        if not found:
+            profile = await load()
+            cache.store(key, profile)
+        return profile
+
+    async def _call_hook(self, hook: Callable, *args) -> Any:
+        """Call a sync or async cache hook"""
+        result = hook(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _make_cached_web_request(
+        self, url: str, timeout: int = 15, source: str = "async_geospatial_api"
+    ) -> Any:
+        """Make a GET request and cache the response. Identical concurrent requests are coalesced into one
+
+        Args:
+            url (str): URL to make the request to
+            timeout (int, optional): Request timeout in seconds. Defaults to 15.
+            source (str, optional): Source to include in logging. Defaults to "async_geospatial_api".
+
+        Returns:
+            Any: Response from the request
+        """
+        future = self._inFlight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._fetch_cached_web_request(url, timeout, source)
+            )
+            self._inFlight[url] = future
+            future.add_done_callback(lambda _: self._inFlight.pop(url, None))
+        # Cancelling one caller must not cancel the request shared with the others
+        return await asyncio.shield(future)
+
+    async def _fetch_cached_web_request(
+        self, url: str, timeout: int, source: str
+    ) -> Any:
+        """Make a GET request and cache the response, with the retry policy, deadline, circuit breaker and rate limit of the wrapped api, see `GeospatialApi._request_attempts`"""
+        response = await self._call_hook(self.getCachedRequest, url)
+        if response:
+            self.api.metrics.record_cache_hit(get_endpoint(url))
+            return json.loads(response)
+
+        attempts = self.api._request_attempts(url, timeout, False, source)
+        result, error = None, None
+        try:
+            while True:
+                try:
+                    if error is not None:
+                        action, value = attempts.throw(error)
+                    else:
+                        action, value = attempts.send(result)
+                except StopIteration as stop:
+                    response = stop.value
+                    break
+                result, error = None, None
+                if action == ACQUIRE:
+                    result = await self.api.rateLimiter.acquire_async(
+                        get_request_priority(), value
+                    )
+                elif action == SLEEP:
+                    await asyncio.sleep(value)
+                else:
+                    try:
+                        async with self._semaphore:
+                            startTime = time.time()
+                            response = await self._request(url, value)
+                            result = response, time.time() - startTime
+                    except Exception as e:
+                        error = e
+        finally:
+            # Releases the half-open trial of a request which is abandoned, e.g. cancelled
+            attempts.close()
+
+        if response is None:
+            return None
+        await self._call_hook(self.setCachedRequest, url, response)
+        return json.loads(response)
+
+    async def _request(self, url: str, timeout: float) -> str:
+        """Send one GET request, with the async transport if configured, otherwise on the session of the wrapped api"""
+        if self.fetch is not None:
+            return await asyncio.wait_for(self.fetch(url, timeout), timeout)
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.maxConcurrency
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.api._make_web_request, url, timeout
+        )
@@ -1,12 +1,122 @@
+import asyncio
+import concurrent.futures
 import json
 import logging
+import math
+import threading
 import time
-from typing import Any, Callable
+from typing import Any, Callable, Generator
 
 import requests
+import requests.adapters
 import os
 
-from ..tools import geospatial_tools, path_history_compression
+from ..tools import geometry_simplification, geospatial_tools
+from .gis_cache import (
+    ROUTE_PROFILES,
+    ParsedResponseCache,
+    RouteMeasureMemo,
+    RouteProfileCache,
+    RouteSliceCache,
+    get_endpoint,
+)
+from .gis_metrics import GisMetrics
+from .gis_rate_limit import (
+    TokenBucketRateLimiter,
+    get_request_priority,
+    request_priority,
+)
+from .gis_retry import CircuitBreaker, Deadline, RetryPolicy, is_client_error
+from .linear_referencing import MeasuredLine, get_refine_measures
+
+DEFAULT_POOL_CONNECTIONS = 10  # number of per-host connection pools to keep
+DEFAULT_POOL_MAXSIZE = 10  # maximum number of keep-alive connections per host
+DEFAULT_BATCH_WORKERS = DEFAULT_POOL_MAXSIZE  # concurrent lookups for batch calls
+DEFAULT_MEASURE_SAMPLE_MILES = (
+    1.0  # spacing of PointAtMeasure samples along route geometry without M values
+)
+MEASURE_DECIMALS = 3  # rounding of the GIS server (LrsServerRounded)
+
+# Steps of a GIS request, see `GeospatialApi._request_attempts`
+ACQUIRE = "acquire"
+SEND = "send"
+SLEEP = "sleep"
+# Request errors which are recorded and retried, for both the requests session and async transports
+TIMEOUT_ERRORS = (requests.exceptions.Timeout, asyncio.TimeoutError)
+REQUEST_ERRORS = (requests.exceptions.RequestException, OSError)
+
+
+def create_session(
+    poolConnections: int = DEFAULT_POOL_CONNECTIONS,
+    poolMaxSize: int = DEFAULT_POOL_MAXSIZE,
+    poolBlock: bool = False,
+) -> requests.Session:
+    """Create a pooled, keep-alive HTTP session for GIS server requests. Connections are reused across requests, so only the first request to a host pays for the TCP/TLS handshake.
+
+    Args:
+        poolConnections (int, optional): Number of per-host connection pools to cache. Defaults to DEFAULT_POOL_CONNECTIONS.
+        poolMaxSize (int, optional): Maximum number of connections kept alive per host. Defaults to DEFAULT_POOL_MAXSIZE.
+        poolBlock (bool, optional): Whether to block when all connections to a host are in use, instead of opening an extra (discarded) connection. Defaults to False.
+
+    Returns:
+        requests.Session: Session with pooled HTTP/HTTPS adapters mounted
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=poolConnections,
+        pool_maxsize=poolMaxSize,
+        pool_block=poolBlock,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls. The first caller for a key runs the call, and callers arriving while it is in flight wait for, and share, its result."""
+
+    def __init__(self):
+        self._calls: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0  # number of calls which shared an in-flight result
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn, unless a call with the same key is already in flight
+
+        Args:
+            key (str): Call key, e.g. request url
+            fn (() => Any): Call to run
+
+        Returns:
+            Any: Result of fn, shared with all coalesced callers
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+# In-flight GIS requests are shared by all GeospatialApi instances in the process
+IN_FLIGHT_REQUESTS = SingleFlight()
 
 
 class GeospatialApi:
@@ -20,6 +130,19 @@ class GeospatialApi:
             "CDOT_GEOSPATIAL_API_BASE_URL",
             "https://dtdapps.codot.gov/server/rest/services/LRS/Routes_withDEC/MapServer/exts/LrsServerRounded",
         ),
+        session: requests.Session = None,
+        poolConnections: int = DEFAULT_POOL_CONNECTIONS,
+        poolMaxSize: int = DEFAULT_POOL_MAXSIZE,
+        routeMeasureMemo: RouteMeasureMemo = None,
+        singleFlight: SingleFlight = IN_FLIGHT_REQUESTS,
+        parsedCache: ParsedResponseCache = None,
+        routeProfiles: RouteProfileCache = ROUTE_PROFILES,
+        routeSlices: RouteSliceCache = None,
+        metrics: GisMetrics = None,
+        retryPolicy: RetryPolicy = None,
+        circuitBreaker: CircuitBreaker = None,
+        rateLimiter: TokenBucketRateLimiter = None,
+        measureSampleMiles: float = DEFAULT_MEASURE_SAMPLE_MILES,
     ):
         """Initialize the Geospatial API
 
@@ -27,19 +150,53 @@ class GeospatialApi:
             getCachedRequest ((url: str) => cached_response: str, optional): Optional method to enable custom caching. This method is called with a request url to retrieve the cached result.
             setCachedRequest ((url: str, response: str) => None, optional): Optional method to enable custom caching. This method is called with a request url and response to write the cached result.
             BASE_URL (str, optional): Optional override of GIS server base url, should end with CdotLrsAccessRounded. Defaults first to the env variable CDOT_GEOSPATIAL_API_BASE_URL, then to https://dtdapps.codot.gov/server/rest/services/LRS/Routes_withDEC/MapServer/exts/CdotLrsAccessRounded.
+            session (requests.Session, optional): Optional shared HTTP session, to reuse one connection pool across GeospatialApi instances. Defaults to a new pooled session, see `create_session`, created on the first request.
+            poolConnections (int, optional): Number of per-host connection pools, only used when no session is given. Defaults to DEFAULT_POOL_CONNECTIONS.
+            poolMaxSize (int, optional): Maximum keep-alive connections per host, only used when no session is given. Defaults to DEFAULT_POOL_MAXSIZE.
+            routeMeasureMemo (RouteMeasureMemo, optional): Optional in-memory memo for `get_route_and_measure`, which can be shared between GeospatialApi instances. Defaults to None.
+            singleFlight (SingleFlight, optional): Coalescing of identical in-flight requests. Defaults to IN_FLIGHT_REQUESTS, shared by all instances.
+            parsedCache (ParsedResponseCache, optional): Optional in-memory cache of parsed results, checked before the getCachedRequest hook. Defaults to None.
+            routeProfiles (RouteProfileCache, optional): Cache of full route geometry with GIS measures, used to compute route bearings locally. Defaults to ROUTE_PROFILES, shared by all instances. With None, the route bearing is computed from the route geometry around the measure (sliced from routeSlices when configured).
+            routeSlices (RouteSliceCache, optional): Optional cache of route geometry windows, to answer `get_route_between_measures` by slicing locally. Defaults to None, every section of route is requested from the GIS server.
+            metrics (GisMetrics, optional): Request metrics, which can be shared between GeospatialApi instances. Defaults to a new GisMetrics.
+            retryPolicy (RetryPolicy, optional): Optional backoff policy to retry failed requests (timeouts, connection errors and 5xx responses) with. Defaults to None, failed requests are only retried with retryOnTimeout.
+            circuitBreaker (CircuitBreaker, optional): Optional circuit breaker, to fail fast while the GIS server is down. Can be shared between GeospatialApi instances. Defaults to None.
+            rateLimiter (TokenBucketRateLimiter, optional): Optional client-side rate limit, serving requests in priority order, see `gis_rate_limit.request_priority`. Can be shared between GeospatialApi instances. Defaults to None.
+            measureSampleMiles (float, optional): Spacing of the PointAtMeasure samples used to measure route geometry which the GIS server returns without M values, see `get_measured_route`. Defaults to DEFAULT_MEASURE_SAMPLE_MILES.
         """
         self.getCachedRequest = getCachedRequest
         self.setCachedRequest = setCachedRequest
         self.BASE_URL = BASE_URL
+        self._ownsSession = session is None
+        self._session = session
+        self._poolConnections = poolConnections
+        self._poolMaxSize = poolMaxSize
+        self.routeMeasureMemo = routeMeasureMemo
+        self.singleFlight = singleFlight
+        self.parsedCache = parsedCache
+        self.routeProfiles = routeProfiles
+        self.routeSlices = routeSlices
+        self.metrics = metrics if metrics is not None else GisMetrics()
+        self.retryPolicy = retryPolicy
+        self.circuitBreaker = circuitBreaker
+        self.rateLimiter = rateLimiter
+        self.measureSampleMiles = measureSampleMiles
+        self.deadline: Deadline = None  # overall time budget, see `start_deadline`
         self.ROUTE_BETWEEN_MEASURES_API = "RouteBetweenMeasures"
         self.GET_ROUTE_AND_MEASURE_API = "MeasureAtPoint"
         self.GET_POINT_AT_MEASURE_API = "PointAtMeasure"
         self.GET_ROUTES_API = "ROUTES"
         self.GET_ROUTE_API = "ROUTE"
         self.SR = "4326"
-        self.responseTimes: list[float] = (
-            []
-        )  # recorded response times, for debugging purposes
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session for GIS server requests. The default pooled session is only created on the first request, so apis
+        which never reach the GIS server (e.g. `local_lrs.LocalGeospatialApi`) don't hold one
+        """
+        if self._session is None:
+            self._session = create_session(self._poolConnections, self._poolMaxSize)
+        return self._session
 
     def _make_web_request(self, url: str, timeout: int) -> str:
         """Make a GET request to a URL
@@ -51,8 +208,16 @@ class GeospatialApi:
         Returns:
             str: Decoded response from the request
         """
-        resp = requests.get(url, timeout=timeout).content.decode("utf-8")
-        return resp
+        resp = self.session.get(url, timeout=timeout)
+        # Error responses are not parsed and cached. Server errors (5xx) are retried, client errors (4xx) are not
+        resp.raise_for_status()
+        return resp.content.decode("utf-8")
+
+    def close(self):
+        """Close the HTTP session and its pooled connections. Injected (shared) sessions are left open for their owner to close."""
+        if self._ownsSession and self._session is not None:
+            self._session.close()
+            self._session = None
 
     def get_routes_list(self) -> list[dict | None]:
         """Return a list of all known routes and mile markers
@@ -71,10 +236,15 @@ class GeospatialApi:
         # https://dtdapps.coloradodot.info/arcgis/rest/services/LRS/Routes/MapServer/exts/CdotLrsAccessRounded/Routes?f=pjson
         # https://dtdapps.coloradodot.info/arcgis/rest/services/LRS/Routes/MapServer/exts/CdotLrsAccessRounded/Route?routeId=070A&outSR=4326&f=pjson
 
+        found, routes = self._get_parsed(url)
+        if found:
+            return routes
+
         resp = self._make_cached_web_request(url, source="get_routes_list")
         if not resp:
             return None
         # response = [{'routeID': '070A', 'MMin': 0, 'MMax': 499}]
+        self._set_parsed(url, resp["routes"])
         return resp["routes"]
 
     def get_route_details(self, routeId: str) -> dict | None:
@@ -86,34 +256,42 @@ class GeospatialApi:
         Returns:
             dict | None: Route details (Route, MMin, MMax)
         """
-        parameters = []
-        parameters.append(f"routeId={routeId}")
-        parameters.append(f"outSR={self.SR}")
-        parameters.append("f=pjson")
-
-        url = f"{self.BASE_URL}/{self.GET_ROUTE_API}?{'&'.join(parameters)}"
+        url = self._get_route_details_url(routeId)
         logging.debug(url)
 
-        # https://dtdapps.coloradodot.info/arcgis/rest/services/LRS/Routes/MapServer/exts/CdotLrsAccessRounded/Routes?f=pjson
-        # https://dtdapps.coloradodot.info/arcgis/rest/services/LRS/Routes/MapServer/exts/CdotLrsAccessRounded/Route?routeId=070A&outSR=4326&f=pjson
+        found, route_details = self._get_parsed(url)
+        if found:
+            return route_details
 
         resp = self._make_cached_web_request(url)
         if not resp:
             return None
-        # response = {'routeID': '070A', 'MMin': 0, 'MMax': 499}
 
-        route_details = {
+        route_details = self._parse_route_details(resp)
+        self._set_parsed(url, route_details)
+        return route_details
+
+    def _get_route_details_url(self, routeId: str) -> str:
+        # https://dtdapps.coloradodot.info/arcgis/rest/services/LRS/Routes/MapServer/exts/CdotLrsAccessRounded/Route?routeId=070A&outSR=4326&f=pjson
+        parameters = []
+        parameters.append(f"routeId={routeId}")
+        parameters.append(f"outSR={self.SR}")
+        parameters.append("f=pjson")
+        return f"{self.BASE_URL}/{self.GET_ROUTE_API}?{'&'.join(parameters)}"
+
+    @staticmethod
+    def _parse_route_details(resp: dict) -> dict:
+        # response = {'routeID': '070A', 'MMin': 0, 'MMax': 499}
+        return {
             "Route": resp["features"][0]["attributes"]["Route"],
             "MMin": float(resp["features"][0]["attributes"]["MMin"]),
             "MMax": float(resp["features"][0]["attributes"]["MMax"]),
         }
 
-        return route_details
-
     def get_route_and_measure(
         self, latLng: tuple[float, float], heading: float = None, tolerance: int = 10000
     ) -> dict | None:
-        """Get route ID and mile marker from lat/long and optional heading
+        """Get route ID and mile marker from lat/long and optional heading. Lookups are memoized when a routeMeasureMemo is configured
 
         Args:
             latLng (tuple[float, float]): Lat/long coordinates
@@ -123,9 +301,44 @@ class GeospatialApi:
         Returns:
             dict | None: Route details (Route, Measure, MMin, MMax, Distance)
         """
+        if self.routeMeasureMemo is not None:
+            return self.routeMeasureMemo.get_or_lookup(
+                latLng,
+                heading,
+                tolerance,
+                lambda: self._get_route_and_measure(latLng, heading, tolerance),
+            )
+        return self._get_route_and_measure(latLng, heading, tolerance)
+
+    def _get_route_and_measure(
+        self, latLng: tuple[float, float], heading: float = None, tolerance: int = 10000
+    ) -> dict | None:
+        """Get route ID and mile marker from the GIS server, see `get_route_and_measure`"""
         # Get route ID and mile marker from lat/long and heading
-        lat, lng = latLng
+        url = self._get_route_and_measure_url(latLng, tolerance)
+        logging.debug(url)
+
+        found, route_details = self._get_parsed(url)
+        if not found:
+            resp = self._make_cached_web_request(url)
+            if not resp:
+                return None
+
+            route_details = self._parse_route_and_measure(resp)
+            self._set_parsed(url, route_details)
+        if not route_details:
+            return route_details
+
+        if heading:
+            route_details = self._add_direction_from_heading(route_details, heading)
+
+        return route_details
 
+    def _get_route_and_measure_url(
+        self, latLng: tuple[float, float], tolerance: int
+    ) -> str:
+        # https://dtdapps.coloradodot.info/arcgis/rest/services/LRS/Routes/MapServer/exts/CdotLrsAccessRounded/MeasureAtPoint?x=-105&y=39.5&inSR=4326&tolerance=10000&outSR=&f=html
+        lat, lng = latLng
         parameters = []
         parameters.append(f"x={lng}")
         parameters.append(f"y={lat}")
@@ -133,18 +346,16 @@ class GeospatialApi:
         parameters.append(f"inSR={self.SR}")
         parameters.append(f"outSR={self.SR}")
         parameters.append("f=pjson")
+        return (
+            f"{self.BASE_URL}/{self.GET_ROUTE_AND_MEASURE_API}?{'&'.join(parameters)}"
+        )
 
-        url = f"{self.BASE_URL}/{self.GET_ROUTE_AND_MEASURE_API}?{'&'.join(parameters)}"
-        logging.debug(url)
-
-        # https://dtdapps.coloradodot.info/arcgis/rest/services/LRS/Routes/MapServer/exts/CdotLrsAccessRounded/MeasureAtPoint?x=-105&y=39.5&inSR=4326&tolerance=10000&outSR=&f=html
-        resp = self._make_cached_web_request(url)
-        if not resp:
-            return None
-
+    @staticmethod
+    def _parse_route_and_measure(resp: dict) -> dict:
+        # No route within the tolerance
         if not resp.get("features"):
             return {}
-        route_details = {
+        return {
             "Route": resp["features"][0]["attributes"]["Route"],
             "Measure": float(resp["features"][0]["attributes"]["Measure"]),
             "MMin": float(resp["features"][0]["attributes"]["MMin"]),
@@ -152,37 +363,203 @@ class GeospatialApi:
             "Distance": float(resp["features"][0]["attributes"]["Distance"]),
         }
 
-        if heading:
-            step = 0.1  # miles, ~500 ft
-            route = route_details["Route"]
-            measure = route_details["Measure"]
-            mMin = route_details["MMin"]
-            mMax = route_details["MMax"]
-            startMeasure = measure - step
-            endMeasure = measure
-            if startMeasure < mMin:
-                # reverse order
-                startMeasure = measure
-                endMeasure = measure + step
-            if (endMeasure > mMax) or (startMeasure < mMin):
-                logging.warning(
-                    "get_route_and_measure bearing computation failed, measure out of bounds. MMin: {mMin}, MMax: {mMax}, startMeasure: {startMeasure}, endMeasure: {endMeasure}, step: {step}"
-                )
-                return route_details
+    def _add_direction_from_heading(self, route_details: dict, heading: float) -> dict:
+        """Add the route direction (+/-) to route details, by comparing the heading of an object to the bearing of the route
+
+        Args:
+            route_details (dict): Route details (Route, Measure, MMin, MMax)
+            heading (float): Heading of object
+
+        Returns:
+            dict: Route details, with Direction set when the route bearing could be computed
+        """
+        measures = self._get_direction_measures(route_details)
+        if not measures:
+            return route_details
+        startMeasure, endMeasure = measures
+        route = route_details["Route"]
+
+        profile = self.get_route_profile(
+            route, route_details["MMin"], route_details["MMax"]
+        )
+        if profile:
+            coords = self._slice_route_profile(profile, route, startMeasure, endMeasure)
+        else:
             coords = self.get_route_between_measures(
                 route, startMeasure, endMeasure, adjustRoute=False
             )
-            bearing = geospatial_tools.get_heading_from_coordinates(coords)
+        return self._set_direction(route_details, coords, heading)
 
-            if bearing > 180:
-                bearing -= 360
-            if abs(bearing - heading) < 90:
-                route_details["Direction"] = "+"
-            else:
-                route_details["Direction"] = "-"
+    @staticmethod
+    def _get_direction_measures(route_details: dict) -> tuple[float, float] | None:
+        """Get the short section of route (start measure, end measure) used to compute the route bearing at a measure, or None if the measure is out of bounds"""
+        step = 0.1  # miles, ~500 ft
+        measure = route_details["Measure"]
+        mMin = route_details["MMin"]
+        mMax = route_details["MMax"]
+        startMeasure = measure - step
+        endMeasure = measure
+        if startMeasure < mMin:
+            # reverse order
+            startMeasure = measure
+            endMeasure = measure + step
+        if (endMeasure > mMax) or (startMeasure < mMin):
+            logging.warning(
+                "get_route_and_measure bearing computation failed, measure out of bounds. MMin: {mMin}, MMax: {mMax}, startMeasure: {startMeasure}, endMeasure: {endMeasure}, step: {step}"
+            )
+            return None
+        return startMeasure, endMeasure
+
+    @classmethod
+    def _slice_route_profile(
+        cls,
+        profile: MeasuredLine,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+    ) -> list[list[float]]:
+        """Cut the section of route used to compute the route bearing out of a route profile, see `_add_direction_from_heading`"""
+        _, fromMeasure, toMeasure = cls.normalize_route_measures(
+            routeId, startMeasure, endMeasure, adjustRoute=False
+        )
+        return profile.slice(fromMeasure, toMeasure)
+
+    @staticmethod
+    def _set_direction(
+        route_details: dict, coords: list[list[float]], heading: float
+    ) -> dict:
+        """Set the route direction (+/-), by comparing the heading of an object to the bearing of a section of route"""
+        bearing = geospatial_tools.get_heading_from_coordinates(coords)
+
+        if bearing > 180:
+            bearing -= 360
+        if abs(bearing - heading) < 90:
+            route_details["Direction"] = "+"
+        else:
+            route_details["Direction"] = "-"
 
         return route_details
 
+    def get_route_profile(
+        self, routeId: str, mMin: float = None, mMax: float = None
+    ) -> MeasuredLine | None:
+        """Get the full geometry of a route with measures, from the routeProfiles cache. The route is downloaded once, with its GIS
+        measures, see `get_measured_route`.
+
+        Args:
+            routeId (str): GIS server route ID
+            mMin (float, optional): Optional pre-fetched minimum measure of the route. Defaults to None.
+            mMax (float, optional): Optional pre-fetched maximum measure of the route. Defaults to None.
+
+        Returns:
+            MeasuredLine | None: Route profile, or None if routeProfiles is disabled or the route could not be loaded
+        """
+        if self.routeProfiles is None:
+            return None
+
+        def load():
+            routeMMin, routeMMax = mMin, mMax
+            if routeMMin is None or routeMMax is None:
+                route_details = self.get_route_details(routeId)
+                if not route_details:
+                    return None
+                routeMMin, routeMMax = route_details["MMin"], route_details["MMax"]
+            _, fromMeasure, toMeasure = self.normalize_route_measures(
+                routeId, routeMMin, routeMMax, adjustRoute=False
+            )
+            profile = self.get_measured_route(routeId, fromMeasure, toMeasure)
+            if profile is None:
+                logging.warning(f"Failed to load route profile for route: {routeId}")
+            return profile
+
+        return self.routeProfiles.get_or_load(self.BASE_URL, routeId, load)
+
+    def get_route_and_measure_many(
+        self,
+        points: list[tuple[float, float] | tuple[float, float, float]],
+        tolerance: int = 10000,
+        maxWorkers: int = DEFAULT_BATCH_WORKERS,
+    ) -> list[dict | None]:
+        """Get route ID and mile marker for many lat/long points at once, using a bounded pool of worker threads. Duplicate points,
+        and points in the same grid cell of the routeMeasureMemo when one is configured, are only looked up once.
+
+        Args:
+            points (list[tuple[float, float] | tuple[float, float, float]]): Lat/long coordinates, with an optional heading as the third value
+            tolerance (int, optional): Tolerance in meters. Defaults to 10000.
+            maxWorkers (int, optional): Maximum number of concurrent lookups. Defaults to DEFAULT_BATCH_WORKERS.
+
+        Returns:
+            list[dict | None]: Route details for each point, in input order. Points which fail are returned as None, without affecting other points.
+        """
+        keys = self._get_lookup_keys(points, tolerance)
+        lookup_points = {}
+        for point, key in keys.items():
+            lookup_points.setdefault(key, point)
+        unique_points = list(lookup_points.values())
+        if not unique_points:
+            return []
+
+        # Worker threads don't inherit the request priority of the caller
+        priority = get_request_priority()
+
+        def lookup(point):
+            heading = point[2] if len(point) > 2 else None
+            try:
+                with request_priority(priority):
+                    return self.get_route_and_measure(
+                        (point[0], point[1]), heading, tolerance
+                    )
+            except Exception as e:
+                logging.warning(
+                    f"get_route_and_measure_many failed for point: {point}. Error: {e}"
+                )
+                return None
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(maxWorkers, len(unique_points)))
+        ) as executor:
+            results = dict(
+                zip(
+                    (keys[point] for point in unique_points),
+                    executor.map(lookup, unique_points),
+                )
+            )
+        return self._get_lookup_results(points, keys, results)
+
+    def _get_lookup_keys(
+        self,
+        points: list[tuple[float, float] | tuple[float, float, float]],
+        tolerance: int,
+    ) -> dict[tuple, tuple]:
+        """Get the lookup key of each distinct point of `get_route_and_measure_many`: the routeMeasureMemo grid cell when a memo is configured, otherwise the point itself"""
+        keys = {}
+        for point in points:
+            point = tuple(point)
+            if point in keys:
+                continue
+            if self.routeMeasureMemo is None:
+                keys[point] = point
+            else:
+                heading = point[2] if len(point) > 2 else None
+                keys[point] = self.routeMeasureMemo.get_key(
+                    (point[0], point[1]), heading, tolerance
+                )
+        return keys
+
+    def _get_lookup_results(
+        self,
+        points: list[tuple[float, float] | tuple[float, float, float]],
+        keys: dict[tuple, tuple],
+        results: dict[tuple, dict | None],
+    ) -> list[dict | None]:
+        """Get the route details of each point of `get_route_and_measure_many` from the results of its lookup key"""
+        # Copy route details for repeated points, so callers can safely modify them
+        output = []
+        for point in points:
+            route_details = results[keys[tuple(point)]]
+            output.append(dict(route_details) if route_details else route_details)
+        return output
+
     def get_point_at_measure(
         self, routeId: str, measure: float
     ) -> tuple[float, float] | None:
@@ -195,25 +572,34 @@ class GeospatialApi:
         Returns:
             tuple[float, float] | None: Lat/long of mile marker
         """
-        # Get lat/long points between two mile markers on route
-
-        parameters = []
-        parameters.append(f"routeId={routeId}")
-        parameters.append(f"measure={measure}")
-        parameters.append(f"outSR={self.SR}")
-        parameters.append("f=pjson")
-
-        url = f"{self.BASE_URL}/{self.GET_POINT_AT_MEASURE_API}?{'&'.join(parameters)}"
+        url = self._get_point_at_measure_url(routeId, measure)
         logging.debug(url)
 
+        found, latLng = self._get_parsed(url)
+        if found:
+            return latLng
+
         # call api
         response = self._make_cached_web_request(url)
         if not response:
             return None
 
+        latLng = self._parse_point_at_measure(response)
+        self._set_parsed(url, latLng)
+        return latLng
+
+    def _get_point_at_measure_url(self, routeId: str, measure: float) -> str:
+        parameters = []
+        parameters.append(f"routeId={routeId}")
+        parameters.append(f"measure={measure}")
+        parameters.append(f"outSR={self.SR}")
+        parameters.append("f=pjson")
+        return f"{self.BASE_URL}/{self.GET_POINT_AT_MEASURE_API}?{'&'.join(parameters)}"
+
+    @staticmethod
+    def _parse_point_at_measure(response: dict) -> tuple[float, float]:
         lat = response["features"][0]["geometry"]["y"]
         long = response["features"][0]["geometry"]["x"]
-
         return (lat, long)
 
     def get_route_geometry_ahead(
@@ -244,6 +630,12 @@ class GeospatialApi:
         """
 
         # TODO: Integrate direction to determine whether to add/subtract distance
+        if not routeDetails:
+            routeDetails = self._get_profile_route_details(
+                self.get_route_profile(routeId), routeId, startMeasure
+            )
+            if routeDetails:
+                routeDetails = self._add_direction_from_heading(routeDetails, heading)
         if not routeDetails:
             latLng = self.get_point_at_measure(routeId, startMeasure)
             routeDetails = self.get_route_and_measure(latLng, heading)
@@ -253,6 +645,40 @@ class GeospatialApi:
                 )
                 return None
 
+        startMeasure, endMeasure = self._get_measures_ahead(
+            routeDetails, startMeasure, distanceAhead, mMin, mMax
+        )
+        return {
+            "start_measure": startMeasure,
+            "end_measure": endMeasure,
+            "coordinates": self.get_route_between_measures(
+                routeId, startMeasure, endMeasure, compressed=compressed
+            ),
+        }
+
+    @staticmethod
+    def _get_profile_route_details(
+        profile: MeasuredLine | None, routeId: str, measure: float
+    ) -> dict | None:
+        """Get route details (Route, Measure, MMin, MMax) at a measure from a route profile, without a GIS request, or None if the measure is not on the profile"""
+        if not profile or not profile.contains_measure(measure):
+            return None
+        return {
+            "Route": routeId,
+            "Measure": measure,
+            "MMin": profile.mMin,
+            "MMax": profile.mMax,
+        }
+
+    @staticmethod
+    def _get_measures_ahead(
+        routeDetails: dict,
+        startMeasure: float,
+        distanceAhead: float,
+        mMin: float = None,
+        mMax: float = None,
+    ) -> tuple[float, float]:
+        """Get the start and end measures of the route geometry ahead, see `get_route_geometry_ahead`"""
         # process direction here
         if routeDetails.get("Direction", "+") == "+":
             endMeasure = startMeasure + distanceAhead
@@ -272,13 +698,7 @@ class GeospatialApi:
             startMeasure = min(max(startMeasure, mMin), mMax)
             endMeasure = min(max(endMeasure, mMin), mMax)
 
-        return {
-            "start_measure": startMeasure,
-            "end_measure": endMeasure,
-            "coordinates": self.get_route_between_measures(
-                routeId, startMeasure, endMeasure, compressed=compressed
-            ),
-        }
+        return startMeasure, endMeasure
 
     def get_route_between_measures(
         self,
@@ -288,6 +708,8 @@ class GeospatialApi:
         dualCarriageway: bool = True,
         compressed: bool = False,
         adjustRoute: bool = True,
+        compressionMethod: str = geometry_simplification.DEFAULT_METHOD,
+        maxDeviation: float = geometry_simplification.DEFAULT_MAX_DEVIATION,
     ) -> list[list[float]]:
         """Get lat/long points between two mile markers on route
 
@@ -296,53 +718,360 @@ class GeospatialApi:
             startMeasure (float): Start measure on route (miles)
             endMeasure (float): End measure on route (miles)
             dualCarriageway (bool, optional): Whether route is reversed dual carriageway. Defaults to True.
-            compressed (bool, optional): Whether to compress route geometry (remove unnecessary points). Defaults to False. See `tools/path_history_compression.generate_compressed_path` for more details
+            compressed (bool, optional): Whether to compress route geometry (remove unnecessary points). Defaults to False. See `tools/geometry_simplification.simplify_path` for more details
+            compressionMethod (str, optional): Simplification method of compressed route geometry, see `geometry_simplification.SIMPLIFICATION_METHODS`. Defaults to J2945/1.
+            maxDeviation (float, optional): Maximum deviation of compressed route geometry (meters). Defaults to geometry_simplification.DEFAULT_MAX_DEVIATION.
 
         Returns:
-            list[list[float]]: Route, as Linestring of lat/long points
+            list[list[float]]: Route, as Linestring of lat/long points. Sliced from cached route windows when routeSlices is configured
         """
         # Get lat/long points between two mile markers on route
-        if (
-            dualCarriageway
-            and self.is_route_dec(startMeasure, endMeasure)
-            and adjustRoute
-        ):
-            routeId = f"{routeId.replace('_DEC', '')}_DEC"
+        routeId, startMeasure, endMeasure = self.normalize_route_measures(
+            routeId, startMeasure, endMeasure, dualCarriageway, adjustRoute
+        )
 
-        if self.is_route_id_dec(routeId):
-            if startMeasure < endMeasure:
-                startMeasure, endMeasure = endMeasure, startMeasure
-        else:
-            if startMeasure > endMeasure:
-                startMeasure, endMeasure = endMeasure, startMeasure
+        linestring = None
+        if self.routeSlices is not None:
+            linestring = self._get_route_slice(routeId, startMeasure, endMeasure)
+        if linestring is None:
+            linestring = self._request_route_between_measures(
+                routeId, startMeasure, endMeasure
+            )
+            if linestring is None:
+                return None
 
-        parameters = []
-        parameters.append(f"routeId={routeId}")
-        parameters.append(f"fromMeasure={startMeasure}")
-        parameters.append(f"toMeasure={endMeasure}")
-        parameters.append(f"outSR={self.SR}")
-        parameters.append("f=pjson")
+        if compressed:
+            linestring = geometry_simplification.simplify_path(
+                linestring, compressionMethod, maxDeviation
+            )
 
-        url = (
-            f"{self.BASE_URL}/{self.ROUTE_BETWEEN_MEASURES_API}?{'&'.join(parameters)}"
+        return linestring
+
+    def _request_route_between_measures(
+        self,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        returnM: bool = False,
+    ) -> list[list[float]] | None:
+        """Request the route geometry between two (normalized) measures from the GIS server, see `get_route_between_measures`
+
+        Args:
+            routeId (str): GIS server route ID
+            startMeasure (float): Start measure on route (miles)
+            endMeasure (float): End measure on route (miles)
+            returnM (bool, optional): Whether to request the measure of each vertex, see `_parse_route_between_measures`. Defaults to False.
+
+        Returns:
+            list[list[float]] | None: Route, as Linestring of long/lat points
+        """
+        url = self._get_route_between_measures_url(
+            routeId, startMeasure, endMeasure, returnM
         )
         logging.debug(url)
 
+        found, linestring = self._get_parsed(url)
+        if found:
+            return linestring
+
         # call api
         response = self._make_cached_web_request(url)
         if not response:
             return None
 
+        linestring = self._parse_route_between_measures(response, returnM)
+        self._set_parsed(url, linestring)
+        return linestring
+
+    def _get_route_between_measures_url(
+        self,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        returnM: bool = False,
+    ) -> str:
+        parameters = []
+        parameters.append(f"routeId={routeId}")
+        parameters.append(f"fromMeasure={startMeasure}")
+        parameters.append(f"toMeasure={endMeasure}")
+        parameters.append(f"outSR={self.SR}")
+        if returnM:
+            parameters.append("returnM=true")
+        parameters.append("f=pjson")
+        return (
+            f"{self.BASE_URL}/{self.ROUTE_BETWEEN_MEASURES_API}?{'&'.join(parameters)}"
+        )
+
+    @staticmethod
+    def _parse_route_between_measures(
+        response: dict, returnM: bool = False
+    ) -> list[list[float]]:
+        """Parse the route geometry of a RouteBetweenMeasures response. With returnM, vertices are long/lat/measure when the
+        response has M values (hasM) for every vertex, and long/lat otherwise"""
         linestring = []
         for feature in response.get("features", []):
-            for path in feature.get("geometry", {}).get("paths", []):
-                linestring.extend(path)
+            geometry = feature.get("geometry", {})
+            for path in geometry.get("paths", []):
+                if not returnM:
+                    linestring.extend(path)
+                elif geometry.get("hasM", response.get("hasM")):
+                    # M is the last value of each vertex, after Z when hasZ
+                    linestring.extend([point[0], point[1], point[-1]] for point in path)
+                else:
+                    linestring.extend(point[:2] for point in path)
+        if returnM and any(len(point) < 3 or point[2] is None for point in linestring):
+            return [point[:2] for point in linestring]
+        return linestring
 
-        if compressed:
-            linestring = path_history_compression.generate_compressed_path(linestring)
+    def get_measured_route(
+        self, routeId: str, fromMeasure: float, toMeasure: float
+    ) -> MeasuredLine | None:
+        """Get the geometry of a section of route with its GIS measures. Vertex measures are requested with the geometry (returnM).
+        When the GIS server only returns 2D geometry, measures are sampled with PointAtMeasure every measureSampleMiles, and more
+        densely where the measure rate changes (see `linear_referencing.get_refine_measures`), and interpolated between the samples
+
+        Args:
+            routeId (str): GIS server route ID
+            fromMeasure (float): Start measure on route (miles), the higher measure for _DEC routes
+            toMeasure (float): End measure on route (miles)
+
+        Returns:
+            MeasuredLine | None: Measured section of route, or None if the geometry or measures could not be loaded
+        """
+        linestring = self._request_route_between_measures(
+            routeId, fromMeasure, toMeasure, returnM=True
+        )
+        samples = None
+        if linestring and not self._has_measures(linestring):
+            samples = []
+            requested = set()
+            measures = self._get_sample_measures(fromMeasure, toMeasure)
+            while measures:
+                requested.update(measures)
+                samples.extend(self._get_measure_samples(routeId, measures))
+                measures = self._get_refine_measures(linestring, samples, requested)
+        line = self._build_measured_line(linestring, samples)
+        if line is None:
+            logging.warning(
+                f"Failed to load measured route: {routeId}, fromMeasure: {fromMeasure}, toMeasure: {toMeasure}"
+            )
+        return line
+
+    def _get_sample_measures(self, fromMeasure: float, toMeasure: float) -> list[float]:
+        """Get the measures to sample a section of route at, including both ends, see `get_measured_route`"""
+        count = max(
+            math.ceil(abs(toMeasure - fromMeasure) / self.measureSampleMiles), 1
+        )
+        measures = [fromMeasure]
+        for i in range(1, count):
+            measures.append(
+                round(
+                    fromMeasure + (toMeasure - fromMeasure) * i / count,
+                    MEASURE_DECIMALS,
+                )
+            )
+        measures.append(toMeasure)
+        return measures
+
+    @staticmethod
+    def _get_refine_measures(
+        linestring: list[list[float]],
+        samples: list[tuple[float, float, float]],
+        requested: set[float],
+    ) -> list[float]:
+        """Get the measures to sample next where the measure rate changes between samples, see `linear_referencing.get_refine_measures`.
+        Measures which were already requested (including failed samples) are not requested again
+        """
+        measures = [
+            round(measure, MEASURE_DECIMALS)
+            for measure in get_refine_measures(linestring, samples)
+        ]
+        return list(dict.fromkeys(m for m in measures if m not in requested))
+
+    def _get_measure_samples(
+        self, routeId: str, measures: list[float]
+    ) -> list[tuple[float, float, float]]:
+        """Get the long/lat point at each measure with PointAtMeasure, using a bounded pool of worker threads. Failed samples are skipped
+
+        Args:
+            routeId (str): GIS server route ID
+            measures (list[float]): Measures on route (miles)
+
+        Returns:
+            list[tuple[float, float, float]]: Samples of measure, long and lat
+        """
+        # Worker threads don't inherit the request priority of the caller
+        priority = get_request_priority()
+
+        def sample(measure):
+            with request_priority(priority):
+                return self.get_point_at_measure(routeId, measure)
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(DEFAULT_BATCH_WORKERS, len(measures)))
+        ) as executor:
+            latLngs = list(executor.map(sample, measures))
+        return [
+            (measure, latLng[1], latLng[0])
+            for measure, latLng in zip(measures, latLngs)
+            if latLng
+        ]
+
+    @staticmethod
+    def _has_measures(linestring: list[list[float]]) -> bool:
+        """Check whether every vertex of a requested route has a measure (long/lat/measure), see `_parse_route_between_measures`"""
+        return all(len(point) > 2 for point in linestring)
+
+    @classmethod
+    def _build_measured_line(
+        cls,
+        linestring: list[list[float]] | None,
+        samples: list[tuple[float, float, float]] | None,
+    ) -> MeasuredLine | None:
+        """Build a measured line from requested route geometry, from the measure of each vertex, or else from measure samples, see `get_measured_route`"""
+        if not linestring or len(linestring) < 2:
+            return None
+        if cls._has_measures(linestring):
+            return MeasuredLine(
+                [point[:2] for point in linestring], [point[2] for point in linestring]
+            )
+        if not samples or len(samples) < 2:
+            return None
+        return MeasuredLine.from_measure_samples(linestring, samples)
+
+    def _get_route_slice(
+        self, routeId: str, startMeasure: float, endMeasure: float
+    ) -> list[list[float]] | None:
+        """Cut the route geometry between two (normalized) measures out of cached route windows, see `RouteSliceCache`
+
+        Args:
+            routeId (str): GIS server route ID
+            startMeasure (float): Start measure on route (miles)
+            endMeasure (float): End measure on route (miles)
+
+        Returns:
+            list[list[float]] | None: Route, as Linestring of long/lat points, or None if the route windows could not be loaded
+        """
+        route_details = self.routeSlices.get_or_load_route_details(
+            self.BASE_URL, routeId, lambda: self.get_route_details(routeId)
+        )
+        windows = self._get_route_slice_windows(
+            routeId, startMeasure, endMeasure, route_details
+        )
+        if windows is None:
+            return None
+
+        lines = []
+        for window, fromMeasure, toMeasure in windows:
+
+            def load(fromMeasure=fromMeasure, toMeasure=toMeasure):
+                return self.get_measured_route(routeId, fromMeasure, toMeasure)
+
+            line = self.routeSlices.get_or_load_window(
+                self.BASE_URL, routeId, window, load
+            )
+            if line is None:
+                return None
+            lines.append(line)
+        return self._join_route_slices(
+            routeId, startMeasure, endMeasure, windows, lines
+        )
+
+    def _get_route_slice_windows(
+        self,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        route_details: dict | None,
+    ) -> list[tuple[int, float, float]] | None:
+        """Get the route windows covering a section of route, see `_get_route_slice`
+
+        Args:
+            routeId (str): GIS server route ID
+            startMeasure (float): Start measure on route (miles)
+            endMeasure (float): End measure on route (miles)
+            route_details (dict | None): Route details (Route, MMin, MMax)
+
+        Returns:
+            list[tuple[int, float, float]] | None: Window index, and the from/to measures to request the window with, or None if the section is not on the route
+        """
+        if not route_details:
+            return None
+        mMin, mMax = route_details["MMin"], route_details["MMax"]
+        lowMeasure, highMeasure = sorted((startMeasure, endMeasure))
+        if lowMeasure < mMin or highMeasure > mMax:
+            # Let the GIS server handle measures outside of the route
+            return None
+        isDec = self.is_route_id_dec(routeId)
+        # _DEC routes are traversed from the higher to the lower measure
+        return [
+            (window, windowMax, windowMin) if isDec else (window, windowMin, windowMax)
+            for window, windowMin, windowMax in self.routeSlices.get_windows(
+                lowMeasure, highMeasure, mMin, mMax
+            )
+        ]
 
+    @classmethod
+    def _join_route_slices(
+        cls,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        windows: list[tuple[int, float, float]],
+        lines: list[MeasuredLine],
+    ) -> list[list[float]]:
+        """Join the sections of route cut out of consecutive route windows (see `_get_route_slice_windows`), see `_get_route_slice`"""
+        lowMeasure, highMeasure = sorted((startMeasure, endMeasure))
+        linestring = []
+        for (_, fromMeasure, toMeasure), line in zip(windows, lines):
+            windowMin, windowMax = sorted((fromMeasure, toMeasure))
+            section = line.slice(
+                max(lowMeasure, windowMin), min(highMeasure, windowMax)
+            )
+            if linestring and section[0] == linestring[-1]:
+                section = section[1:]
+            linestring.extend(section)
+
+        if cls.is_route_id_dec(routeId):
+            linestring.reverse()
         return linestring
 
+    @classmethod
+    def normalize_route_measures(
+        cls,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        dualCarriageway: bool = True,
+        adjustRoute: bool = True,
+    ) -> tuple[str, float, float]:
+        """Resolve the route ID and measure order used by the GIS server for a section of route. Decreasing measures select the _DEC (reversed dual carriageway) route, which is always traversed from the higher to the lower measure.
+
+        Args:
+            routeId (str): GIS server route ID
+            startMeasure (float): Start measure on route (miles)
+            endMeasure (float): End measure on route (miles)
+            dualCarriageway (bool, optional): Whether route is reversed dual carriageway. Defaults to True.
+            adjustRoute (bool, optional): Whether to switch to the _DEC route for decreasing measures. Defaults to True.
+
+        Returns:
+            tuple[str, float, float]: Route ID, start measure, end measure
+        """
+        if (
+            dualCarriageway
+            and cls.is_route_dec(startMeasure, endMeasure)
+            and adjustRoute
+        ):
+            routeId = f"{routeId.replace('_DEC', '')}_DEC"
+
+        if cls.is_route_id_dec(routeId):
+            if startMeasure < endMeasure:
+                startMeasure, endMeasure = endMeasure, startMeasure
+        else:
+            if startMeasure > endMeasure:
+                startMeasure, endMeasure = endMeasure, startMeasure
+        return routeId, startMeasure, endMeasure
+
     @staticmethod
     def is_route_dec(startMeasure: float, endMeasure: float) -> bool:
         """Check if the route is a reversed dual carriageway (mileposts are decreasing)
@@ -366,6 +1095,32 @@ class GeospatialApi:
         """
         return route_id.lower().endswith("_dec")
 
+    def _get_parsed(self, url: str) -> tuple[bool, Any]:
+        """Get a parsed result from the parsedCache, if configured
+
+        Args:
+            url (str): Request url
+
+        Returns:
+            tuple[bool, Any]: Whether the result was cached, and a copy of the result
+        """
+        if self.parsedCache is None:
+            return False, None
+        found, value = self.parsedCache.get(url)
+        if found:
+            self.metrics.record_cache_hit(get_endpoint(url))
+        return found, value
+
+    def _set_parsed(self, url: str, value: Any):
+        """Store a parsed result in the parsedCache, if configured
+
+        Args:
+            url (str): Request url
+            value (Any): Parsed result
+        """
+        if self.parsedCache is not None:
+            self.parsedCache.set(url, value)
+
     def _make_cached_web_request(
         self,
         url: str,
@@ -373,7 +1128,7 @@ class GeospatialApi:
         retryOnTimeout: bool = False,
         source: str = "cdot_geospatial_api",
     ) -> Any:
-        """Make a GET request and cache the response
+        """Make a GET request and cache the response. Identical concurrent requests are coalesced into one, see `SingleFlight`
 
         Args:
             url (str): URL to make the request to
@@ -384,34 +1139,206 @@ class GeospatialApi:
         Returns:
             Any: Response from the request
         """
+        return self.singleFlight.do(
+            url,
+            lambda: self._fetch_cached_web_request(
+                url, timeout, retryOnTimeout, source
+            ),
+        )
+
+    def _fetch_cached_web_request(
+        self,
+        url: str,
+        timeout: int = 15,
+        retryOnTimeout: bool = False,
+        source: str = "cdot_geospatial_api",
+    ) -> Any:
+        """Make a GET request and cache the response, see `_make_cached_web_request`. Failed requests are retried according to
+        the retryPolicy, within the time left on the deadline. Requests fail fast (return None) while the circuitBreaker is open
+        """
         logging.debug(f"Making GET request to GIS server for {source} with url {url}")
-        startTime = time.time()
-        try:
-            response = self.getCachedRequest(url)
-            if not response:
-                response = self._make_web_request(url, timeout=timeout)
-                self.setCachedRequest(url, response)
-            self.responseTimes.append(time.time() - startTime)
-            logging.debug(
-                f"Average Response Time: {sum(self.responseTimes)/len(self.responseTimes)}"
-            )
-            logging.debug("Max Response Time: " + str(max(self.responseTimes)))
+        response = self.getCachedRequest(url)
+        if response:
+            self.metrics.record_cache_hit(get_endpoint(url))
             return json.loads(response)
-        except requests.exceptions.Timeout as e:
-            if retryOnTimeout:
+
+        attempts = self._request_attempts(url, timeout, retryOnTimeout, source)
+        result, error = None, None
+        try:
+            while True:
+                try:
+                    if error is not None:
+                        action, value = attempts.throw(error)
+                    else:
+                        action, value = attempts.send(result)
+                except StopIteration as stop:
+                    response = stop.value
+                    break
+                result, error = None, None
+                if action == ACQUIRE:
+                    result = self.rateLimiter.acquire(timeout=value)
+                elif action == SLEEP:
+                    time.sleep(value)
+                else:
+                    try:
+                        startTime = time.time()
+                        response = self._make_web_request(url, timeout=value)
+                        result = response, time.time() - startTime
+                    except Exception as e:
+                        error = e
+        finally:
+            # Releases the half-open trial of a request which is abandoned, e.g. cancelled
+            attempts.close()
+
+        if response is None:
+            return None
+        self.setCachedRequest(url, response)
+        return json.loads(response)
+
+    def _request_attempts(
+        self, url: str, timeout: float, retryOnTimeout: bool, source: str
+    ) -> Generator[tuple[str, float], Any, str | None]:
+        """Attempt and backoff state of one GIS request (deadline, circuit breaker, rate limit, retries and metrics), shared by
+        `GeospatialApi` and `async_geospatial_api.AsyncGeospatialApi`, which only differ in how they wait and send. Yields the
+        next step as (action, value), and is sent its result:
+
+            (ACQUIRE, timeout): wait for a rate limit token, send whether one was acquired
+            (SEND, timeout): send the request, send (response, response time) or throw the request error
+            (SLEEP, delay): wait before retrying, send None
+
+        Args:
+            url (str): URL to make the request to
+            timeout (float): Request timeout in seconds
+            retryOnTimeout (bool): Retry once with double timeout on timeout, when no retryPolicy is configured
+            source (str): Source to include in logging
+
+        Returns:
+            str | None: Decoded response, or None if the request failed, was skipped or ran out of time
+        """
+        endpoint = get_endpoint(url)
+        retry = 0
+        while True:
+            requestTimeout = timeout
+            if self.deadline is not None:
+                requestTimeout = min(timeout, self.deadline.remaining())
+                if requestTimeout <= 0:
+                    logging.debug(
+                        f"Geospatial Request skipped for {source} with url : {url}. GIS deadline exceeded"
+                    )
+                    return None
+            if self.rateLimiter is not None and not (
+                yield ACQUIRE,
+                self.deadline.remaining() if self.deadline is not None else None,
+            ):
                 logging.debug(
-                    f"Geospatial Request Timed Out for {source} with url : {url}. Timeout: {timeout}. Retrying with double timeout"
-                )
-                return self._make_cached_web_request(
-                    url, timeout=timeout * 2, retryOnTimeout=False
+                    f"Geospatial Request skipped for {source} with url : {url}. GIS deadline exceeded waiting for the rate limit"
                 )
-            else:
-                logging.warning(
-                    f"Geospatial Request Timed Out for {source} with url : {url}. Timeout: {timeout}. Error: {e}"
+                return None
+
+            # The breaker is asked last, so a half-open trial is only claimed by a request which is sent
+            if (
+                self.circuitBreaker is not None
+                and not self.circuitBreaker.allow_request()
+            ):
+                logging.debug(
+                    f"Geospatial Request skipped for {source} with url : {url}. GIS circuit open"
                 )
                 return None
-        except requests.exceptions.RequestException as e:
-            logging.warning(
-                f"Geospatial Request Failed for {source} with url : {url}. Timeout: {timeout}. Error: {e}"
-            )
-            return None
+
+            try:
+                response, responseTime = yield SEND, requestTimeout
+                self.metrics.record_request(endpoint, responseTime)
+                logging.debug(f"{endpoint} response time: {responseTime:.3f}s")
+                if self.circuitBreaker is not None:
+                    self.circuitBreaker.record_success()
+                return response
+            except TIMEOUT_ERRORS as e:
+                self.metrics.record_timeout(endpoint)
+                error = f"Geospatial Request Timed Out for {source} with url : {url}. Timeout: {requestTimeout}. Error: {e}"
+                if self.retryPolicy is None and retryOnTimeout:
+                    logging.debug(
+                        f"Geospatial Request Timed Out for {source} with url : {url}. Timeout: {timeout}. Retrying with double timeout"
+                    )
+                    timeout *= 2
+                    retryOnTimeout = False
+                    continue
+            except REQUEST_ERRORS as e:
+                self.metrics.record_error(endpoint)
+                error = f"Geospatial Request Failed for {source} with url : {url}. Timeout: {requestTimeout}. Error: {e}"
+                if is_client_error(e):
+                    # The GIS server answered, and would reject the request again
+                    if self.circuitBreaker is not None:
+                        self.circuitBreaker.record_success()
+                    logging.warning(error)
+                    return None
+            except BaseException:
+                # Abandoned without an outcome (e.g. cancelled), let another request probe a half-open circuit
+                if self.circuitBreaker is not None:
+                    self.circuitBreaker.release_trial()
+                raise
+            if self.circuitBreaker is not None:
+                self.circuitBreaker.record_failure()
+
+            if self.retryPolicy is None or retry >= self.retryPolicy.maxRetries:
+                logging.warning(error)
+                return None
+            delay = self.retryPolicy.get_delay(retry)
+            if self.deadline is not None and delay >= self.deadline.remaining():
+                logging.warning(f"{error}. No time left on the GIS deadline to retry")
+                return None
+            logging.debug(f"{error}. Retrying in {delay:.2f}s")
+            yield SLEEP, delay
+            retry += 1
+
+    def start_deadline(self, seconds: float) -> Deadline:
+        """Start an overall time budget for the following GIS requests (e.g. one translation batch). Once it is spent,
+        requests return None immediately, and callers fall back to their raw geometry.
+
+        Args:
+            seconds (float): Time budget, in seconds
+
+        Returns:
+            Deadline: Started deadline
+        """
+        self.deadline = Deadline(seconds)
+        return self.deadline
+
+    def clear_deadline(self):
+        """Remove the time budget, see `start_deadline`"""
+        self.deadline = None
+
+
+# Process-wide default api, used by the combination modules when no api is passed in. See `configure_default_api`
+_default_api: GeospatialApi | None = None
+_default_api_created = False  # whether _default_api was created by get_default_api, and is closed when replaced
+_default_api_lock = threading.Lock()
+
+
+def configure_default_api(api: GeospatialApi | None):
+    """Set the process-wide default GeospatialApi, so one configured client (cache, connection pool, memos) serves every
+    combination call which is not passed its own api
+
+    Args:
+        api (GeospatialApi | None): Default api. None restores the default behavior, a GeospatialApi() created on first use.
+    """
+    global _default_api, _default_api_created
+    with _default_api_lock:
+        if _default_api_created and _default_api is not api:
+            _default_api.close()
+        _default_api = api
+        _default_api_created = False
+
+
+def get_default_api() -> GeospatialApi:
+    """Get the process-wide default GeospatialApi, see `configure_default_api`
+
+    Returns:
+        GeospatialApi: Configured default api. When none is configured, one GeospatialApi() is created on first use and
+        shared by all later calls, so they reuse its session and connection pool
+    """
+    global _default_api, _default_api_created
+    with _default_api_lock:
+        if _default_api is None:
+            _default_api = GeospatialApi()
+            _default_api_created = True
+        return _default_api
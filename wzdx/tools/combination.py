@@ -1,6 +1,5 @@
 import logging
-from . import cdot_geospatial_api, date_tools
-
+from . import cdot_geospatial_api, date_tools, gis_rate_limit
 
 ROUTE_OVERLAP_INDIVIDUAL_DISTANCE = 0.25
 
@@ -120,24 +119,138 @@ def does_route_overlap_4(start_1_m, end_1_m, start_2_m, end_2_m):
         return False
 
 
-def get_route_details_for_coordinates_lngLat(coordinates):
-    route_details_start = get_route_details(coordinates[0][1], coordinates[0][0])
+def get_route_details_for_coordinates_lngLat(
+    coordinates, routeDetailsMap=None, cdotGeospatialApi=None
+):
+    route_details_start = get_route_details(
+        coordinates[0][1],
+        coordinates[0][0],
+        routeDetailsMap,
+        cdotGeospatialApi,
+    )
 
     if len(coordinates) == 1 or (
         len(coordinates) == 2 and coordinates[0] == coordinates[1]
     ):
         route_details_end = None
     else:
-        route_details_end = get_route_details(coordinates[-1][1], coordinates[-1][0])
+        route_details_end = get_route_details(
+            coordinates[-1][1],
+            coordinates[-1][0],
+            routeDetailsMap,
+            cdotGeospatialApi,
+        )
 
     return route_details_start, route_details_end
 
 
-def get_route_details(lat, lng):
-    return cdot_geospatial_api.GeospatialApi().get_route_and_measure((lat, lng))
+def get_api(cdotGeospatialApi=None):
+    """Get the GeospatialApi to use for a combination call
+
+    Args:
+        cdotGeospatialApi (GeospatialApi, optional): Api passed in by the caller. Defaults to None, the process-wide default api, see `cdot_geospatial_api.configure_default_api`.
+
+    Returns:
+        GeospatialApi: Api to use
+    """
+    if cdotGeospatialApi is not None:
+        return cdotGeospatialApi
+    return cdot_geospatial_api.get_default_api()
+
+
+def get_route_details(lat, lng, routeDetailsMap=None, cdotGeospatialApi=None):
+    if routeDetailsMap is not None and (lat, lng) in routeDetailsMap:
+        route_details = routeDetailsMap[(lat, lng)]
+        return dict(route_details) if route_details else route_details
+    return get_api(cdotGeospatialApi).get_route_and_measure((lat, lng))
+
+
+def get_route_details_map(coordinates_list, cdotGeospatialApi=None, priorities=None):
+    """Look up GIS route details for the start and end points of many events in concurrent batches, see `GeospatialApi.get_route_and_measure_many`.
+    Lookups are memoized by the routeMeasureMemo of the api, when one is configured
 
+    Args:
+        coordinates_list (list[list[list[float]]]): List of event coordinates (long/lat)
+        cdotGeospatialApi (GeospatialApi, optional): Api to look up route details with. Defaults to None, the process-wide default api.
+        priorities (list[int], optional): Request priority of each event, see `gis_rate_limit.get_event_priority`. Points are looked up in
+            one batch per priority, live events first. Defaults to None, one batch with the priority of the caller.
 
-def add_route_details(wzdx_msgs, overwrite=False, keepInvalid=True):
+    Returns:
+        dict[tuple[float, float], dict | None]: Route details keyed by (lat, long), for use with `get_route_details_for_coordinates_lngLat`
+    """
+    # Points shared by several events are looked up with the highest priority of those events
+    point_priorities = {}
+    for index, coordinates in enumerate(coordinates_list):
+        if not coordinates:
+            continue
+        priority = (
+            priorities[index]
+            if priorities is not None
+            else gis_rate_limit.get_request_priority()
+        )
+        for point in [
+            (coordinates[0][1], coordinates[0][0]),
+            (coordinates[-1][1], coordinates[-1][0]),
+        ]:
+            point_priorities[point] = min(
+                point_priorities.get(point, priority), priority
+            )
+
+    if not point_priorities:
+        return {}
+
+    api = get_api(cdotGeospatialApi)
+    route_details_map = {}
+    for priority in sorted(set(point_priorities.values())):
+        points = [point for point, p in point_priorities.items() if p == priority]
+        with gis_rate_limit.request_priority(priority):
+            route_details = api.get_route_and_measure_many(points)
+        route_details_map.update(zip(points, route_details))
+    return route_details_map
+
+
+def get_route_details_map_for_wzdx(wzdx_msgs_list, cdotGeospatialApi=None):
+    """Look up GIS route details for the start and end points of all WZDx messages of a combination run in one concurrent batch,
+    see `get_route_details_map`. Only messages without route details are looked up, see `is_missing_route_details`
+
+    Args:
+        wzdx_msgs_list (list[list[dict]]): Lists of WZDx messages
+        cdotGeospatialApi (GeospatialApi, optional): Api to look up route details with. Defaults to None, the process-wide default api.
+
+    Returns:
+        dict[tuple[float, float], dict | None]: Route details keyed by (lat, long), for use with `get_route_details_for_wzdx`
+    """
+    coordinates_list = []
+    for wzdx_msgs in wzdx_msgs_list:
+        for wzdx in wzdx_msgs:
+            if is_missing_route_details(wzdx["features"][0]):
+                coordinates_list.append(wzdx["features"][0]["geometry"]["coordinates"])
+    return get_route_details_map(coordinates_list, cdotGeospatialApi=cdotGeospatialApi)
+
+
+def is_missing_route_details(feature: dict) -> bool:
+    """Check whether a WZDx feature carries neither route_details_start nor route_details_end in its properties, so both are
+    looked up from the GIS server. Features with only one of them are skipped as invalid by the combination modules
+
+    Args:
+        feature (dict): WZDx feature
+
+    Returns:
+        bool: True if the route details of the feature have to be looked up
+    """
+    properties = feature["properties"]
+    return not properties.get("route_details_start") and not properties.get(
+        "route_details_end"
+    )
+
+
+def add_route_details(
+    wzdx_msgs,
+    overwrite=False,
+    keepInvalid=True,
+    cdotGeospatialApi=None,
+    routeDetailsMap=None,
+):
     output = []
     for wzdx in wzdx_msgs:
         if (
@@ -145,7 +258,7 @@ def add_route_details(wzdx_msgs, overwrite=False, keepInvalid=True):
             or wzdx.get("route_details_end") == "missing"
         ) or overwrite:
             route_details_start, route_details_end = get_route_details_for_wzdx(
-                wzdx["features"][0]
+                wzdx["features"][0], routeDetailsMap, cdotGeospatialApi
             )
 
             wzdx["route_details_start"] = (
@@ -160,16 +273,30 @@ def add_route_details(wzdx_msgs, overwrite=False, keepInvalid=True):
     return output
 
 
-def get_route_details_for_wzdx(wzdx_feature):
+def get_route_details_for_wzdx(
+    wzdx_feature, routeDetailsMap=None, cdotGeospatialApi=None
+):
     coordinates = wzdx_feature["geometry"]["coordinates"]
-    route_details_start = get_route_details(coordinates[0][1], coordinates[0][0])
+    route_details_start = get_route_details(
+        coordinates[0][1],
+        coordinates[0][0],
+        routeDetailsMap,
+        cdotGeospatialApi=cdotGeospatialApi,
+    )
 
-    route_details_end = get_route_details(coordinates[-1][1], coordinates[-1][0])
+    route_details_end = get_route_details(
+        coordinates[-1][1],
+        coordinates[-1][0],
+        routeDetailsMap,
+        cdotGeospatialApi=cdotGeospatialApi,
+    )
 
     return route_details_start, route_details_end
 
 
-def identify_overlapping_features_wzdx(wzdx_msgs_1, wzdx_msgs_2):
+def identify_overlapping_features_wzdx(
+    wzdx_msgs_1, wzdx_msgs_2, cdotGeospatialApi=None, routeDetailsMap=None
+):
     wzdx_routes_1 = {}
     wzdx_routes_2 = {}
 
@@ -194,7 +321,7 @@ def identify_overlapping_features_wzdx(wzdx_msgs_1, wzdx_msgs_2):
             continue
         if not wzdx_1.get("route_details_start") or not wzdx_1.get("route_details_end"):
             route_details_start, route_details_end = get_route_details_for_wzdx(
-                wzdx_1["features"][0]
+                wzdx_1["features"][0], routeDetailsMap, cdotGeospatialApi
             )
 
             if not route_details_start or not route_details_end:
@@ -240,7 +367,7 @@ def identify_overlapping_features_wzdx(wzdx_msgs_1, wzdx_msgs_2):
             continue
         if not wzdx_2.get("route_details_start") or not wzdx_2.get("route_details_end"):
             route_details_start, route_details_end = get_route_details_for_wzdx(
-                wzdx_2["features"][0]
+                wzdx_2["features"][0], routeDetailsMap, cdotGeospatialApi
             )
 
             if not route_details_start or not route_details_end:
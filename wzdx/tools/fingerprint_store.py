@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+
+STORE_VERSION = 1
+
+
+def get_fingerprint(obj) -> str:
+    """Get a stable fingerprint of a JSON object, independent of key order
+
+    Args:
+        obj: JSON serializable object
+
+    Returns:
+        str: SHA-256 hex digest of the canonical JSON encoding
+    """
+    encoded = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class FingerprintStore:
+    """Local store of previous translation results, keyed by event, for incremental translation. Each entry holds the
+    fingerprint of the raw input it was generated from, so results are only reused while the input is unchanged.
+
+        store = FingerprintStore("planned_events_fingerprints.json.gz")
+        value = store.get(key, get_fingerprint(raw_message))
+        ...
+        store.set(key, get_fingerprint(raw_message), value)
+        store.save()
+
+    Entries are kept in memory, and written to a JSON file (gzip compressed if the path ends with .gz) by `save`.
+    """
+
+    def __init__(self, path: str = None):
+        """Initialize the store, loading previous entries from the store file if it exists
+
+        Args:
+            path (str, optional): Store file path. Defaults to None, an in-memory store.
+        """
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.entries = self._load(path)
+
+    @staticmethod
+    def _load(path: str) -> dict[str, dict]:
+        opener = gzip.open if path.endswith(".gz") else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                store = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(
+                f"Failed to load fingerprint store {path}, starting empty: {e}"
+            )
+            return {}
+        if store.get("version") != STORE_VERSION:
+            logging.info(
+                f"Ignoring fingerprint store {path} with version {store.get('version')}, expected {STORE_VERSION}"
+            )
+            return {}
+        return store.get("entries", {})
+
+    def get(self, key: str, fingerprint: str) -> dict | None:
+        """Get the stored value of a key, if it was stored with the same fingerprint
+
+        Args:
+            key (str): Entry key, e.g. event ID and direction
+            fingerprint (str): Fingerprint of the current input, see `get_fingerprint`
+
+        Returns:
+            dict | None: Stored value, or None if the key is new or its input changed
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["value"]
+
+    def set(self, key: str, fingerprint: str, value: dict):
+        """Store the value of a key, with the fingerprint of the input it was generated from
+
+        Args:
+            key (str): Entry key
+            fingerprint (str): Fingerprint of the input, see `get_fingerprint`
+            value (dict): JSON serializable value
+        """
+        self.entries[key] = {
+            "fingerprint": fingerprint,
+            "updated": time.time(),
+            "value": value,
+        }
+
+    def discard(self, key: str):
+        """Remove the entry of a key, if it exists"""
+        self.entries.pop(key, None)
+
+    def retain(self, keys) -> int:
+        """Remove all entries except the given keys, e.g. events which are no longer in the feed
+
+        Args:
+            keys (Iterable[str]): Keys to keep
+
+        Returns:
+            int: Number of removed entries
+        """
+        keys = set(keys)
+        removed = [key for key in self.entries if key not in keys]
+        for key in removed:
+            del self.entries[key]
+        return len(removed)
+
+    def save(self, path: str = None):
+        """Write all entries to the store file. The file is replaced atomically, so readers never see a partial store
+
+        Args:
+            path (str, optional): Store file path. Defaults to None, the path the store was loaded from.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No fingerprint store path")
+        opener = gzip.open if path.endswith(".gz") else open
+        tempPath = f"{path}.tmp"
+        with opener(tempPath, "wt", encoding="utf-8") as f:
+            json.dump({"version": STORE_VERSION, "entries": self.entries}, f)
+        os.replace(tempPath, path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
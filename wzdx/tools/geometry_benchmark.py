@@ -0,0 +1,263 @@
+import argparse
+import json
+import math
+import random
+import time
+from typing import Callable
+
+import shapely
+
+from . import geometry_simplification, path_history_compression, polygon_tools
+
+PROGRAM_NAME = "GeometryBenchmark"
+PROGRAM_VERSION = "1.0"
+
+DEFAULT_VERTICES = [200, 2000, 20000]
+DEFAULT_REPEAT = 5
+DEFAULT_BUFFER_WIDTH = 20  # meters
+VERTEX_SPACING_DEGREES = (
+    0.0001  # about 10 meters, similar to RouteBetweenMeasures geometry
+)
+
+
+def generate_path(vertices: int, seed: int = 0) -> list[list[float]]:
+    """Generate a road-like long/lat path, alternating straight, gently curving and winding sections, with repeated points
+
+    Args:
+        vertices (int): Number of vertices
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        list[list[float]]: Path, as Linestring of long/lat points
+    """
+    rng = random.Random(seed)
+    lng, lat, heading = -105.0, 39.0, 0.0
+    path = []
+    sectionRemaining = 0
+    for _ in range(vertices):
+        if sectionRemaining == 0:
+            sectionRemaining = rng.randint(20, 500)
+            curvature = rng.choice([0.0005, 0.01, 0.1])
+        sectionRemaining -= 1
+        if path and rng.random() < 0.02:
+            path.append(list(path[-1]))
+            continue
+        heading += rng.gauss(0, curvature)
+        lng += VERTEX_SPACING_DEGREES * math.sin(heading)
+        lat += VERTEX_SPACING_DEGREES * math.cos(heading)
+        path.append([lng, lat])
+    return path
+
+
+def time_function(fn: Callable, *args, repeat: int = DEFAULT_REPEAT) -> float:
+    """Get the best run time of a function over a number of runs
+
+    Args:
+        fn (Callable): Function to time
+        *args: Function arguments
+        repeat (int, optional): Number of runs. Defaults to DEFAULT_REPEAT.
+
+    Returns:
+        float: Best run time, in seconds
+    """
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_compression(
+    path: list[list[float]], repeat: int = DEFAULT_REPEAT
+) -> dict:
+    """Compare `path_history_compression.generate_compressed_path` with the point by point reference implementation
+
+    Args:
+        path (list[list[float]]): Path, as Linestring of long/lat points
+        repeat (int, optional): Number of runs of each implementation. Defaults to DEFAULT_REPEAT.
+
+    Returns:
+        dict: vertices, compressed vertices, best run times (seconds), speedup and whether the outputs are identical
+    """
+    reference = path_history_compression.generate_compressed_path_iterative(path)
+    vectorized = path_history_compression.generate_compressed_path(path)
+    referenceTime = time_function(
+        path_history_compression.generate_compressed_path_iterative,
+        path,
+        repeat=repeat,
+    )
+    vectorizedTime = time_function(
+        path_history_compression.generate_compressed_path, path, repeat=repeat
+    )
+    return {
+        "vertices": len(path),
+        "compressed": len(vectorized),
+        "iterative": referenceTime,
+        "vectorized": vectorizedTime,
+        "speedup": referenceTime / vectorizedTime if vectorizedTime else math.inf,
+        "identical": reference == vectorized,
+    }
+
+
+def compare_simplification(path: list[list[float]], maxDeviation: float) -> list[dict]:
+    """Simplify a path with each simplification method, see `geometry_simplification.simplify`
+
+    Args:
+        path (list[list[float]]): Path, as Linestring of long/lat points
+        maxDeviation (float): Maximum deviation (meters)
+
+    Returns:
+        list[dict]: Report of each method, with vertices removed, actual max deviation and run time (seconds)
+    """
+    reports = []
+    for method in geometry_simplification.SIMPLIFICATION_METHODS:
+        start = time.perf_counter()
+        result = geometry_simplification.simplify(path, method, maxDeviation)
+        reports.append({**result.report(), "time": time.perf_counter() - start})
+    return reports
+
+
+def get_polygon_difference(polygon, reference) -> float:
+    """Get the largest distance between two lat/long polygons (Hausdorff distance), in meters"""
+    # Both polygons in the same planar projection
+    points = [[lng, lat] for lat, lng in polygon.exterior.coords]
+    referencePoints = [[lng, lat] for lat, lng in reference.exterior.coords]
+    planar = geometry_simplification.project_path(points + referencePoints)
+    return float(
+        shapely.hausdorff_distance(
+            shapely.polygons(planar[: len(points)]),
+            shapely.polygons(planar[len(points) :]),
+        )
+    )
+
+
+def benchmark_buffer(
+    path: list[list[float]],
+    width: float = DEFAULT_BUFFER_WIDTH,
+    repeat: int = DEFAULT_REPEAT,
+) -> dict:
+    """Compare the geodesic and projected modes of `polygon_tools.generate_buffer_polygon_from_linestring` with the point
+    by point (geopy) reference implementation
+
+    Args:
+        path (list[list[float]]): Path, as Linestring of long/lat points
+        width (float, optional): Buffer width (meters). Defaults to DEFAULT_BUFFER_WIDTH.
+        repeat (int, optional): Number of runs of each implementation. Defaults to DEFAULT_REPEAT.
+
+    Returns:
+        dict: best run times (seconds) and largest distance from the reference polygon (meters) of each mode
+    """
+    reference = polygon_tools.generate_buffer_polygon_from_linestring_iterative(
+        path, width
+    )
+    result = {
+        "vertices": len(path),
+        "iterative": time_function(
+            polygon_tools.generate_buffer_polygon_from_linestring_iterative,
+            path,
+            width,
+            repeat=repeat,
+        ),
+    }
+    for mode in [polygon_tools.BUFFER_GEODESIC, polygon_tools.BUFFER_PROJECTED]:
+        polygon = polygon_tools.generate_buffer_polygon_from_linestring(
+            path, width, mode
+        )
+        result[mode] = time_function(
+            polygon_tools.generate_buffer_polygon_from_linestring,
+            path,
+            width,
+            mode,
+            repeat=repeat,
+        )
+        result[f"{mode}_difference"] = get_polygon_difference(polygon, reference)
+    return result
+
+
+def format_result(name: str, result: dict) -> str:
+    """Format a benchmark result as one line"""
+    return (
+        f"{name}: {result['vertices']} -> {result['compressed']} vertices, "
+        f"iterative {result['iterative'] * 1000:.2f} ms, vectorized {result['vectorized'] * 1000:.2f} ms, "
+        f"{result['speedup']:.1f}x, identical: {result['identical']}"
+    )
+
+
+def main():
+    args = parse_arguments()
+
+    paths = {}
+    if args.inputFile:
+        with open(args.inputFile) as f:
+            features = json.load(f).get("features", [])
+        for index, feature in enumerate(features):
+            if feature.get("geometry", {}).get("type") == "LineString":
+                paths[f"{args.inputFile}[{index}]"] = feature["geometry"]["coordinates"]
+    for vertices in args.vertices:
+        paths[f"synthetic {vertices}"] = generate_path(vertices)
+
+    for name, path in paths.items():
+        print(format_result(name, benchmark_compression(path, args.repeat)))
+        for report in compare_simplification(path, args.maxDeviation):
+            print(
+                f"  {report['method']} ({args.maxDeviation} m): {report['vertices']} vertices, "
+                f"{report['removed_vertices']} removed, max deviation {report['max_deviation']} m, {report['time'] * 1000:.2f} ms"
+            )
+        buffer = benchmark_buffer(path, args.bufferWidth, args.repeat)
+        print(
+            f"  buffer ({args.bufferWidth} m): iterative {buffer['iterative'] * 1000:.2f} ms, "
+            f"geodesic {buffer['geodesic'] * 1000:.2f} ms ({buffer['iterative'] / buffer['geodesic']:.1f}x, {buffer['geodesic_difference']:.2g} m from iterative), "
+            f"projected {buffer['projected'] * 1000:.2f} ms ({buffer['iterative'] / buffer['projected']:.1f}x, {buffer['projected_difference']:.2g} m from iterative)"
+        )
+
+
+# parse script command line arguments
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments for the geometry benchmark
+
+    Returns:
+        argparse.Namespace: parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark geometry processing (path compression, simplification and buffer polygons)"
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"{PROGRAM_NAME} {PROGRAM_VERSION}"
+    )
+    parser.add_argument(
+        "--inputFile",
+        default=None,
+        help="GeoJSON file, each LineString feature is benchmarked",
+    )
+    parser.add_argument(
+        "--vertices",
+        type=int,
+        nargs="*",
+        default=DEFAULT_VERTICES,
+        help="vertices of synthetic paths to benchmark",
+    )
+    parser.add_argument(
+        "--maxDeviation",
+        type=float,
+        default=geometry_simplification.DEFAULT_MAX_DEVIATION,
+        help="maximum deviation of simplified paths, in meters",
+    )
+    parser.add_argument(
+        "--bufferWidth",
+        type=float,
+        default=DEFAULT_BUFFER_WIDTH,
+        help="width of buffer polygons, in meters",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="runs of each implementation, the best run is reported",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import logging
+import math
+from typing import Callable
+
+import numpy as np
+import shapely
+
+from . import path_history_compression
+from .linear_referencing import METERS_PER_DEGREE_LATITUDE
+
+METHOD_J2945 = "j2945"
+METHOD_DOUGLAS_PEUCKER = "douglas-peucker"
+DEFAULT_METHOD = METHOD_J2945
+DEFAULT_MAX_DEVIATION = path_history_compression.ALLOWABLE_ERROR  # meters
+
+
+def simplify_j2945(path: list[list[float]], maxDeviation: float) -> list[list[float]]:
+    """Simplify a path with SAE J2945/1 Design Method One, see `path_history_compression.generate_compressed_path`"""
+    return path_history_compression.generate_compressed_path(path, maxDeviation)
+
+
+def simplify_douglas_peucker(
+    path: list[list[float]], maxDeviation: float
+) -> list[list[float]]:
+    """Simplify a path with the Douglas-Peucker algorithm (GEOS), in planar coordinates, so the tolerance is a ground distance.
+    Unlike J2945/1, no point of the original path is further than maxDeviation from the simplified path.
+
+    Args:
+        path (list[list[float]]): Path, as Linestring of long/lat points
+        maxDeviation (float): Maximum distance of a removed point from the simplified path (meters)
+
+    Returns:
+        list[list[float]]: Simplified path, a subset of the original points
+    """
+    if len(path) <= 2:
+        return path
+    planar = project_path(path)
+    simplified = shapely.simplify(
+        shapely.linestrings(planar), maxDeviation, preserve_topology=False
+    )
+    # Map the kept vertices back to the original points, to return them unchanged (including any elevation)
+    kept = shapely.get_coordinates(simplified)
+    simplifiedPath = []
+    keptIndex = 0
+    for index, point in enumerate(path):
+        if keptIndex < len(kept) and (planar[index] == kept[keptIndex]).all():
+            simplifiedPath.append(point)
+            keptIndex += 1
+        elif index == 0 or index == len(path) - 1:
+            simplifiedPath.append(point)
+    return simplifiedPath
+
+
+SIMPLIFICATION_METHODS: dict[
+    str, Callable[[list[list[float]], float], list[list[float]]]
+] = {
+    METHOD_J2945: simplify_j2945,
+    METHOD_DOUGLAS_PEUCKER: simplify_douglas_peucker,
+}
+
+
+def register_method(
+    name: str, method: Callable[[list[list[float]], float], list[list[float]]]
+):
+    """Register a simplification method, selectable by name in `simplify_path`
+
+    Args:
+        name (str): Method name
+        method ((path, maxDeviation) => list[list[float]]): Function simplifying a long/lat path, with a maximum deviation in meters
+    """
+    SIMPLIFICATION_METHODS[name] = method
+
+
+def get_method(
+    method: str,
+) -> Callable[[list[list[float]], float], list[list[float]]]:
+    """Get a simplification method by name
+
+    Args:
+        method (str): Method name, see SIMPLIFICATION_METHODS
+
+    Raises:
+        ValueError: on an unknown method
+
+    Returns:
+        (path, maxDeviation) => list[list[float]]: Simplification function
+    """
+    if method not in SIMPLIFICATION_METHODS:
+        raise ValueError(
+            f"Unknown simplification method: {method}, expected one of {list(SIMPLIFICATION_METHODS)}"
+        )
+    return SIMPLIFICATION_METHODS[method]
+
+
+def project_path(path: list[list[float]]) -> np.ndarray:
+    """Project a long/lat path to local planar (equirectangular) coordinates in meters, accurate for route length paths
+
+    Args:
+        path (list[list[float]]): Path, as Linestring of long/lat points
+
+    Returns:
+        np.ndarray: n x 2 array of x/y points (meters)
+    """
+    coordinates = np.array([[point[0], point[1]] for point in path], dtype=float)
+    lngScale = math.cos(math.radians(float(np.mean(coordinates[:, 1]))))
+    return coordinates * [
+        METERS_PER_DEGREE_LATITUDE * lngScale,
+        METERS_PER_DEGREE_LATITUDE,
+    ]
+
+
+def get_max_deviation(path: list[list[float]], simplified: list[list[float]]) -> float:
+    """Get the largest distance of a point of the original path from the simplified path, in meters
+
+    Args:
+        path (list[list[float]]): Original path, as Linestring of long/lat points
+        simplified (list[list[float]]): Simplified path
+
+    Returns:
+        float: Maximum deviation (meters)
+    """
+    if len(path) < 2 or len(simplified) < 2:
+        return 0.0
+    planar = project_path(list(path) + list(simplified))
+    points, vertices = planar[: len(path)], planar[len(path) :]
+
+    # A simplified path is usually a subset of the original points, then each removed point is measured against the
+    # segment between the kept points around it
+    segments = np.empty(len(path), dtype=int)
+    keptIndex = 0
+    for index, point in enumerate(path):
+        if keptIndex < len(simplified) and point == simplified[keptIndex]:
+            keptIndex += 1
+        segments[index] = min(max(keptIndex - 1, 0), len(simplified) - 2)
+    if keptIndex < len(simplified):
+        return float(
+            shapely.distance(
+                shapely.points(points), shapely.linestrings(vertices)
+            ).max()
+        )
+
+    starts, ends = vertices[segments], vertices[segments + 1]
+    directions = ends - starts
+    lengths = np.einsum("ij,ij->i", directions, directions)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fractions = np.einsum("ij,ij->i", points - starts, directions) / lengths
+    fractions = np.clip(np.nan_to_num(fractions), 0, 1)
+    closest = starts + fractions[:, np.newaxis] * directions
+    return float(np.hypot(*(points - closest).T).max())
+
+
+class SimplificationResult:
+    """Simplified path, with a report of the vertices removed and the resulting deviation from the original path"""
+
+    def __init__(
+        self,
+        coordinates: list[list[float]],
+        method: str,
+        originalVertices: int,
+        maxDeviation: float,
+    ):
+        self.coordinates = coordinates
+        self.method = method
+        self.originalVertices = originalVertices
+        self.vertices = len(coordinates)
+        self.maxDeviation = maxDeviation
+
+    @property
+    def removedVertices(self) -> int:
+        return self.originalVertices - self.vertices
+
+    def report(self) -> dict:
+        """Get the result as a JSON serializable report"""
+        return {
+            "method": self.method,
+            "original_vertices": self.originalVertices,
+            "vertices": self.vertices,
+            "removed_vertices": self.removedVertices,
+            "max_deviation": round(self.maxDeviation, 2),
+        }
+
+
+def simplify(
+    path: list[list[float]],
+    method: str = DEFAULT_METHOD,
+    maxDeviation: float = DEFAULT_MAX_DEVIATION,
+) -> SimplificationResult:
+    """Simplify a long/lat path, and measure the vertices removed and the actual deviation from the original path
+
+    Args:
+        path (list[list[float]]): Path, as Linestring of long/lat points
+        method (str, optional): Simplification method, see SIMPLIFICATION_METHODS. Defaults to DEFAULT_METHOD.
+        maxDeviation (float, optional): Maximum deviation (meters). Defaults to DEFAULT_MAX_DEVIATION.
+
+    Raises:
+        ValueError: on an unknown method
+
+    Returns:
+        SimplificationResult: Simplified path and report
+    """
+    simplified = get_method(method)(path, maxDeviation)
+    return SimplificationResult(
+        simplified, method, len(path), get_max_deviation(path, simplified)
+    )
+
+
+def simplify_path(
+    path: list[list[float]],
+    method: str = DEFAULT_METHOD,
+    maxDeviation: float = DEFAULT_MAX_DEVIATION,
+) -> list[list[float]]:
+    """Simplify a long/lat path, logging the vertices removed. Used for compressed route geometry, see
+    `GeospatialApi.get_route_between_measures`
+
+    Args:
+        path (list[list[float]]): Path, as Linestring of long/lat points
+        method (str, optional): Simplification method, see SIMPLIFICATION_METHODS. Defaults to DEFAULT_METHOD.
+        maxDeviation (float, optional): Maximum deviation (meters). Defaults to DEFAULT_MAX_DEVIATION.
+
+    Raises:
+        ValueError: on an unknown method
+
+    Returns:
+        list[list[float]]: Simplified path
+    """
+    if not path:
+        return path
+    simplified = get_method(method)(path, maxDeviation)
+    logging.debug(
+        f"Simplified path with {method}, max deviation {maxDeviation} m: {len(path)} -> {len(simplified)} vertices"
+    )
+    return simplified
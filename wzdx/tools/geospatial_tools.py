@@ -1,9 +1,14 @@
 import math
 
+import numpy as np
 import pyproj
 
 from wzdx.models.enums import Direction
 
+EARTH_RADIUS = 6371.0 * 1000  # meters, spherical model of getDist and getEndPoint
+
+# Shared geodesic calculator (WGS84), creating a pyproj.Geod is much slower than using one
+GEOD = pyproj.Geod(ellps="WGS84")
 
 # Helper mappings for road directions and orientations
 ROAD_ORIENTATIONS_MAP = {
@@ -71,15 +76,76 @@ def get_heading_from_coordinates(coordinates: list[list[float]]) -> float:
     if not coordinates or type(coordinates) is not list or len(coordinates) < 2:
         return None
 
-    geodesic_pyproj = pyproj.Geod(ellps="WGS84")
-
-    fwd_heading, _, __ = geodesic_pyproj.inv(
+    # Single pair on the shared Geod, a NumPy round trip costs more than the calculation, see `get_headings`
+    fwd_heading, _, __ = GEOD.inv(
         coordinates[0][0], coordinates[0][1], coordinates[1][0], coordinates[1][1]
     )
 
     return fwd_heading % 360
 
 
+def _to_points(points) -> np.ndarray:
+    """Convert a long/lat point or a list of long/lat points to a float array, dropping any elevation"""
+    return np.asarray(points, dtype=float)[..., :2]
+
+
+def get_headings(origins, destinations) -> np.ndarray:
+    """Return the forward (geodesic) headings from long/lat origins to destinations, in one calculation
+
+    Args:
+        origins (array-like): long/lat point, or n x 2 long/lat points
+        destinations (array-like): long/lat point, or n x 2 long/lat points. A single point is broadcast against all origins, and vice versa
+
+    Returns:
+        np.ndarray: headings (degrees, 0-360)
+    """
+    origins, destinations = np.broadcast_arrays(
+        _to_points(origins), _to_points(destinations)
+    )
+    fwd_headings, _, __ = GEOD.inv(
+        origins[..., 0], origins[..., 1], destinations[..., 0], destinations[..., 1]
+    )
+    return np.asarray(fwd_headings) % 360
+
+
+def get_geodesic_distances(origins, destinations) -> np.ndarray:
+    """Return the geodesic (WGS84) distances between long/lat origins and destinations, in one calculation
+
+    Args:
+        origins (array-like): long/lat point, or n x 2 long/lat points
+        destinations (array-like): long/lat point, or n x 2 long/lat points, broadcast against origins
+
+    Returns:
+        np.ndarray: distances (meters)
+    """
+    origins, destinations = np.broadcast_arrays(
+        _to_points(origins), _to_points(destinations)
+    )
+    _, __, distances = GEOD.inv(
+        origins[..., 0], origins[..., 1], destinations[..., 0], destinations[..., 1]
+    )
+    return np.asarray(distances)
+
+
+def get_geodesic_end_points(origins, bearings, distances) -> np.ndarray:
+    """Return the (geodesic, WGS84) destination points at a bearing and distance from long/lat origins, in one calculation
+
+    Args:
+        origins (array-like): long/lat point, or n x 2 long/lat points
+        bearings (array-like): destination directions (degrees)
+        distances (array-like): destination distances (meters)
+
+    Returns:
+        np.ndarray: long/lat destination points, broadcast shape of the arguments
+    """
+    origins = _to_points(origins)
+    lons, lats, bearings, distances = np.broadcast_arrays(
+        origins[..., 0], origins[..., 1], bearings, distances
+    )
+    end_lons, end_lats, _ = GEOD.fwd(lons, lats, bearings, distances)
+    return np.stack([end_lons, end_lats], axis=-1)
+
+
 # This method is very condensed
 def get_closest_direction_from_bearing(
     bearing: float,
@@ -119,21 +185,35 @@ def getEndPoint(
      Returns:
          tuple[float, float]: lat/long of the destination point
     """
-    R = 6371.0 * 1000  # Radius of the Earth in meters
-    brng = math.radians(bearing)  # convert degrees to radians
-    lat1 = math.radians(lat1)  # Current lat point converted to radians
-    lon1 = math.radians(lon1)  # Current long point converted to radians
-    lat2 = math.asin(
-        math.sin(lat1) * math.cos(d / R)
-        + math.cos(lat1) * math.sin(d / R) * math.cos(brng)
+    lon2, lat2 = get_end_points([lon1, lat1], bearing, d)
+    return float(lat2), float(lon2)
+
+
+def get_end_points(origins, bearings, distances) -> np.ndarray:
+    """Vectorized `getEndPoint`, the destination points at a bearing and distance from long/lat origins on a spherical earth
+
+    Args:
+        origins (array-like): long/lat point, or n x 2 long/lat points
+        bearings (array-like): destination directions (degrees)
+        distances (array-like): destination distances (meters)
+
+    Returns:
+        np.ndarray: long/lat destination points, broadcast shape of the arguments
+    """
+    origins = _to_points(origins)
+    brng = np.radians(bearings)
+    lat1 = np.radians(origins[..., 1])
+    lon1 = np.radians(origins[..., 0])
+    angularDistances = np.asarray(distances, dtype=float) / EARTH_RADIUS
+    lat2 = np.arcsin(
+        np.sin(lat1) * np.cos(angularDistances)
+        + np.cos(lat1) * np.sin(angularDistances) * np.cos(brng)
     )
-    lon2 = lon1 + math.atan2(
-        math.sin(brng) * math.sin(d / R) * math.cos(lat1),
-        math.cos(d / R) - math.sin(lat1) * math.sin(lat2),
+    lon2 = lon1 + np.arctan2(
+        np.sin(brng) * np.sin(angularDistances) * np.cos(lat1),
+        np.cos(angularDistances) - np.sin(lat1) * np.sin(lat2),
     )
-    lat2 = math.degrees(lat2)
-    lon2 = math.degrees(lon2)
-    return lat2, lon2
+    return np.stack(np.broadcast_arrays(np.degrees(lon2), np.degrees(lat2)), axis=-1)
 
 
 ###
@@ -150,17 +230,28 @@ def getDist(origin: tuple[float, float], destination: tuple[float, float]) -> fl
     Returns:
         float: distance between the two points in meters
     """
-    lon1, lat1 = origin  # lon/lat of origin
-    lon2, lat2 = destination  # lon/lat of dest
-    radius = 6371.0 * 1000  # meters
+    return float(get_distances(origin, destination))
+
 
-    dLat = math.radians(lat2 - lat1)  # in radians
-    dLon = math.radians(lon2 - lon1)
+def get_distances(origins, destinations) -> np.ndarray:
+    """Vectorized `getDist`, the (haversine) distances between long/lat origins and destinations on a spherical earth
 
-    a = math.sin(dLat / 2) * math.sin(dLat / 2) + math.cos(
-        math.radians(lat1)
-    ) * math.cos(math.radians(lat2)) * math.sin(dLon / 2) * math.sin(dLon / 2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    d = radius * c
+    Args:
+        origins (array-like): long/lat point, or n x 2 long/lat points
+        destinations (array-like): long/lat point, or n x 2 long/lat points, broadcast against origins
 
-    return d
+    Returns:
+        np.ndarray: distances (meters)
+    """
+    origins, destinations = _to_points(origins), _to_points(destinations)
+    lon1, lat1 = origins[..., 0], origins[..., 1]
+    lon2, lat2 = destinations[..., 0], destinations[..., 1]
+
+    dLat = np.radians(lat2 - lat1)  # in radians
+    dLon = np.radians(lon2 - lon1)
+
+    a = np.sin(dLat / 2) * np.sin(dLat / 2) + np.cos(np.radians(lat1)) * np.cos(
+        np.radians(lat2)
+    ) * np.sin(dLon / 2) * np.sin(dLon / 2)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS * c
@@ -0,0 +1,860 @@
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .linear_referencing import METERS_PER_DEGREE_LATITUDE, MeasuredLine
+
+DAY = 24 * 60 * 60
+
+# GIS route geometry rarely changes, so responses are kept for a long time. The list of routes changes more often (new
+# and retired routes), so it is refreshed daily.
+DEFAULT_ENDPOINT_TTLS = {
+    "ROUTES": DAY,
+    "ROUTE": 30 * DAY,
+    "MeasureAtPoint": 30 * DAY,
+    "PointAtMeasure": 30 * DAY,
+    "RouteBetweenMeasures": 30 * DAY,
+}
+DEFAULT_TTL = 7 * DAY  # seconds, for endpoints not in DEFAULT_ENDPOINT_TTLS
+DEFAULT_MAX_ENTRIES = 100000
+EVICTION_INTERVAL = 1000  # inserts between size checks, at most 1% of maxEntries
+
+
+def get_endpoint(url: str) -> str:
+    """Get the GIS endpoint name (last path segment) of a request url, e.g. MeasureAtPoint
+
+    Args:
+        url (str): Request url
+
+    Returns:
+        str: Endpoint name
+    """
+    return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+
+class SqliteRequestCache:
+    """Persistent GIS response cache, stored in a SQLite database. Safe to share between threads and processes.
+
+    Plugs into the `GeospatialApi` cache hooks:
+
+        cache = SqliteRequestCache("gis_cache.sqlite")
+        api = GeospatialApi(getCachedRequest=cache.get, setCachedRequest=cache.set)
+
+    Entries expire after a per-endpoint TTL, and the least recently used entries are evicted once the cache holds more than maxEntries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        endpointTtls: dict[str, float] = None,
+        defaultTtl: float = DEFAULT_TTL,
+        maxEntries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """Initialize the cache, creating the database if it does not exist
+
+        Args:
+            path (str): SQLite database file path
+            endpointTtls (dict[str, float], optional): Time to live in seconds, keyed by endpoint name. Defaults to DEFAULT_ENDPOINT_TTLS.
+            defaultTtl (float, optional): Time to live in seconds for endpoints not in endpointTtls. Defaults to DEFAULT_TTL.
+            maxEntries (int, optional): Maximum number of cached responses, before least recently used entries are evicted. Defaults to DEFAULT_MAX_ENTRIES.
+        """
+        self.path = path
+        self.endpointTtls = (
+            endpointTtls if endpointTtls is not None else DEFAULT_ENDPOINT_TTLS
+        )
+        self.defaultTtl = defaultTtl
+        self.maxEntries = maxEntries
+        self.evictionInterval = max(1, min(EVICTION_INTERVAL, maxEntries // 100))
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._insertsSinceEviction = 0
+
+        with self._connection() as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )""")
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the SQLite connection for the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get_ttl(self, url: str) -> float:
+        """Get the time to live of a request url, in seconds"""
+        return self.endpointTtls.get(get_endpoint(url), self.defaultTtl)
+
+    def get(self, url: str) -> str | None:
+        """Get a cached response, see `GeospatialApi.getCachedRequest`
+
+        Args:
+            url (str): Request url
+
+        Returns:
+            str | None: Cached response, or None if missing or expired
+        """
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT response, created FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None or now - row[1] > self.get_ttl(url):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with connection:
+            connection.execute(
+                "UPDATE responses SET accessed = ? WHERE url = ?", (now, url)
+            )
+        with self._lock:
+            self.hits += 1
+        return row[0]
+
+    def set(self, url: str, response: str):
+        """Cache a response, see `GeospatialApi.setCachedRequest`. Empty and error responses are not cached.
+
+        Args:
+            url (str): Request url
+            response (str): Response to cache
+        """
+        if not response or is_error_response(response):
+            return
+        self._insert([(url, response)])
+
+    def _insert(self, items: list[tuple[str, str]]):
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO responses (url, endpoint, response, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (url, get_endpoint(url), response, now, now)
+                    for url, response in items
+                ],
+            )
+            self._evict(connection, len(items))
+
+    def _evict(self, connection: sqlite3.Connection, inserted: int):
+        """Delete the least recently used entries above maxEntries. Counting the entries scans the whole table, so it is only
+        done when the rowid range (an upper bound of the count, read from both ends of the table) exceeds maxEntries, and then at most
+        once every evictionInterval inserts. The cache may exceed maxEntries by up to evictionInterval entries in between.
+        """
+        with self._lock:
+            self._insertsSinceEviction += inserted
+            if self._insertsSinceEviction < self.evictionInterval:
+                return
+            self._insertsSinceEviction = 0
+        rowidRange = connection.execute(
+            "SELECT (SELECT max(rowid) FROM responses) - (SELECT min(rowid) FROM responses) + 1"
+        ).fetchone()[0]
+        if not rowidRange or rowidRange <= self.maxEntries:
+            return
+        count = connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.maxEntries:
+            connection.execute(
+                "DELETE FROM responses WHERE url IN (SELECT url FROM responses ORDER BY accessed ASC LIMIT ?)",
+                (count - self.maxEntries,),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries
+
+        Returns:
+            int: Number of deleted entries
+        """
+        now = time.time()
+        connection = self._connection()
+        deleted = 0
+        with connection:
+            endpoints = [
+                row[0]
+                for row in connection.execute("SELECT DISTINCT endpoint FROM responses")
+            ]
+            for endpoint in endpoints:
+                ttl = self.endpointTtls.get(endpoint, self.defaultTtl)
+                deleted += connection.execute(
+                    "DELETE FROM responses WHERE endpoint = ? AND created < ?",
+                    (endpoint, now - ttl),
+                ).rowcount
+        return deleted
+
+    def clear(self):
+        """Delete all entries and reset hit/miss counters"""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM responses")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return (
+            self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        )
+
+    def get_stats(self) -> dict:
+        """Get cache statistics
+
+        Returns:
+            dict: entries, hits, misses, hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def import_from_file(self, path: str) -> int:
+        """Warm the cache from a file of recorded responses. Supports a JSON object of {url: response}, or newline delimited JSON of {"url": url, "response": response}.
+        Imported entries are stamped with the current time, so they expire as if they were just requested.
+
+        Args:
+            path (str): File path
+
+        Returns:
+            int: Number of imported responses
+        """
+        items = [
+            (url, response)
+            for url, response in read_recorded_responses(path)
+            if response
+        ]
+        self._insert(items)
+        logging.info(f"Imported {len(items)} GIS responses from {path}")
+        return len(items)
+
+    def export_to_file(self, path: str) -> int:
+        """Write all unexpired entries to a newline delimited JSON file, for use with `import_from_file`
+
+        Args:
+            path (str): File path
+
+        Returns:
+            int: Number of exported responses
+        """
+        now = time.time()
+        count = 0
+        tempPath = f"{path}.tmp"
+        with open(tempPath, "w", encoding="utf-8") as f:
+            for url, response, created in self._connection().execute(
+                "SELECT url, response, created FROM responses ORDER BY url"
+            ):
+                if now - created > self.get_ttl(url):
+                    continue
+                f.write(json.dumps({"url": url, "response": response}) + "\n")
+                count += 1
+        os.replace(tempPath, path)
+        return count
+
+    def close(self):
+        """Close the SQLite connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def read_recorded_responses(path: str) -> list[tuple[str, str]]:
+    """Read a file of recorded GIS responses, a JSON object of {url: response}, or newline delimited JSON of
+    {"url": url, "response": response}. See `SqliteRequestCache.export_to_file`
+
+    Args:
+        path (str): File path
+
+    Returns:
+        list[tuple[str, str]]: Request urls and response strings, in file order
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        contents = f.read()
+
+    try:
+        obj = json.loads(contents)
+        items = list(obj.items()) if isinstance(obj, dict) else None
+        # A single line of newline delimited JSON
+        if isinstance(obj, dict) and set(obj) == {"url", "response"}:
+            items = [(obj["url"], obj["response"])]
+    except json.JSONDecodeError:
+        items = None
+    if items is None:
+        items = []
+        for line in contents.splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                items.append((entry["url"], entry["response"]))
+
+    return [
+        (url, response if isinstance(response, str) else json.dumps(response))
+        for url, response in items
+    ]
+
+
+def is_error_response(response: str) -> bool:
+    """Check whether a GIS server response is an error, which should not be cached
+
+    Args:
+        response (str): Response string
+
+    Returns:
+        bool: True if the response is not valid JSON, or is a JSON error object
+    """
+    try:
+        obj = json.loads(response)
+    except (TypeError, ValueError):
+        return True
+    return isinstance(obj, dict) and "error" in obj
+
+
+DEFAULT_GRID_METERS = 1.0
+DEFAULT_MEMO_MAX_ENTRIES = 10000
+DEFAULT_MEMO_TTL = DAY
+
+
+class RouteMeasureMemo:
+    """In-memory LRU memo for `GeospatialApi.get_route_and_measure`, keyed by coordinates snapped to a grid. Points which only
+    differ by GPS noise (e.g. a stationary arrow board or repeated AVL positions) share one GIS lookup.
+
+    Thread-safe, with a bounded number of entries and an optional maximum age.
+    """
+
+    def __init__(
+        self,
+        gridMeters: float = DEFAULT_GRID_METERS,
+        maxEntries: int = DEFAULT_MEMO_MAX_ENTRIES,
+        ttl: float = DEFAULT_MEMO_TTL,
+    ):
+        """Initialize the memo
+
+        Args:
+            gridMeters (float, optional): Grid size used to quantize coordinates and tolerance, in meters. Defaults to DEFAULT_GRID_METERS.
+            maxEntries (int, optional): Maximum number of memoized lookups, before least recently used entries are evicted. Defaults to DEFAULT_MEMO_MAX_ENTRIES.
+            ttl (float, optional): Maximum age of memoized lookups in seconds, None to keep forever. Defaults to DEFAULT_MEMO_TTL.
+        """
+        self.gridMeters = gridMeters
+        self.maxEntries = maxEntries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[float, dict | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_key(
+        self, latLng: tuple[float, float], heading: float = None, tolerance: int = 10000
+    ) -> tuple:
+        """Get the quantized memo key of a route and measure lookup
+
+        Args:
+            latLng (tuple[float, float]): Lat/long coordinates
+            heading (float, optional): Heading of object, rounded to the nearest degree. Defaults to None.
+            tolerance (int, optional): Tolerance in meters. Defaults to 10000.
+
+        Returns:
+            tuple: Memo key
+        """
+        lat, lng = latLng
+        latStep = self.gridMeters / METERS_PER_DEGREE_LATITUDE
+        latIndex = round(lat / latStep)
+        lngStep = latStep / max(math.cos(math.radians(latIndex * latStep)), 1e-6)
+        return (
+            latIndex,
+            round(lng / lngStep),
+            round(heading) % 360 if heading else None,
+            round(tolerance / self.gridMeters),
+        )
+
+    def get(
+        self, latLng: tuple[float, float], heading: float = None, tolerance: int = 10000
+    ) -> tuple[bool, dict | None]:
+        """Get a memoized lookup
+
+        Args:
+            latLng (tuple[float, float]): Lat/long coordinates
+            heading (float, optional): Heading of object. Defaults to None.
+            tolerance (int, optional): Tolerance in meters. Defaults to 10000.
+
+        Returns:
+            tuple[bool, dict | None]: Whether the lookup was memoized, and a copy of the route details
+        """
+        key = self.get_key(latLng, heading, tolerance)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                self.ttl is None or time.time() - entry[0] <= self.ttl
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, dict(entry[1]) if entry[1] is not None else None
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(
+        self,
+        latLng: tuple[float, float],
+        heading: float,
+        tolerance: int,
+        route_details: dict | None,
+    ):
+        """Memoize a lookup. Failed lookups (None) are not memoized, so they are retried.
+
+        Args:
+            latLng (tuple[float, float]): Lat/long coordinates
+            heading (float): Heading of object
+            tolerance (int): Tolerance in meters
+            route_details (dict | None): Route details returned by the lookup
+        """
+        if route_details is None:
+            return
+        key = self.get_key(latLng, heading, tolerance)
+        with self._lock:
+            self._entries[key] = (time.time(), dict(route_details))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxEntries:
+                self._entries.popitem(last=False)
+
+    def get_or_lookup(
+        self,
+        latLng: tuple[float, float],
+        heading: float,
+        tolerance: int,
+        lookup: Callable[[], dict | None],
+    ) -> dict | None:
+        """Get a memoized lookup, or run and memoize the lookup on a miss
+
+        Args:
+            latLng (tuple[float, float]): Lat/long coordinates
+            heading (float): Heading of object
+            tolerance (int): Tolerance in meters
+            lookup (() => dict | None): Route and measure lookup to run on a miss
+
+        Returns:
+            dict | None: Route details
+        """
+        found, route_details = self.get(latLng, heading, tolerance)
+        if found:
+            return route_details
+        route_details = lookup()
+        self.set(latLng, heading, tolerance, route_details)
+        return route_details
+
+    def clear(self):
+        """Delete all memoized lookups and reset hit/miss counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Get memo statistics
+
+        Returns:
+            dict: entries, hits, misses, hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+DEFAULT_PARSED_MAX_ENTRIES = 5000
+
+
+class ParsedResponseCache:
+    """In-memory LRU cache of parsed GIS results (route details, points and linestrings), keyed by request url. Cache hits skip
+    the request cache hooks and `json.loads` entirely.
+
+    Results are stored frozen (read-only mappings, tuples and read-only float arrays for linestrings), and every `get` returns a
+    new copy, so callers can't modify the cached result.
+    """
+
+    def __init__(self, maxEntries: int = DEFAULT_PARSED_MAX_ENTRIES):
+        """Initialize the cache
+
+        Args:
+            maxEntries (int, optional): Maximum number of cached results, before least recently used entries are evicted. Defaults to DEFAULT_PARSED_MAX_ENTRIES.
+        """
+        self.maxEntries = maxEntries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> tuple[bool, Any]:
+        """Get a cached result
+
+        Args:
+            url (str): Request url
+
+        Returns:
+            tuple[bool, Any]: Whether the result was cached, and a copy of the result
+        """
+        with self._lock:
+            if url not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            value = self._entries[url]
+        return True, thaw(value)
+
+    def set(self, url: str, value: Any):
+        """Cache a result. None (failed requests) is not cached.
+
+        Args:
+            url (str): Request url
+            value (Any): Parsed result
+        """
+        if value is None:
+            return
+        value = freeze(value)
+        with self._lock:
+            self._entries[url] = value
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxEntries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Delete all cached results and reset hit/miss counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics
+
+        Returns:
+            dict: entries, hits, misses, hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def freeze(value: Any) -> Any:
+    """Convert a parsed GIS result to an immutable form, see `thaw`
+
+    Args:
+        value (Any): dict, tuple, linestring (list of coordinate lists) or list of dicts
+
+    Returns:
+        Any: Read-only mapping, tuple, read-only float array (n, 2) or tuple of read-only mappings
+    """
+    if isinstance(value, dict):
+        return MappingProxyType(dict(value))
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            return tuple(MappingProxyType(dict(item)) for item in value)
+        try:
+            array = np.array(value, dtype=float)
+        except ValueError:
+            # Mixed 2D/3D coordinates
+            return tuple(tuple(coordinate) for coordinate in value)
+        array.flags.writeable = False
+        return array
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Convert a frozen GIS result back to a new, mutable copy of the original, see `freeze`"""
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, tuple) and value and isinstance(value[0], MappingProxyType):
+        return [dict(item) for item in value]
+    if isinstance(value, tuple) and value and isinstance(value[0], tuple):
+        return [list(item) for item in value]
+    return value
+
+
+DEFAULT_MAX_ROUTE_PROFILES = 64
+DEFAULT_FAILED_LOAD_TTL = 300  # seconds before a failed route load is retried
+
+
+class RouteProfileCache:
+    """In-memory LRU cache of full route geometry with measures (route profiles), keyed by GIS server and route ID. Route
+    bearings at any measure are computed locally from a profile, see `GeospatialApi.get_route_profile`.
+    """
+
+    def __init__(
+        self,
+        maxRoutes: int = DEFAULT_MAX_ROUTE_PROFILES,
+        failedLoadTtl: float = DEFAULT_FAILED_LOAD_TTL,
+        clock=time.monotonic,
+    ):
+        """Initialize the cache
+
+        Args:
+            maxRoutes (int, optional): Maximum number of cached route profiles, before least recently used profiles are evicted. Defaults to DEFAULT_MAX_ROUTE_PROFILES.
+            failedLoadTtl (float, optional): Seconds a failed load is remembered, so the route is not requested again for every event on it. Defaults to DEFAULT_FAILED_LOAD_TTL.
+            clock (() => float, optional): Monotonic clock. Defaults to time.monotonic.
+        """
+        self.maxRoutes = maxRoutes
+        self.failedLoadTtl = failedLoadTtl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._profiles: OrderedDict[tuple, MeasuredLine] = OrderedDict()
+        self._failures: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(
+        self,
+        baseUrl: str,
+        routeId: str,
+        load: Callable[[], MeasuredLine | None],
+    ) -> MeasuredLine | None:
+        """Get a cached route profile, or load and cache it on a miss. Failed loads (None) are cached for failedLoadTtl seconds.
+
+        Args:
+            baseUrl (str): GIS server base url
+            routeId (str): GIS server route ID
+            load (() => MeasuredLine | None): Route profile loader
+
+        Returns:
+            MeasuredLine | None: Route profile (read-only)
+        """
+        return self._get_or_load((baseUrl, routeId), load)
+
+    def _get_or_load(
+        self, key: tuple, load: Callable[[], MeasuredLine | None]
+    ) -> MeasuredLine | None:
+        found, profile = self.lookup(key)
+        if found:
+            return profile
+        profile = load()
+        self.store(key, profile)
+        return profile
+
+    def lookup(self, key: tuple) -> tuple[bool, MeasuredLine | None]:
+        """Get a cached route profile without loading it, for callers which load outside of the cache (e.g. async clients), see `store`
+
+        Args:
+            key (tuple): Cache key, (baseUrl, routeId) for profiles and (baseUrl, routeId, window) for route windows
+
+        Returns:
+            tuple[bool, MeasuredLine | None]: Whether the key was cached, and the route profile (None for a cached failed load)
+        """
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self.hits += 1
+                return True, profile
+            failedAt = self._failures.get(key)
+            if failedAt is not None and self.clock() - failedAt < self.failedLoadTtl:
+                self.hits += 1
+                return True, None
+            self.misses += 1
+            return False, None
+
+    def store(self, key: tuple, profile: MeasuredLine | None):
+        """Cache a loaded route profile, or a failed load (None), see `lookup`
+
+        Args:
+            key (tuple): Cache key, see `lookup`
+            profile (MeasuredLine | None): Route profile, or None if the load failed
+        """
+        with self._lock:
+            if profile is None:
+                self._failures.pop(key, None)
+                self._failures[key] = self.clock()
+                while len(self._failures) > self.maxRoutes:
+                    self._failures.pop(next(iter(self._failures)))
+                return
+            self._failures.pop(key, None)
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.maxRoutes:
+                self._profiles.popitem(last=False)
+
+    def clear(self):
+        """Delete all route profiles and failed loads, and reset hit/miss counters"""
+        with self._lock:
+            self._profiles.clear()
+            self._failures.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+
+# Route profiles, shared by all GeospatialApi instances in the process which don't configure their own routeProfiles
+ROUTE_PROFILES = RouteProfileCache()
+
+
+DEFAULT_SLICE_WINDOW_MILES = 5.0
+DEFAULT_MAX_SLICE_WINDOWS = 512
+
+
+class RouteSliceCache(RouteProfileCache):
+    """In-memory LRU cache of route geometry in fixed measure windows (e.g. mile 0-5, 5-10, ...), keyed by GIS server, route ID and
+    window. `GeospatialApi.get_route_between_measures` cuts sections of route out of the cached windows locally, so events on the
+    same corridor share the same few GIS requests.
+
+    Windows are loaded with their GIS measures, see `GeospatialApi.get_measured_route`.
+    """
+
+    def __init__(
+        self,
+        windowMiles: float = DEFAULT_SLICE_WINDOW_MILES,
+        maxWindows: int = DEFAULT_MAX_SLICE_WINDOWS,
+        failedLoadTtl: float = DEFAULT_FAILED_LOAD_TTL,
+        maxRoutes: int = DEFAULT_MAX_ROUTE_PROFILES,
+    ):
+        """Initialize the cache
+
+        Args:
+            windowMiles (float, optional): Length of each cached window of route, in miles. Defaults to DEFAULT_SLICE_WINDOW_MILES.
+            maxWindows (int, optional): Maximum number of cached windows, before least recently used windows are evicted. Defaults to DEFAULT_MAX_SLICE_WINDOWS.
+            failedLoadTtl (float, optional): Seconds a failed window load is remembered. Defaults to DEFAULT_FAILED_LOAD_TTL.
+            maxRoutes (int, optional): Maximum number of cached route details, before least recently used route details are evicted. Defaults to DEFAULT_MAX_ROUTE_PROFILES.
+        """
+        super().__init__(maxWindows, failedLoadTtl)
+        self.windowMiles = windowMiles
+        self.maxRouteDetails = maxRoutes
+        self._routeDetails: OrderedDict[tuple[str, str], dict] = OrderedDict()
+
+    def get_or_load_route_details(
+        self, baseUrl: str, routeId: str, load: Callable[[], dict | None]
+    ) -> dict | None:
+        """Get the cached measure range of a route, or load and cache it on a miss. Failed loads (None) are not cached.
+
+        Args:
+            baseUrl (str): GIS server base url
+            routeId (str): GIS server route ID
+            load (() => dict | None): Route details loader, see `GeospatialApi.get_route_details`
+
+        Returns:
+            dict | None: Route details (Route, MMin, MMax)
+        """
+        route_details = self.get_route_details(baseUrl, routeId)
+        if route_details is None:
+            route_details = load()
+            if not route_details:
+                return None
+            self.set_route_details(baseUrl, routeId, route_details)
+        return dict(route_details)
+
+    def get_route_details(self, baseUrl: str, routeId: str) -> dict | None:
+        """Get the cached measure range of a route without loading it, see `get_or_load_route_details`
+
+        Args:
+            baseUrl (str): GIS server base url
+            routeId (str): GIS server route ID
+
+        Returns:
+            dict | None: Copy of the route details (Route, MMin, MMax), or None on a miss
+        """
+        with self._lock:
+            route_details = self._routeDetails.get((baseUrl, routeId))
+            if route_details is not None:
+                self._routeDetails.move_to_end((baseUrl, routeId))
+        return dict(route_details) if route_details is not None else None
+
+    def set_route_details(self, baseUrl: str, routeId: str, route_details: dict):
+        """Cache the measure range of a route, see `get_route_details`
+
+        Args:
+            baseUrl (str): GIS server base url
+            routeId (str): GIS server route ID
+            route_details (dict): Route details (Route, MMin, MMax)
+        """
+        with self._lock:
+            self._routeDetails[(baseUrl, routeId)] = dict(route_details)
+            self._routeDetails.move_to_end((baseUrl, routeId))
+            while len(self._routeDetails) > self.maxRouteDetails:
+                self._routeDetails.popitem(last=False)
+
+    def clear(self):
+        """Delete all windows and route details, and reset hit/miss counters"""
+        super().clear()
+        with self._lock:
+            self._routeDetails.clear()
+
+    def get_windows(
+        self, startMeasure: float, endMeasure: float, mMin: float, mMax: float
+    ) -> list[tuple[int, float, float]]:
+        """Get the windows covering a section of route, in increasing measure order
+
+        Args:
+            startMeasure (float): Lower measure of the section (miles)
+            endMeasure (float): Upper measure of the section (miles)
+            mMin (float): Minimum measure of the route
+            mMax (float): Maximum measure of the route
+
+        Returns:
+            list[tuple[int, float, float]]: Window index, lower measure, upper measure (limited to the route)
+        """
+        first = math.floor(startMeasure / self.windowMiles)
+        last = max(first, math.ceil(endMeasure / self.windowMiles) - 1)
+        return [
+            (
+                window,
+                max(window * self.windowMiles, mMin),
+                min((window + 1) * self.windowMiles, mMax),
+            )
+            for window in range(first, last + 1)
+        ]
+
+    def get_or_load_window(
+        self,
+        baseUrl: str,
+        routeId: str,
+        window: int,
+        load: Callable[[], MeasuredLine | None],
+    ) -> MeasuredLine | None:
+        """Get a cached window of route, or load and cache it on a miss. Failed loads (None) are cached for failedLoadTtl seconds.
+
+        Args:
+            baseUrl (str): GIS server base url
+            routeId (str): GIS server route ID
+            window (int): Window index, see `get_windows`
+            load (() => MeasuredLine | None): Window loader
+
+        Returns:
+            MeasuredLine | None: Window of route (read-only)
+        """
+        return self._get_or_load((baseUrl, routeId, window), load)
@@ -0,0 +1,244 @@
+import math
+import threading
+import time
+
+LATENCY_MIN_SECONDS = 0.0001  # lower bound of the first histogram bucket
+LATENCY_MAX_SECONDS = 600  # upper bound of the last histogram bucket
+LATENCY_BUCKET_GROWTH = 1.05  # 5% wider buckets, ~5% percentile error
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Streaming latency histogram with logarithmic buckets. Memory is constant in the number of recorded values, and
+    percentiles are estimated to within one bucket (LATENCY_BUCKET_GROWTH relative error).
+    """
+
+    def __init__(self):
+        self._logGrowth = math.log(LATENCY_BUCKET_GROWTH)
+        self._bucketCount = (
+            math.ceil(
+                math.log(LATENCY_MAX_SECONDS / LATENCY_MIN_SECONDS) / self._logGrowth
+            )
+            + 1
+        )
+        self.buckets = [0] * self._bucketCount
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket_index(self, seconds: float) -> int:
+        if seconds <= LATENCY_MIN_SECONDS:
+            return 0
+        index = math.ceil(math.log(seconds / LATENCY_MIN_SECONDS) / self._logGrowth)
+        return min(index, self._bucketCount - 1)
+
+    def _bucket_upper_bound(self, index: int) -> float:
+        return LATENCY_MIN_SECONDS * LATENCY_BUCKET_GROWTH**index
+
+    def record(self, seconds: float):
+        """Record one latency value
+
+        Args:
+            seconds (float): Latency, in seconds
+        """
+        self.buckets[self._bucket_index(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Estimate a latency percentile
+
+        Args:
+            percentile (float): Percentile, between 0 and 100
+
+        Returns:
+            float | None: Estimated latency at the percentile (seconds), None if no values have been recorded
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        seen = 0
+        for index, bucketCount in enumerate(self.buckets):
+            seen += bucketCount
+            if seen >= rank:
+                return min(max(self._bucket_upper_bound(index), self.min), self.max)
+        return self.max
+
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+
+class EndpointMetrics:
+    """Counters and latency histogram for one GIS endpoint"""
+
+    def __init__(self):
+        self.requests = 0  # lookups, served from cache or sent to the GIS server (including failed attempts)
+        self.cacheHits = 0
+        self.cacheMisses = 0  # requests sent to the GIS server, successful or not
+        self.errors = 0
+        self.timeouts = 0
+        self.latency = LatencyHistogram()  # GIS server response times
+
+    def snapshot(self, percentiles: tuple[float] = DEFAULT_PERCENTILES) -> dict:
+        """Get the current values of all counters, with latency summary statistics in milliseconds"""
+        latency = {
+            "count": self.latency.count,
+            "mean_ms": _to_milliseconds(self.latency.mean()),
+            "max_ms": _to_milliseconds(self.latency.max),
+        }
+        for percentile in percentiles:
+            latency[f"p{percentile:g}_ms"] = _to_milliseconds(
+                self.latency.percentile(percentile)
+            )
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cacheHits,
+            "cache_misses": self.cacheMisses,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "latency": latency,
+        }
+
+
+def _to_milliseconds(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class GisMetrics:
+    """Bounded, thread-safe request metrics for a `GeospatialApi`: per-endpoint request counts, cache hits/misses,
+    errors, timeouts and streaming latency percentiles.
+
+        api = GeospatialApi(metrics=GisMetrics())
+        ...
+        print(json.dumps(api.metrics.snapshot(), indent=2))
+    """
+
+    def __init__(self):
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def _get_endpoint(self, endpoint: str) -> EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record_cache_hit(self, endpoint: str):
+        """Record a lookup served from a cache, without a GIS server request
+
+        Args:
+            endpoint (str): GIS endpoint name, e.g. MeasureAtPoint
+        """
+        with self._lock:
+            metrics = self._get_endpoint(endpoint)
+            metrics.requests += 1
+            metrics.cacheHits += 1
+
+    def record_request(self, endpoint: str, seconds: float):
+        """Record a completed GIS server request
+
+        Args:
+            endpoint (str): GIS endpoint name, e.g. MeasureAtPoint
+            seconds (float): Response time, in seconds
+        """
+        with self._lock:
+            metrics = self._get_endpoint(endpoint)
+            metrics.requests += 1
+            metrics.cacheMisses += 1
+            metrics.latency.record(seconds)
+
+    def record_error(self, endpoint: str):
+        """Record a failed GIS server request. Each attempt counts as a request, so error rates are relative to all requests
+
+        Args:
+            endpoint (str): GIS endpoint name, e.g. MeasureAtPoint
+        """
+        with self._lock:
+            metrics = self._get_endpoint(endpoint)
+            metrics.requests += 1
+            metrics.cacheMisses += 1
+            metrics.errors += 1
+
+    def record_timeout(self, endpoint: str):
+        """Record a timed out GIS server request. Each attempt counts as a request, so timeout rates are relative to all requests
+
+        Args:
+            endpoint (str): GIS endpoint name, e.g. MeasureAtPoint
+        """
+        with self._lock:
+            metrics = self._get_endpoint(endpoint)
+            metrics.requests += 1
+            metrics.cacheMisses += 1
+            metrics.timeouts += 1
+
+    def snapshot(self, percentiles: tuple[float] = DEFAULT_PERCENTILES) -> dict:
+        """Get a JSON serializable copy of the current metrics
+
+        Args:
+            percentiles (tuple[float], optional): Latency percentiles to include. Defaults to DEFAULT_PERCENTILES (p50, p95, p99).
+
+        Returns:
+            dict: Metrics, with totals and a breakdown by endpoint
+        """
+        with self._lock:
+            endpoints = {
+                endpoint: metrics.snapshot(percentiles)
+                for endpoint, metrics in sorted(self._endpoints.items())
+            }
+        totals = {
+            key: sum(e[key] for e in endpoints.values())
+            for key in ["requests", "cache_hits", "cache_misses", "errors", "timeouts"]
+        }
+        return {
+            "started": self.started,
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "totals": totals,
+            "endpoints": endpoints,
+        }
+
+    def export(
+        self,
+        prefix: str = "wzdx/gis",
+        percentiles: tuple[float] = DEFAULT_PERCENTILES,
+    ) -> list[dict]:
+        """Export the current metrics as flat data points, one per metric and endpoint, ready to be written to a monitoring
+        backend (e.g. as Cloud Monitoring custom metrics)
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to "wzdx/gis".
+            percentiles (tuple[float], optional): Latency percentiles to include. Defaults to DEFAULT_PERCENTILES (p50, p95, p99).
+
+        Returns:
+            list[dict]: Data points, as {"metric": name, "labels": {"endpoint": endpoint}, "value": value}
+        """
+        points = []
+        for endpoint, metrics in self.snapshot(percentiles)["endpoints"].items():
+            values = {k: v for k, v in metrics.items() if k != "latency"}
+            values.update(
+                {
+                    f"latency_{k}": v
+                    for k, v in metrics["latency"].items()
+                    if k != "count"
+                }
+            )
+            for name, value in values.items():
+                if value is None:
+                    continue
+                points.append(
+                    {
+                        "metric": f"{prefix}/{name}",
+                        "labels": {"endpoint": endpoint},
+                        "value": value,
+                    }
+                )
+        return points
+
+    def reset(self):
+        """Clear all recorded metrics"""
+        with self._lock:
+            self._endpoints = {}
+            self.started = time.time()
@@ -0,0 +1,199 @@
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+
+# Request priority lanes, lower values are served first
+PRIORITY_LIVE = 0  # active and pending events, feeding the live WZDx feed
+PRIORITY_PLANNED = 1  # planned and completed events, and untagged requests
+PRIORITY_BACKFILL = 2  # backfills and re-runs
+DEFAULT_PRIORITY = PRIORITY_PLANNED
+
+LIVE_EVENT_STATUSES = ["active", "pending"]
+MIN_ASYNC_POLL = (
+    0.001  # seconds, shortest sleep of an asyncio waiter polling the bucket
+)
+
+_request_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "gis_request_priority", default=DEFAULT_PRIORITY
+)
+
+
+def get_event_priority(event_status: str | None) -> int:
+    """Get the request priority for the GIS lookups of an event
+
+    Args:
+        event_status (str | None): Event status, see `date_tools.get_event_status`
+
+    Returns:
+        int: PRIORITY_LIVE for active and pending events, otherwise PRIORITY_PLANNED
+    """
+    if event_status in LIVE_EVENT_STATUSES:
+        return PRIORITY_LIVE
+    return PRIORITY_PLANNED
+
+
+def get_request_priority() -> int:
+    """Get the priority of GIS requests made in the current context, see `request_priority`"""
+    return _request_priority.get()
+
+
+@contextlib.contextmanager
+def request_priority(priority: int):
+    """Set the priority of the GIS requests made within the block (in this thread or asyncio task)
+
+        with request_priority(get_event_priority(event_status)):
+            route_details = api.get_route_and_measure(latLng)
+
+    Args:
+        priority (int): Request priority, e.g. PRIORITY_LIVE
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket rate limiter with priority lanes. Requests are admitted at up to `rate` per second, with bursts of up
+    to `burst`, and waiting requests are served in priority order (then first come, first served), so live-feed lookups skip ahead of
+    queued planned and backfill lookups without lowering the overall throughput.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = None,
+        clock=time.monotonic,
+    ):
+        """Initialize the rate limiter
+
+        Args:
+            rate (float): Requests per second
+            burst (int, optional): Bucket size, the number of requests which may be sent at once after an idle period. Defaults to max(1, rate).
+            clock (() => float, optional): Monotonic clock. Defaults to time.monotonic.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive, got {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._waiters: list[tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self.waited = 0  # number of requests which had to wait for a token
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = None, timeout: float = None) -> bool:
+        """Wait for a token to send one request
+
+        Args:
+            priority (int, optional): Request priority. Defaults to the priority of the current context, see `request_priority`.
+            timeout (float, optional): Maximum time to wait, in seconds. Defaults to None, wait until a token is available.
+
+        Returns:
+            bool: True if a token was acquired, False on timeout
+        """
+        if priority is None:
+            priority = get_request_priority()
+        deadline = self.clock() + timeout if timeout is not None else None
+
+        with self._condition:
+            ticket = (priority, next(self._counter))
+            heapq.heappush(self._waiters, ticket)
+            waited = False
+            try:
+                while True:
+                    self._refill()
+                    isNext = self._waiters[0] == ticket
+                    if isNext and self._tokens >= 1:
+                        self._tokens -= 1
+                        if waited:
+                            self.waited += 1
+                        return True
+
+                    # Only the first waiter in line watches the bucket, the others wait to be notified
+                    wait = (1 - self._tokens) / self.rate if isNext else None
+                    if deadline is not None:
+                        remaining = deadline - self.clock()
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    waited = True
+                    self._condition.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+    async def acquire_async(self, priority: int = None, timeout: float = None) -> bool:
+        """Wait for a token to send one request, without blocking the event loop or a thread, see `acquire`. Asyncio waiters are
+        queued in the same priority order as threads, and sleep until their turn is estimated to come up
+
+        Args:
+            priority (int, optional): Request priority. Defaults to the priority of the current context, see `request_priority`.
+            timeout (float, optional): Maximum time to wait, in seconds. Defaults to None, wait until a token is available.
+
+        Returns:
+            bool: True if a token was acquired, False on timeout
+        """
+        if priority is None:
+            priority = get_request_priority()
+        deadline = self.clock() + timeout if timeout is not None else None
+
+        with self._condition:
+            ticket = (priority, next(self._counter))
+            heapq.heappush(self._waiters, ticket)
+        waited = False
+        try:
+            while True:
+                with self._condition:
+                    self._refill()
+                    if self._waiters[0] == ticket and self._tokens >= 1:
+                        self._tokens -= 1
+                        if waited:
+                            self.waited += 1
+                        return True
+                    # Every waiter ahead in line takes a token first
+                    ahead = sum(1 for waiter in self._waiters if waiter < ticket)
+                    wait = max((ahead + 1 - self._tokens) / self.rate, MIN_ASYNC_POLL)
+                if deadline is not None:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                waited = True
+                await asyncio.sleep(wait)
+        finally:
+            with self._condition:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+
+def get_rate_limiter_from_env(
+    variable: str = "CDOT_GEOSPATIAL_API_RATE_LIMIT",
+) -> TokenBucketRateLimiter | None:
+    """Create a rate limiter from an environment variable, holding the allowed GIS requests per second
+
+    Args:
+        variable (str, optional): Environment variable name. Defaults to "CDOT_GEOSPATIAL_API_RATE_LIMIT".
+
+    Returns:
+        TokenBucketRateLimiter | None: Rate limiter, or None if the variable is not set
+    """
+    rate = os.getenv(variable)
+    if not rate:
+        return None
+    return TokenBucketRateLimiter(float(rate))
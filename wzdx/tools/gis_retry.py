@@ -0,0 +1,175 @@
+import logging
+import random
+import threading
+import time
+
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BASE_DELAY = 0.5  # seconds, delay before the first retry
+DEFAULT_MAX_DELAY = 8  # seconds
+DEFAULT_FAILURE_THRESHOLD = 5  # consecutive failures before the circuit opens
+DEFAULT_RESET_TIMEOUT = 30  # seconds the circuit stays open before a trial request
+
+
+def is_client_error(error: BaseException) -> bool:
+    """Check whether a request failed with a 4xx response. The GIS server rejected the request itself, so it is not retried
+    and doesn't count as a server failure
+
+    Args:
+        error (BaseException): Request error, e.g. requests.exceptions.HTTPError
+
+    Returns:
+        bool: True for 4xx responses
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(error, "status", None)  # e.g. aiohttp.ClientResponseError
+    return isinstance(status, int) and 400 <= status < 500
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for failed GIS requests: the delay before retry n is drawn uniformly from
+    [0, min(maxDelay, baseDelay * 2^n)], so concurrent workers don't retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        maxRetries: int = DEFAULT_MAX_RETRIES,
+        baseDelay: float = DEFAULT_BASE_DELAY,
+        maxDelay: float = DEFAULT_MAX_DELAY,
+        jitter: bool = True,
+        rng: random.Random = None,
+    ):
+        """Initialize the retry policy
+
+        Args:
+            maxRetries (int, optional): Number of retries after the first attempt. Defaults to DEFAULT_MAX_RETRIES.
+            baseDelay (float, optional): Backoff before the first retry, in seconds. Defaults to DEFAULT_BASE_DELAY.
+            maxDelay (float, optional): Maximum backoff, in seconds. Defaults to DEFAULT_MAX_DELAY.
+            jitter (bool, optional): Whether to randomize the backoff. Defaults to True.
+            rng (random.Random, optional): Random number generator, for jitter. Defaults to a new Random instance per policy.
+        """
+        self.maxRetries = maxRetries
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        self.jitter = jitter
+        self.rng = rng if rng is not None else random.Random()
+        self._lock = threading.Lock()  # the policy is shared by pool threads
+
+    def get_delay(self, retry: int) -> float:
+        """Get the backoff before a retry
+
+        Args:
+            retry (int): Retry number, starting at 0
+
+        Returns:
+            float: Delay, in seconds
+        """
+        delay = min(self.maxDelay, self.baseDelay * 2**retry)
+        if not self.jitter:
+            return delay
+        with self._lock:
+            return self.rng.uniform(0, delay)
+
+
+class Deadline:
+    """Overall time budget for a batch of GIS requests. Once it is spent, requests fail immediately instead of waiting on
+    the GIS server, and callers fall back to their raw geometry.
+    """
+
+    def __init__(self, seconds: float, clock=time.monotonic):
+        """Start a deadline
+
+        Args:
+            seconds (float): Time budget, in seconds
+            clock (() => float, optional): Monotonic clock. Defaults to time.monotonic.
+        """
+        self.clock = clock
+        self.expires = clock() + seconds
+
+    def remaining(self) -> float:
+        """Get the remaining time budget, in seconds (0 once expired)"""
+        return max(0.0, self.expires - self.clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """Circuit breaker for the GIS server. After failureThreshold consecutive failed requests the circuit opens, and
+    requests fail fast without reaching the server. After resetTimeout seconds one trial request is let through: the circuit
+    closes if it succeeds, and re-opens if it fails. Safe to share between threads and GeospatialApi instances.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failureThreshold: int = DEFAULT_FAILURE_THRESHOLD,
+        resetTimeout: float = DEFAULT_RESET_TIMEOUT,
+        clock=time.monotonic,
+    ):
+        """Initialize the circuit breaker
+
+        Args:
+            failureThreshold (int, optional): Consecutive failures before the circuit opens. Defaults to DEFAULT_FAILURE_THRESHOLD.
+            resetTimeout (float, optional): Seconds the circuit stays open before a trial request. Defaults to DEFAULT_RESET_TIMEOUT.
+            clock (() => float, optional): Monotonic clock. Defaults to time.monotonic.
+        """
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0  # number of requests failed fast while the circuit was open
+        self._openedAt = None
+        self._trialInFlight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent to the GIS server
+
+        Returns:
+            bool: False if the circuit is open and the request should fail fast
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and self.clock() - self._openedAt >= self.resetTimeout
+            ):
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trialInFlight:
+                self._trialInFlight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release_trial(self):
+        """Release the half-open trial claimed by `allow_request`, for a request which ended without success or failure"""
+        with self._lock:
+            self._trialInFlight = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logging.info("GIS server circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trialInFlight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trialInFlight = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failureThreshold
+            ):
+                if self.state == self.CLOSED:
+                    logging.warning(
+                        f"GIS server circuit opened after {self.failures} consecutive failures, failing fast for {self.resetTimeout}s"
+                    )
+                self.state = self.OPEN
+                self._openedAt = self.clock()
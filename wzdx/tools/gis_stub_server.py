@@ -0,0 +1,410 @@
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+from .gis_cache import get_endpoint, read_recorded_responses
+from .linear_referencing import METERS_PER_DEGREE_LATITUDE, MeasuredLine
+from .local_lrs import LocalGeospatialApi, load_snapshot
+
+PROGRAM_NAME = "GisStubServer"
+PROGRAM_VERSION = "1.0"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+BASE_PATH = "/LrsServerRounded"
+
+METERS_PER_MILE = 1609.344
+DEC_OFFSET_METERS = 40  # distance between a synthetic route and its _DEC carriageway
+
+
+def get_fixture_key(url: str) -> str:
+    """Get the fixture key of a GIS request url, the endpoint and sorted query (e.g. ROUTE?f=pjson&outSR=4326&routeId=070A),
+    so recorded responses are served regardless of the base url they were recorded with
+
+    Args:
+        url (str): Request url, or path and query
+
+    Returns:
+        str: Fixture key
+    """
+    query = "&".join(
+        f"{key}={value}" for key, value in sorted(parse_qsl(urlparse(url).query))
+    )
+    return f"{get_endpoint(url)}?{query}"
+
+
+def load_fixtures(path: str) -> dict[str, str]:
+    """Load recorded GIS responses. Supports a JSON object of {url: response}, or newline delimited JSON of
+    {"url": url, "response": response}, as written by `SqliteRequestCache.export_to_file`
+
+    Args:
+        path (str): Fixture file path
+
+    Returns:
+        dict[str, str]: Responses, keyed by `get_fixture_key`
+    """
+    return {
+        get_fixture_key(url): response
+        for url, response in read_recorded_responses(path)
+    }
+
+
+def build_synthetic_routes(
+    routeCount: int = 10,
+    lengthMiles: float = 100,
+    origin: tuple[float, float] = (39.0, -105.0),
+    spacingDegrees: float = 0.1,
+    vertexMiles: float = 0.5,
+) -> dict[str, MeasuredLine]:
+    """Build a synthetic route network of parallel, northbound routes (001A, 002A, ...), each with a _DEC carriageway
+    DEC_OFFSET_METERS to the east
+
+    Args:
+        routeCount (int, optional): Number of routes. Defaults to 10.
+        lengthMiles (float, optional): Length of each route, measures run from 0 to lengthMiles. Defaults to 100.
+        origin (tuple[float, float], optional): Lat/long of the start of the first route. Defaults to (39.0, -105.0).
+        spacingDegrees (float, optional): Longitude between neighboring routes. Defaults to 0.1.
+        vertexMiles (float, optional): Distance between route vertices. Defaults to 0.5.
+
+    Returns:
+        dict[str, MeasuredLine]: Measured route geometry, keyed by route ID, see `LocalGeospatialApi`
+    """
+    lat, lng = origin
+    vertexCount = max(int(round(lengthMiles / vertexMiles)), 1) + 1
+    latStep = lengthMiles * METERS_PER_MILE / METERS_PER_DEGREE_LATITUDE
+    lats = [lat + latStep * i / (vertexCount - 1) for i in range(vertexCount)]
+    # Approximate, the _DEC carriageway only needs to be close and parallel
+    decOffset = DEC_OFFSET_METERS / METERS_PER_DEGREE_LATITUDE
+
+    routes = {}
+    for index in range(routeCount):
+        routeId = f"{index + 1:03d}A"
+        routeLng = lng + index * spacingDegrees
+        coordinates = [[routeLng, vertexLat] for vertexLat in lats]
+        decCoordinates = [[routeLng + decOffset, vertexLat] for vertexLat in lats]
+        decCoordinates.reverse()
+        routes[routeId] = MeasuredLine.from_measure_range(coordinates, 0, lengthMiles)
+        routes[f"{routeId}_DEC"] = MeasuredLine.from_measure_range(
+            decCoordinates, lengthMiles, 0
+        )
+    return routes
+
+
+class GisStubServer(ThreadingHTTPServer):
+    """Local stand-in for the CDOT GIS server, for benchmarks and load tests. Serves MeasureAtPoint, PointAtMeasure,
+    RouteBetweenMeasures, ROUTE and ROUTES from recorded responses, falling back to a local route network.
+
+    Point a GeospatialApi at `base_url` (or set CDOT_GEOSPATIAL_API_BASE_URL):
+
+        with GisStubServer(routes=build_synthetic_routes(), latency=0.05, jitter=0.02) as server:
+            api = GeospatialApi(BASE_URL=server.base_url)
+
+    Every response is delayed by `latency` plus an exponentially distributed `jitter` (a long tail, like the real server),
+    and a fraction `errorRate` of requests fails with an HTTP 500 and an ArcGIS error object.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = 0,
+        routes: dict[str, MeasuredLine] = None,
+        fixtures: dict[str, str] = None,
+        latency: float = 0,
+        jitter: float = 0,
+        errorRate: float = 0,
+        seed: int = None,
+        measuredGeometry: bool = True,
+    ):
+        """Initialize the server. The server is bound immediately, call `start` or `serve_forever` to handle requests
+
+        Args:
+            host (str, optional): Host to bind. Defaults to DEFAULT_HOST.
+            port (int, optional): Port to bind, 0 for any free port. Defaults to 0.
+            routes (dict[str, MeasuredLine], optional): Route network, see `build_synthetic_routes` and `local_lrs.load_snapshot`. Defaults to None, only fixtures.
+            fixtures (dict[str, str], optional): Recorded responses, see `load_fixtures`. Defaults to None.
+            latency (float, optional): Fixed delay added to every response, in seconds. Defaults to 0.
+            jitter (float, optional): Mean of the random delay added to every response, in seconds. Defaults to 0.
+            errorRate (float, optional): Fraction of requests which fail, between 0 and 1. Defaults to 0.
+            seed (int, optional): Random seed for repeatable jitter and errors. Defaults to None.
+            measuredGeometry (bool, optional): Whether to return vertex measures for RouteBetweenMeasures requests with returnM=true. False serves 2D geometry only. Defaults to True.
+        """
+        super().__init__((host, port), GisStubRequestHandler)
+        self.api = LocalGeospatialApi(routes) if routes else None
+        self.fixtures = fixtures or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.random = random.Random(seed)
+        self.measuredGeometry = measuredGeometry
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+
+    @property
+    def base_url(self) -> str:
+        """GIS server base url, for `GeospatialApi(BASE_URL=...)`"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+    def start(self) -> "GisStubServer":
+        """Handle requests on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop handling requests and close the socket"""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "GisStubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def get_delay(self) -> float:
+        """Get the injected delay of one response, in seconds"""
+        with self._lock:
+            jitter = self.random.expovariate(1 / self.jitter) if self.jitter else 0
+        return self.latency + jitter
+
+    def should_fail(self) -> bool:
+        """Decide whether to inject an error into one response"""
+        with self._lock:
+            self.requests += 1
+            fail = self.errorRate > 0 and self.random.random() < self.errorRate
+            if fail:
+                self.errors += 1
+        return fail
+
+    def get_response(self, path: str) -> tuple[int, dict | str]:
+        """Answer one GIS request
+
+        Args:
+            path (str): Request path and query
+
+        Returns:
+            tuple[int, dict | str]: HTTP status, and the response object (or recorded response string)
+        """
+        fixture = self.fixtures.get(get_fixture_key(path))
+        if fixture is not None:
+            return 200, fixture
+        if self.api is None:
+            return 404, get_error_response(404, f"No recorded response: {path}")
+
+        endpoint = get_endpoint(path)
+        query = dict(parse_qsl(urlparse(path).query))
+        try:
+            if endpoint == "ROUTES":
+                return 200, self.get_routes()
+            if endpoint == "ROUTE":
+                return 200, self.get_route(query["routeId"])
+            if endpoint == "MeasureAtPoint":
+                return 200, self.get_measure_at_point(
+                    float(query["y"]),
+                    float(query["x"]),
+                    float(query.get("tolerance", 10000)),
+                )
+            if endpoint == "PointAtMeasure":
+                return 200, self.get_point_at_measure(
+                    query["routeId"], float(query["measure"])
+                )
+            if endpoint == "RouteBetweenMeasures":
+                return 200, self.get_route_between_measures(
+                    query["routeId"],
+                    float(query["fromMeasure"]),
+                    float(query["toMeasure"]),
+                    query.get("returnM") == "true",
+                )
+        except (KeyError, ValueError) as e:
+            return 400, get_error_response(400, f"Invalid parameters: {e}")
+        return 404, get_error_response(404, f"Unknown endpoint: {endpoint}")
+
+    def get_routes(self) -> dict:
+        routes = []
+        for route_details in self.api.get_routes_list():
+            routes.append(
+                {
+                    "routeID": route_details["Route"],
+                    "MMin": route_details["MMin"],
+                    "MMax": route_details["MMax"],
+                }
+            )
+        return {"routes": routes}
+
+    def get_route(self, routeId: str) -> dict:
+        line = self.api.routes.get(routeId)
+        if not line:
+            return get_error_response(400, f"Route not found: {routeId}")
+        attributes = {"Route": routeId, "MMin": line.mMin, "MMax": line.mMax}
+        return {"features": [{"attributes": attributes}]}
+
+    def get_measure_at_point(self, lat: float, lng: float, tolerance: float) -> dict:
+        route_details = self.api.get_route_and_measure((lat, lng), tolerance=tolerance)
+        if not route_details:
+            return {"features": []}
+        return {"features": [{"attributes": route_details}]}
+
+    def get_point_at_measure(self, routeId: str, measure: float) -> dict:
+        line = self.api.routes.get(routeId)
+        if not line or not line.contains_measure(measure):
+            return {"features": []}
+        lng, lat = line.point_at_measure(measure)
+        return {"features": [{"geometry": {"x": lng, "y": lat}}]}
+
+    def get_route_between_measures(
+        self, routeId: str, fromMeasure: float, toMeasure: float, returnM: bool = False
+    ) -> dict:
+        line = self.api.routes.get(routeId)
+        if not line:
+            return get_error_response(400, f"Route not found: {routeId}")
+        if returnM and self.measuredGeometry:
+            paths = [line.slice(fromMeasure, toMeasure, withMeasures=True)]
+            return {"features": [{"geometry": {"hasM": True, "paths": paths}}]}
+        paths = [line.slice(fromMeasure, toMeasure)]
+        return {"features": [{"geometry": {"paths": paths}}]}
+
+
+def get_error_response(code: int, message: str) -> dict:
+    """Get an ArcGIS REST error object"""
+    return {"error": {"code": code, "message": message, "details": []}}
+
+
+class GisStubRequestHandler(BaseHTTPRequestHandler):
+    server: GisStubServer
+    protocol_version = "HTTP/1.1"  # keep-alive, like the pooled GeospatialApi session
+    disable_nagle_algorithm = (
+        True  # headers and body are written separately, don't hold the body for an ACK
+    )
+
+    def do_GET(self):
+        delay = self.server.get_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.server.should_fail():
+            status, response = 500, get_error_response(500, "Injected error")
+        else:
+            status, response = self.server.get_response(self.path)
+
+        body = (response if isinstance(response, str) else json.dumps(response)).encode(
+            "utf-8"
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+
+def main():
+    args = parse_arguments()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else None
+    routes = None
+    if args.snapshot:
+        routes = {
+            routeId: MeasuredLine.from_dict(obj)
+            for routeId, obj in load_snapshot(args.snapshot)["routes"].items()
+        }
+    elif args.syntheticRoutes:
+        routes = build_synthetic_routes(args.syntheticRoutes, args.routeLength)
+
+    server = GisStubServer(
+        args.host,
+        args.port,
+        routes=routes,
+        fixtures=fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        errorRate=args.errorRate,
+        seed=args.seed,
+    )
+    print(
+        f"Serving GIS stub server, set CDOT_GEOSPATIAL_API_BASE_URL={server.base_url}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.requests} requests ({server.errors} injected errors)")
+
+
+# parse script command line arguments
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments for the GIS stub server
+
+    Returns:
+        argparse.Namespace: parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the CDOT GIS server, for benchmarks and load tests"
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"{PROGRAM_NAME} {PROGRAM_VERSION}"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="host to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to bind")
+    parser.add_argument(
+        "--fixtures",
+        default=None,
+        help="recorded GIS responses, JSON object or newline delimited JSON (see SqliteRequestCache.export_to_file)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="route snapshot to serve (see gis_warmup), instead of a synthetic route network",
+    )
+    parser.add_argument(
+        "--syntheticRoutes",
+        type=int,
+        default=10,
+        help="number of synthetic routes to serve, 0 to only serve fixtures",
+    )
+    parser.add_argument(
+        "--routeLength",
+        type=float,
+        default=100,
+        help="length of each synthetic route, in miles",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0, help="fixed response delay, in seconds"
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0,
+        help="mean random response delay, in seconds",
+    )
+    parser.add_argument(
+        "--errorRate",
+        type=float,
+        default=0,
+        help="fraction of requests which fail with an HTTP 500",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="random seed for jitter and errors"
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
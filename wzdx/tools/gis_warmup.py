@@ -0,0 +1,277 @@
+import argparse
+import json
+import logging
+import threading
+import time
+
+from . import local_lrs
+from .cdot_geospatial_api import DEFAULT_BATCH_WORKERS, GeospatialApi
+from .gis_cache import SqliteRequestCache
+from .gis_rate_limit import PRIORITY_BACKFILL, request_priority
+
+PROGRAM_NAME = "GisWarmup"
+PROGRAM_VERSION = "1.0"
+
+DEFAULT_SNAPSHOT_PATH = "gis_routes.json.gz"
+
+
+class WarmupProgress:
+    """Thread-safe progress counters for a cache warm-up, counting routes and the bytes downloaded from the GIS server"""
+
+    def __init__(self, totalRoutes: int = 0):
+        """Initialize the progress counters
+
+        Args:
+            totalRoutes (int, optional): Number of routes to download. Defaults to 0.
+        """
+        self.totalRoutes = totalRoutes
+        self.routes = 0
+        self.failedRoutes = 0
+        self.responses = 0
+        self.bytes = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def wrap_set_cached_request(self, setCachedRequest):
+        """Wrap a `GeospatialApi` setCachedRequest hook, to count every response downloaded from the GIS server
+
+        Args:
+            setCachedRequest ((str, str) => None): Cache hook to wrap
+
+        Returns:
+            (str, str) => None: Counting cache hook
+        """
+
+        def set_cached_request(url: str, response: str):
+            with self._lock:
+                self.responses += 1
+                self.bytes += len(response.encode("utf-8"))
+            setCachedRequest(url, response)
+
+        return set_cached_request
+
+    def record_route(self, routeId: str, line: local_lrs.MeasuredLine | None):
+        """Record a downloaded route, and log the progress, see `local_lrs.build_snapshot`. Called from the download worker threads
+
+        Args:
+            routeId (str): GIS server route ID
+            line (MeasuredLine | None): Route geometry, or None if the route failed
+        """
+        with self._lock:
+            self.routes += 1
+            if line is None:
+                self.failedRoutes += 1
+            routes, downloaded = self.routes, self.bytes
+        status = "ok" if line is not None else "failed"
+        logging.info(
+            f"[{routes}/{self.totalRoutes}] {routeId}: {status}, {format_bytes(downloaded)} downloaded"
+        )
+
+    def summary(self) -> str:
+        """Get a one line summary of the warm-up"""
+        return (
+            f"Warmed up {self.routes - self.failedRoutes}/{self.totalRoutes} routes "
+            f"({self.failedRoutes} failed), {self.responses} GIS responses, "
+            f"{format_bytes(self.bytes)} in {time.time() - self.started:.1f}s"
+        )
+
+
+def format_bytes(size: int) -> str:
+    """Format a byte count for display, e.g. 1.5 MB"""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ["KB", "MB", "GB"]:
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def get_feed_coordinates(obj) -> list[tuple[float, float]]:
+    """Collect the start and end point of every GeoJSON geometry in a feed (WZDx, RTDH standard or raw planned events)
+
+    Args:
+        obj (dict | list): Parsed JSON feed
+
+    Returns:
+        list[tuple[float, float]]: Lat/long coordinates, in feed order
+    """
+    points = []
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            positions = get_positions(item.get("coordinates"))
+            if item.get("type") and positions:
+                points.append((positions[0][1], positions[0][0]))
+                if len(positions) > 1:
+                    points.append((positions[-1][1], positions[-1][0]))
+            else:
+                stack.extend(reversed(list(item.values())))
+    return points
+
+
+def get_positions(coordinates) -> list[list[float]]:
+    """Flatten the coordinates of a GeoJSON geometry to a list of long/lat positions, empty if they are not GeoJSON coordinates"""
+    if not isinstance(coordinates, list) or not coordinates:
+        return []
+    if all(isinstance(value, (int, float)) for value in coordinates):
+        return [coordinates] if len(coordinates) >= 2 else []
+    positions = []
+    for child in coordinates:
+        positions.extend(get_positions(child))
+    return positions
+
+
+def get_feed_route_ids(
+    api: GeospatialApi, feed, maxWorkers: int = DEFAULT_BATCH_WORKERS
+) -> list[str]:
+    """Find the routes used by a feed, by looking up the start and end point of every geometry
+
+    Args:
+        api (GeospatialApi): GIS server api
+        feed (dict | list): Parsed JSON feed
+        maxWorkers (int, optional): Maximum number of concurrent lookups. Defaults to DEFAULT_BATCH_WORKERS.
+
+    Returns:
+        list[str]: Route IDs, in order of first use
+    """
+    points = get_feed_coordinates(feed)
+    route_details_list = api.get_route_and_measure_many(points, maxWorkers=maxWorkers)
+    return list(
+        dict.fromkeys(
+            route_details["Route"]
+            for route_details in route_details_list
+            if route_details and route_details.get("Route")
+        )
+    )
+
+
+def warm_up(
+    api: GeospatialApi,
+    routeIds: list[str] = None,
+    maxWorkers: int = DEFAULT_BATCH_WORKERS,
+    progress: WarmupProgress = None,
+) -> dict:
+    """Download the details and measured geometry of every route, and build a route snapshot. Translators load the snapshot
+    with `local_lrs.LocalGeospatialApi.from_snapshot_file` (e.g. planned_events --gisSnapshot) to answer every route lookup
+    locally, without GIS requests.
+
+    Requests are sent in the backfill priority lane, so a warm-up never delays live lookups sharing a rate limiter.
+
+    Args:
+        api (GeospatialApi): GIS server api
+        routeIds (list[str], optional): Route IDs to download. Defaults to None, all routes from `get_routes_list`.
+        maxWorkers (int, optional): Number of routes to download concurrently. Defaults to DEFAULT_BATCH_WORKERS.
+        progress (WarmupProgress, optional): Progress counters. Defaults to None.
+
+    Returns:
+        dict: Route snapshot, see `local_lrs.save_snapshot`
+    """
+    with request_priority(PRIORITY_BACKFILL):
+        if routeIds is None:
+            routeIds = [
+                local_lrs.get_route_id(route) for route in api.get_routes_list() or []
+            ]
+        routeIds = list(dict.fromkeys(routeId for routeId in routeIds if routeId))
+        if progress:
+            progress.totalRoutes = len(routeIds)
+
+        def on_progress(routeId, line):
+            if progress:
+                progress.record_route(routeId, line)
+
+        return local_lrs.build_snapshot(
+            api, routeIds, maxWorkers=maxWorkers, onProgress=on_progress
+        )
+
+
+def main():
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # GIS responses are only cached when requested, the snapshot is what translators load
+    cache = SqliteRequestCache(args.cache) if args.cache else None
+    progress = WarmupProgress()
+    api = GeospatialApi(
+        getCachedRequest=cache.get if cache else lambda url: None,
+        setCachedRequest=progress.wrap_set_cached_request(
+            cache.set if cache else lambda url, response: None
+        ),
+        poolMaxSize=max(args.workers, 1),
+    )
+
+    routeIds = args.routes
+    if args.inputFile:
+        with open(args.inputFile, "r", encoding="utf-8") as f:
+            feed = json.load(f)
+        routeIds = (routeIds or []) + get_feed_route_ids(api, feed, args.workers)
+        logging.info(f"Found {len(routeIds)} routes in {args.inputFile}")
+
+    snapshot = warm_up(api, routeIds, args.workers, progress)
+    logging.info(progress.summary())
+
+    local_lrs.save_snapshot(snapshot, args.snapshot)
+    logging.info(
+        f"Wrote route snapshot of {len(snapshot['routes'])} routes: {args.snapshot}"
+    )
+    if cache:
+        if args.exportCache:
+            count = cache.export_to_file(args.exportCache)
+            logging.info(f"Exported {count} cached GIS responses: {args.exportCache}")
+        cache.close()
+    api.close()
+
+
+# parse script command line arguments
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments for the GIS cache warm-up
+
+    Returns:
+        argparse.Namespace: parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Download every route and its measured geometry, and write a route snapshot for translators to answer route lookups locally"
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"{PROGRAM_NAME} {PROGRAM_VERSION}"
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="optional SQLite GIS response cache, to store the downloaded GIS responses in",
+    )
+    parser.add_argument(
+        "--routes", nargs="+", default=None, help="route IDs to download"
+    )
+    parser.add_argument(
+        "--inputFile",
+        default=None,
+        help="JSON feed, download the routes used by its geometries instead of all routes",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_BATCH_WORKERS,
+        help="number of concurrent downloads",
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=DEFAULT_SNAPSHOT_PATH,
+        help="route snapshot output path (gzip compressed for .gz), for LocalGeospatialApi.from_snapshot_file",
+    )
+    parser.add_argument(
+        "--exportCache",
+        default=None,
+        help="also export the cached GIS responses as newline delimited JSON, for SqliteRequestCache.import_from_file",
+    )
+
+    args = parser.parse_args()
+    if args.exportCache and not args.cache:
+        parser.error("--exportCache requires --cache")
+    return args
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import json
+import re
+from typing import Iterator, TextIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # characters read from the stream at once
+
+_decoder = json.JSONDecoder()
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class _ValueScanner:
+    """Find the end of one JSON value across chunks of a stream, by tracking the nesting depth and string state, so the value
+    is only decoded once it is complete. Each character is scanned once, however many chunks the value spans.
+    """
+
+    def __init__(self, first: str):
+        """Initialize the scanner
+
+        Args:
+            first (str): First character of the value
+        """
+        self.scalar = first not in '[{"'  # number, true, false or null
+        self.depth = 0
+        self.inString = False
+        self.escaped = False
+
+    def find_end(self, text: str, index: int = 0) -> int | None:
+        """Scan the next part of the value
+
+        Args:
+            text (str): Chunk of the stream
+            index (int, optional): Position in text to continue from. Defaults to 0.
+
+        Returns:
+            int | None: Position in text just past the end of the value, or None if the value continues in the next chunk
+        """
+        if self.scalar:
+            match = _SCALAR_END.search(text, index)
+            return match.start() if match else None
+        while index < len(text):
+            if self.escaped:
+                self.escaped = False
+                index += 1
+                continue
+            if self.inString:
+                match = _STRING_SPECIAL.search(text, index)
+                if not match:
+                    return None
+                index = match.end()
+                if match.group() == "\\":
+                    self.escaped = True
+                else:
+                    self.inString = False
+                    if self.depth == 0:
+                        return index
+                continue
+            match = _STRUCTURE.search(text, index)
+            if not match:
+                return None
+            index = match.end()
+            char = match.group()
+            if char == '"':
+                self.inString = True
+            elif char in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth <= 0:
+                    return index
+        return None
+
+
+def iter_json_values(stream: TextIO, chunkSize: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+    """Parse JSON values one by one from a text stream, without reading the whole stream into memory. Supports a JSON array
+    (each element is yielded), newline delimited JSON, or concatenated JSON values (each value is yielded). Only the current
+    value and one chunk are held in memory.
+
+        with open("planned_events.json") as f:
+            for event in iter_json_values(f):
+                ...
+
+    Args:
+        stream (TextIO): Text stream, e.g. an open file
+        chunkSize (int, optional): Number of characters to read at once. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Raises:
+        json.JSONDecodeError: on invalid JSON
+
+    Yields:
+        Any: Parsed JSON values
+    """
+    buffer = ""
+    position = 0
+    eof = False
+    inArray = None  # unknown until the first value
+    expectValue = True
+
+    while True:
+        # Skip whitespace and array separators
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer, position = stream.read(chunkSize), 0
+            eof = not buffer
+
+        if position >= len(buffer):
+            if inArray:
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+            return
+
+        char = buffer[position]
+        if inArray is None:
+            inArray = char == "["
+            if inArray:
+                position += 1
+                continue
+        if inArray and char == "]":
+            return
+        if inArray and not expectValue:
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+            position += 1
+            expectValue = True
+            continue
+
+        # Read more of the stream until the end of the value, then parse it once
+        scanner = _ValueScanner(char)
+        end = scanner.find_end(buffer, position)
+        parts = []
+        while end is None and not eof:
+            parts.append(buffer[position:])
+            buffer, position = stream.read(chunkSize), 0
+            eof = not buffer
+            end = scanner.find_end(buffer)
+        if end is None:
+            # End of the stream, a trailing number is complete and anything else is invalid
+            end = len(buffer)
+        parts.append(buffer[position:end])
+        text = "".join(parts)
+        value, valueEnd = _decoder.raw_decode(text)
+        if valueEnd != len(text):
+            raise json.JSONDecodeError("Extra data", text, valueEnd)
+
+        yield value
+        position = end
+        expectValue = False
@@ -0,0 +1,310 @@
+import math
+
+import numpy as np
+from shapely.geometry import LineString, Point
+
+from .geospatial_tools import GEOD
+
+METERS_PER_MILE = 1609.344
+METERS_PER_DEGREE_LATITUDE = 111320.0  # approximate, used for planar scaling only
+DEFAULT_MIN_SAMPLE_MILES = (
+    0.05  # shortest interval between measure samples, see `get_refine_measures`
+)
+DEFAULT_RATE_TOLERANCE = (
+    0.05  # relative change of measure per distance between intervals of measure samples
+)
+
+
+class MeasuredLine:
+    """Route polyline with a measure (M value, miles) at every vertex, to answer linear referencing queries in-process.
+
+    Measures may be increasing or decreasing along the line (_DEC routes are stored from the higher to the lower measure), but must be monotonic.
+    """
+
+    def __init__(self, coordinates: list[list[float]], measures: list[float]):
+        """Initialize a measured line
+
+        Args:
+            coordinates (list[list[float]]): Route geometry, as Linestring of long/lat points
+            measures (list[float]): Measure of each coordinate (miles)
+        """
+        if len(coordinates) < 2 or len(coordinates) != len(measures):
+            raise ValueError(
+                "MeasuredLine requires at least 2 coordinates, each with a measure"
+            )
+        self.coordinates = np.asarray(coordinates, dtype=float)[:, :2]
+        self.measures = np.asarray(measures, dtype=float)
+        self.coordinates.flags.writeable = False
+        self.measures.flags.writeable = False
+        self.decreasing = self.measures[-1] < self.measures[0]
+
+        # Planar (equirectangular) copy of the line for projection. Longitude is scaled by cos(latitude) so that
+        # distances along the line are proportional to ground distances
+        self._lngScale = math.cos(math.radians(float(np.mean(self.coordinates[:, 1]))))
+        self._planar = self.coordinates * [self._lngScale, 1.0]
+        self._planarLine = LineString(self._planar)
+        self._planarDistances = np.concatenate(
+            [[0.0], np.cumsum(np.hypot(*np.diff(self._planar, axis=0).T))]
+        )
+        self.line = LineString(self.coordinates)
+
+    @classmethod
+    def from_measure_range(
+        cls, coordinates: list[list[float]], startMeasure: float, endMeasure: float
+    ) -> "MeasuredLine":
+        """Create a measured line from plain (2D) route geometry, by spreading the measure range along the line proportionally to geodesic distance
+
+        Args:
+            coordinates (list[list[float]]): Route geometry, as Linestring of long/lat points
+            startMeasure (float): Measure of the first coordinate (miles)
+            endMeasure (float): Measure of the last coordinate (miles)
+
+        Returns:
+            MeasuredLine: Measured line
+        """
+        coordinates = np.asarray(coordinates, dtype=float)[:, :2]
+        segmentLengths = GEOD.line_lengths(coordinates[:, 0], coordinates[:, 1])
+        distances = np.concatenate([[0.0], np.cumsum(segmentLengths)])
+        if distances[-1] > 0:
+            fractions = distances / distances[-1]
+        else:
+            fractions = np.linspace(0, 1, len(coordinates))
+        measures = startMeasure + fractions * (endMeasure - startMeasure)
+        return cls(coordinates, measures)
+
+    @classmethod
+    def from_measure_samples(
+        cls,
+        coordinates: list[list[float]],
+        samples: list[tuple[float, float, float]],
+    ) -> "MeasuredLine":
+        """Create a measured line from plain (2D) route geometry and GIS measures sampled along it (e.g. from PointAtMeasure).
+        Samples are located on the line and added as vertices, and the measures of other vertices are interpolated between
+        the samples proportionally to distance, see `get_refine_measures`
+
+        Args:
+            coordinates (list[list[float]]): Route geometry, as Linestring of long/lat points
+            samples (list[tuple[float, float, float]]): At least 2 samples of measure (miles), long and lat
+
+        Returns:
+            MeasuredLine: Measured line
+        """
+        line = cls(coordinates, np.zeros(len(coordinates)))
+        distances, measures = line._locate_samples(samples)
+
+        # Samples which don't fall on a vertex are added as vertices, so the line has their exact measure
+        vertexDistances = line._planarDistances
+        nearest = np.abs(distances[:, None] - vertexDistances[None, :]).min(axis=1)
+        newDistances = distances[nearest > 1e-12]
+        allDistances = np.concatenate([vertexDistances, newDistances])
+        order = np.argsort(allDistances, kind="stable")
+        indices = np.interp(
+            newDistances, vertexDistances, np.arange(len(vertexDistances), dtype=float)
+        )
+        allCoordinates = np.concatenate(
+            [
+                line.coordinates,
+                np.array(
+                    [line._coordinate_at_index(index) for index in indices]
+                ).reshape(-1, 2),
+            ]
+        )
+        return cls(
+            allCoordinates[order],
+            np.interp(allDistances[order], distances, measures),
+        )
+
+    def _locate_samples(
+        self, samples: list[tuple[float, float, float]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Locate measure samples (measure, long, lat) on the line, see `from_measure_samples`
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Planar distance along the line of each sample, in line order, and the sample measures,
+            kept monotonic where samples snap out of order (e.g. on tight curves)
+        """
+        if len(samples) < 2:
+            raise ValueError("MeasuredLine requires at least 2 measure samples")
+        distances = np.array(
+            [
+                self._planarLine.project(Point(lng * self._lngScale, lat))
+                for _, lng, lat in samples
+            ]
+        )
+        order = np.argsort(distances, kind="stable")
+        measures = np.array([sample[0] for sample in samples], dtype=float)[order]
+        if measures[-1] < measures[0]:
+            measures = np.minimum.accumulate(measures)
+        else:
+            measures = np.maximum.accumulate(measures)
+        return distances[order], measures
+
+    @property
+    def mMin(self) -> float:
+        return float(min(self.measures[0], self.measures[-1]))
+
+    @property
+    def mMax(self) -> float:
+        return float(max(self.measures[0], self.measures[-1]))
+
+    def contains_measure(self, measure: float, tolerance: float = 1e-6) -> bool:
+        """Check whether a measure lies within the measure range of the line"""
+        return self.mMin - tolerance <= measure <= self.mMax + tolerance
+
+    def _index_at_measure(self, measure: float) -> float:
+        """Fractional vertex index of a measure, clamped to the ends of the line"""
+        indices = np.arange(len(self.measures), dtype=float)
+        if self.decreasing:
+            return float(np.interp(-measure, -self.measures, indices))
+        return float(np.interp(measure, self.measures, indices))
+
+    def _measure_at_index(self, index: float) -> float:
+        return float(
+            np.interp(index, np.arange(len(self.measures), dtype=float), self.measures)
+        )
+
+    def _coordinate_at_index(self, index: float) -> list[float]:
+        i = min(int(index), len(self.coordinates) - 2)
+        t = index - i
+        lng, lat = self.coordinates[i] + t * (
+            self.coordinates[i + 1] - self.coordinates[i]
+        )
+        return [float(lng), float(lat)]
+
+    def point_at_measure(self, measure: float) -> list[float]:
+        """Get the long/lat point at a measure, interpolating between vertices
+
+        Args:
+            measure (float): Measure on route (miles)
+
+        Returns:
+            list[float]: long/lat point
+        """
+        return self._coordinate_at_index(self._index_at_measure(measure))
+
+    def slice(
+        self, fromMeasure: float, toMeasure: float, withMeasures: bool = False
+    ) -> list[list[float]]:
+        """Get the route geometry between two measures, ordered from fromMeasure to toMeasure
+
+        Args:
+            fromMeasure (float): Start measure (miles)
+            toMeasure (float): End measure (miles)
+            withMeasures (bool, optional): Whether to add the measure of each point, as long/lat/measure. Defaults to False.
+
+        Returns:
+            list[list[float]]: Linestring of long/lat points, with interpolated end points
+        """
+        fromIndex = self._index_at_measure(fromMeasure)
+        toIndex = self._index_at_measure(toMeasure)
+        reverse = fromIndex > toIndex
+        if reverse:
+            fromIndex, toIndex = toIndex, fromIndex
+
+        indices = [fromIndex]
+        indices.extend(range(math.floor(fromIndex) + 1, math.ceil(toIndex)))
+        indices.append(toIndex)
+        linestring = []
+        for index in indices:
+            point = self._coordinate_at_index(index)
+            if withMeasures:
+                point.append(self._measure_at_index(index))
+            linestring.append(point)
+
+        if reverse:
+            linestring.reverse()
+        return linestring
+
+    def locate(self, lng: float, lat: float) -> tuple[float, float, list[float]]:
+        """Find the closest point on the line to a long/lat point
+
+        Args:
+            lng (float): Longitude
+            lat (float): Latitude
+
+        Returns:
+            tuple[float, float, list[float]]: Measure at the closest point (miles), distance to the line (meters), closest long/lat point
+        """
+        distanceAlong = self._planarLine.project(Point(lng * self._lngScale, lat))
+        index = float(
+            np.interp(
+                distanceAlong,
+                self._planarDistances,
+                np.arange(len(self._planarDistances), dtype=float),
+            )
+        )
+        closest = self._coordinate_at_index(index)
+        measure = self._measure_at_index(index)
+        _, __, distance = GEOD.inv(lng, lat, closest[0], closest[1])
+        return measure, distance, closest
+
+    def to_dict(self) -> dict:
+        """Serialize the measured line, see `from_dict`"""
+        return {
+            "coordinates": self.coordinates.tolist(),
+            "measures": self.measures.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, obj: dict) -> "MeasuredLine":
+        """Deserialize a measured line, see `to_dict`"""
+        return cls(obj["coordinates"], obj["measures"])
+
+
+def get_refine_measures(
+    coordinates: list[list[float]],
+    samples: list[tuple[float, float, float]],
+    minMiles: float = DEFAULT_MIN_SAMPLE_MILES,
+    rateTolerance: float = DEFAULT_RATE_TOLERANCE,
+) -> list[float]:
+    """Get the measures to sample next along plain (2D) route geometry, see `MeasuredLine.from_measure_samples`. Between two
+    samples, measures are interpolated proportionally to distance, which is only accurate if the rate of measure per distance
+    is constant. Intervals whose rate differs from their neighboring intervals (they contain a measure equation, or a change of
+    calibration) are split at their middle measure, until they are shorter than minMiles.
+
+    Args:
+        coordinates (list[list[float]]): Route geometry, as Linestring of long/lat points
+        samples (list[tuple[float, float, float]]): Samples of measure (miles), long and lat
+        minMiles (float, optional): Shortest interval to split. Defaults to DEFAULT_MIN_SAMPLE_MILES.
+        rateTolerance (float, optional): Relative difference of the rates of neighboring intervals to split at. Defaults to DEFAULT_RATE_TOLERANCE.
+
+    Returns:
+        list[float]: Measures to sample (miles), empty when the samples are dense enough
+    """
+    if len(samples) < 3:
+        return []
+    line = MeasuredLine(coordinates, np.zeros(len(coordinates)))
+    distances, measures = line._locate_samples(samples)
+    measureSteps = np.abs(np.diff(measures))
+    distanceSteps = np.diff(distances)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.where(distanceSteps > 0, measureSteps / distanceSteps, np.inf)
+
+    refineMeasures = []
+    for i, rate in enumerate(rates):
+        if measureSteps[i] <= minMiles:
+            continue
+        neighbors = [rates[j] for j in (i - 1, i + 1) if 0 <= j < len(rates)]
+        if all(
+            not np.isfinite(rate)
+            or not np.isfinite(neighbor)
+            or abs(rate - neighbor) > rateTolerance * min(rate, neighbor)
+            for neighbor in neighbors
+        ):
+            refineMeasures.append(float((measures[i] + measures[i + 1]) / 2))
+    return refineMeasures
+
+
+def tolerance_to_degrees(lat: float, tolerance: float) -> tuple[float, float]:
+    """Convert a distance in meters to an approximate long/lat extent at a latitude
+
+    Args:
+        lat (float): Latitude
+        tolerance (float): Distance in meters
+
+    Returns:
+        tuple[float, float]: longitude extent, latitude extent (degrees)
+    """
+    dLat = tolerance / METERS_PER_DEGREE_LATITUDE
+    dLng = dLat / max(math.cos(math.radians(lat)), 1e-6)
+    return dLng, dLat
@@ -0,0 +1,260 @@
+import concurrent.futures
+import gzip
+import json
+import logging
+import time
+from typing import Callable
+
+from shapely import STRtree, box
+
+from ..tools import geometry_simplification
+from .cdot_geospatial_api import MEASURE_DECIMALS, GeospatialApi
+from .gis_rate_limit import get_request_priority, request_priority
+from .linear_referencing import MeasuredLine, tolerance_to_degrees
+
+SNAPSHOT_VERSION = 1
+DISTANCE_DECIMALS = 2
+
+
+def build_snapshot(
+    api: GeospatialApi,
+    routeIds: list[str] = None,
+    maxWorkers: int = 1,
+    onProgress: Callable[[str, MeasuredLine | None], None] = None,
+) -> dict:
+    """Build a route snapshot for `LocalGeospatialApi`, by downloading the full geometry of every route, with its GIS measures,
+    from the GIS server, see `GeospatialApi.get_measured_route`
+
+    Args:
+        api (GeospatialApi): GIS server api to download routes with
+        routeIds (list[str], optional): Route IDs to include. Defaults to None, all routes from `get_routes_list`.
+        maxWorkers (int, optional): Number of routes to download concurrently. Defaults to 1.
+        onProgress ((str, MeasuredLine | None) => None, optional): Called after each route is downloaded, with None if it failed. Defaults to None.
+
+    Returns:
+        dict: Route snapshot, see `save_snapshot`
+    """
+    if routeIds is None:
+        routeIds = [get_route_id(route) for route in api.get_routes_list() or []]
+    routeIds = list(dict.fromkeys(routeId for routeId in routeIds if routeId))
+
+    # Worker threads don't inherit the request priority of the caller
+    priority = get_request_priority()
+
+    def download(routeId):
+        with request_priority(priority):
+            line = build_route_line(api, routeId)
+        if onProgress:
+            onProgress(routeId, line)
+        return line
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(maxWorkers, len(routeIds) or 1))
+    ) as executor:
+        lines = list(executor.map(download, routeIds))
+
+    routes = {routeId: line.to_dict() for routeId, line in zip(routeIds, lines) if line}
+    return {"version": SNAPSHOT_VERSION, "created": time.time(), "routes": routes}
+
+
+def build_route_line(api: GeospatialApi, routeId: str) -> MeasuredLine | None:
+    """Download the full geometry of one route from the GIS server, see `build_snapshot`
+
+    Args:
+        api (GeospatialApi): GIS server api to download the route with
+        routeId (str): GIS server route ID
+
+    Returns:
+        MeasuredLine | None: Route geometry and measures, or None if the route could not be downloaded
+    """
+    route_details = api.get_route_details(routeId)
+    if not route_details:
+        logging.warning(f"build_snapshot failed to get route details: {routeId}")
+        return None
+    _, fromMeasure, toMeasure = api.normalize_route_measures(
+        routeId, route_details["MMin"], route_details["MMax"], adjustRoute=False
+    )
+    line = api.get_measured_route(routeId, fromMeasure, toMeasure)
+    if not line:
+        logging.warning(f"build_snapshot failed to get route geometry: {routeId}")
+        return None
+    return line
+
+
+def get_route_id(route: dict) -> str | None:
+    """Get the route ID from a `get_routes_list` entry"""
+    for key in ["routeID", "routeId", "Route"]:
+        if route.get(key):
+            return route[key]
+    return None
+
+
+def save_snapshot(snapshot: dict, path: str):
+    """Write a route snapshot to a JSON file, gzip compressed if the path ends with .gz
+
+    Args:
+        snapshot (dict): Route snapshot, see `build_snapshot`
+        path (str): Output file path
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+
+
+def load_snapshot(path: str) -> dict:
+    """Read a route snapshot from a JSON file, gzip compressed if the path ends with .gz
+
+    Args:
+        path (str): Snapshot file path
+
+    Returns:
+        dict: Route snapshot
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported route snapshot version: {snapshot.get('version')}, expected {SNAPSHOT_VERSION}"
+        )
+    return snapshot
+
+
+class LocalGeospatialApi(GeospatialApi):
+    """Offline GeospatialApi, answering linear referencing calls in-process from a route snapshot instead of the GIS server.
+
+    Route lookups (`get_route_and_measure`) use a spatial index (STRtree) over all route polylines.
+    """
+
+    def __init__(self, routes: dict[str, MeasuredLine], **kwargs):
+        """Initialize the local Geospatial API
+
+        Args:
+            routes (dict[str, MeasuredLine]): Measured route geometry, keyed by route ID (including _DEC routes)
+            **kwargs: Optional `GeospatialApi` arguments
+        """
+        super().__init__(**kwargs)
+        self.routes = routes
+        self._routeIds = list(routes.keys())
+        self._tree = STRtree([routes[routeId].line for routeId in self._routeIds])
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict, **kwargs) -> "LocalGeospatialApi":
+        """Create a local Geospatial API from a route snapshot, see `build_snapshot`"""
+        routes = {
+            routeId: MeasuredLine.from_dict(obj)
+            for routeId, obj in snapshot["routes"].items()
+        }
+        return cls(routes, **kwargs)
+
+    @classmethod
+    def from_snapshot_file(cls, path: str, **kwargs) -> "LocalGeospatialApi":
+        """Create a local Geospatial API from a route snapshot file, see `save_snapshot`"""
+        return cls.from_snapshot(load_snapshot(path), **kwargs)
+
+    def get_routes_list(self) -> list[dict]:
+        return [self.get_route_details(routeId) for routeId in self._routeIds]
+
+    def get_route_details(self, routeId: str) -> dict | None:
+        line = self.routes.get(routeId)
+        if not line:
+            logging.warning(f"Route not found in local route snapshot: {routeId}")
+            return None
+        return {"Route": routeId, "MMin": line.mMin, "MMax": line.mMax}
+
+    def get_route_profile(
+        self, routeId: str, mMin: float = None, mMax: float = None
+    ) -> MeasuredLine | None:
+        return self.routes.get(routeId)
+
+    def get_measured_route(
+        self, routeId: str, fromMeasure: float, toMeasure: float
+    ) -> MeasuredLine | None:
+        line = self.routes.get(routeId)
+        if not line:
+            logging.warning(f"Route not found in local route snapshot: {routeId}")
+            return None
+        linestring = line.slice(fromMeasure, toMeasure, withMeasures=True)
+        return MeasuredLine(
+            [point[:2] for point in linestring], [point[2] for point in linestring]
+        )
+
+    def get_route_and_measure(
+        self, latLng: tuple[float, float], heading: float = None, tolerance: int = 10000
+    ) -> dict | None:
+        lat, lng = latLng
+        dLng, dLat = tolerance_to_degrees(lat, tolerance)
+        candidates = self._tree.query(
+            box(lng - dLng, lat - dLat, lng + dLng, lat + dLat)
+        )
+
+        closest = None
+        for index in sorted(candidates):
+            routeId = self._routeIds[index]
+            measure, distance, _ = self.routes[routeId].locate(lng, lat)
+            if distance > tolerance:
+                continue
+            # Prefer the primary route when it overlaps its _DEC route
+            if closest is None or distance < closest[2] - 1e-6:
+                closest = (routeId, measure, distance)
+            elif abs(distance - closest[2]) <= 1e-6 and self.is_route_id_dec(
+                closest[0]
+            ):
+                closest = (routeId, measure, distance)
+
+        if not closest:
+            return {}
+        routeId, measure, distance = closest
+        line = self.routes[routeId]
+        route_details = {
+            "Route": routeId,
+            "Measure": round(measure, MEASURE_DECIMALS),
+            "MMin": line.mMin,
+            "MMax": line.mMax,
+            "Distance": round(distance, DISTANCE_DECIMALS),
+        }
+
+        if heading:
+            route_details = self._add_direction_from_heading(route_details, heading)
+
+        return route_details
+
+    def get_point_at_measure(
+        self, routeId: str, measure: float
+    ) -> tuple[float, float] | None:
+        line = self.routes.get(routeId)
+        if not line or not line.contains_measure(measure):
+            logging.warning(
+                f"Measure not found in local route snapshot. routeId: {routeId}, measure: {measure}"
+            )
+            return None
+        lng, lat = line.point_at_measure(measure)
+        return (lat, lng)
+
+    def get_route_between_measures(
+        self,
+        routeId: str,
+        startMeasure: float,
+        endMeasure: float,
+        dualCarriageway: bool = True,
+        compressed: bool = False,
+        adjustRoute: bool = True,
+        compressionMethod: str = geometry_simplification.DEFAULT_METHOD,
+        maxDeviation: float = geometry_simplification.DEFAULT_MAX_DEVIATION,
+    ) -> list[list[float]]:
+        routeId, startMeasure, endMeasure = self.normalize_route_measures(
+            routeId, startMeasure, endMeasure, dualCarriageway, adjustRoute
+        )
+        line = self.routes.get(routeId)
+        if not line:
+            logging.warning(f"Route not found in local route snapshot: {routeId}")
+            return None
+
+        linestring = line.slice(startMeasure, endMeasure)
+
+        if compressed:
+            linestring = geometry_simplification.simplify_path(
+                linestring, compressionMethod, maxDeviation
+            )
+
+        return linestring
@@ -0,0 +1,73 @@
+import concurrent.futures
+import logging
+import math
+from typing import Callable
+
+from . import cdot_geospatial_api
+
+SHARDS_PER_WORKER = 4  # smaller shards balance uneven events across workers
+
+
+def map_shards(
+    fn: Callable[[list], list],
+    items: list,
+    workers: int,
+    shardSize: int = None,
+    initializer: Callable = None,
+    initargs: tuple = (),
+) -> list:
+    """Run a function over contiguous shards of items in a pool of worker processes, and concatenate the results in input order.
+    A shard which fails (or whose worker process dies) is logged and skipped, without affecting other shards.
+
+    With 1 worker, shards are processed in-process, without starting a pool or running the initializer.
+
+    Args:
+        fn ((list) => list): Function to run on each shard, must be a picklable (module level) function
+        items (list): Items to shard, must be picklable
+        workers (int): Number of worker processes
+        shardSize (int, optional): Items per shard. Defaults to None, spread items over SHARDS_PER_WORKER shards per worker.
+        initializer (() => None, optional): Function run once in each worker process, see `init_worker_api`. Defaults to None.
+        initargs (tuple, optional): Arguments for the initializer. Defaults to ().
+
+    Returns:
+        list: Concatenated results of all shards, in input order
+    """
+    if not items:
+        return []
+    if shardSize is None:
+        shardSize = math.ceil(len(items) / (max(workers, 1) * SHARDS_PER_WORKER))
+    shards = [items[i : i + shardSize] for i in range(0, len(items), shardSize)]
+
+    if workers <= 1:
+        return [result for shard in shards for result in fn(shard)]
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)),
+        initializer=initializer,
+        initargs=initargs,
+    ) as executor:
+        futures = [executor.submit(fn, shard) for shard in shards]
+        for index, future in enumerate(futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                logging.error(
+                    f"Failed to process shard {index + 1}/{len(shards)} ({len(shards[index])} items): {e}"
+                )
+    return results
+
+
+def init_worker_api(
+    apiFactory: Callable[[], cdot_geospatial_api.GeospatialApi] = None,
+):
+    """Worker process initializer, giving each worker its own GeospatialApi (HTTP session, caches and limits), used by
+    every translation in the worker through `cdot_geospatial_api.get_default_api`
+
+    Args:
+        apiFactory (() => GeospatialApi, optional): Picklable (module level) function creating the worker api. Defaults to None, GeospatialApi().
+    """
+    api = (
+        apiFactory() if apiFactory is not None else cdot_geospatial_api.GeospatialApi()
+    )
+    cdot_geospatial_api.configure_default_api(api)
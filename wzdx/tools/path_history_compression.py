@@ -1,8 +1,18 @@
 import logging
 import math
 
+import numpy as np
+
 from ..tools import geospatial_tools
 
+EARTH_RADIUS = 6371.0 * 1000  # meters
+ALLOWABLE_ERROR = 30  # meters
+SMALL_DELTA_PHI = 0.01
+CHORD_LENGTH_THRESHOLD = 10000
+MAX_ESTIMATED_RADIUS = 8388607  # 7FFFFF
+MIN_WINDOW_SIZE = 16  # points evaluated at once after an accepted point
+MAX_WINDOW_SIZE = 4096
+
 
 def getChordLength(pt1, pt2):
     lon1 = math.radians(pt1[0])
@@ -28,22 +38,186 @@ def getChordLength(pt1, pt2):
     return d
 
 
+def get_chord_lengths(origin: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Vectorized `getChordLength`, from one long/lat origin to many long/lat points
+
+    Args:
+        origin (np.ndarray): long/lat point
+        points (np.ndarray): n x 2 array of long/lat points
+
+    Returns:
+        np.ndarray: chord length to each point (meters)
+    """
+    lon1, lat1 = np.radians(origin[0]), np.radians(origin[1])
+    lon2, lat2 = np.radians(points[:, 0]), np.radians(points[:, 1])
+    cosines = np.cos(lat1) * np.cos(lat2) * np.cos(lon1 - lon2) + np.sin(lat1) * np.sin(
+        lat2
+    )
+    with np.errstate(invalid="ignore"):
+        d = EARTH_RADIUS * np.arccos(cosines)
+
+    # Same fallback as `getChordLength`, where rounding puts the cosine out of range
+    invalid = np.abs(cosines) > 1
+    if invalid.any():
+        dLat = lat2[invalid] - lat1
+        dLon = lon2[invalid] - lon1
+        a = np.sin(dLat / 2) * np.sin(dLat / 2) + np.cos(np.radians(lat1)) * np.cos(
+            np.radians(lat2[invalid])
+        ) * np.sin(dLon / 2) * np.sin(dLon / 2)
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        d[invalid] = EARTH_RADIUS * c
+    return d
+
+
 ###
 # Generate concise path history based on SAE J2945/1 2016-03, Section A.5
 # Using Design Method One, section A.5.3.1
 #
 # path = [[long, lat], [long, lat], ...]
+# allowableError = maximum error of a removed point (meters)
 #
-#
+# Produces the same output as `generate_compressed_path_iterative`. The heading of every segment is calculated at once.
+# The starting point of steps 2 and 3 moves with every kept point, so the error of each point is evaluated in sequence,
+# until a run of points is within tolerance (e.g. a straight road), after which the error of a window of points is
+# calculated at once.
 ###
-def generate_compressed_path(path):
+def generate_compressed_path(path, allowableError: float = ALLOWABLE_ERROR):
     if len(path) <= 3:
         return path
 
-    ALLOWABLE_ERROR = 30
-    SMALL_DELTA_PHI = 0.01
-    CHORD_LENGTH_THRESHOLD = 10000
-    MAX_ESTIMATED_RADIUS = 8388607  # 7FFFFF
+    coordinates = np.array([[point[0], point[1]] for point in path], dtype=float)
+    stopIndex = len(path) - 1
+
+    # Heading of the segment ending at each point, heading_next in step 3
+    segmentHeadings = geospatial_tools.get_headings(coordinates[:-1], coordinates[1:])
+    segmentHeadingsList = segmentHeadings.tolist()
+    points = coordinates.tolist()
+    # Terms of `getChordLength` for each point, calculated the same way so chord lengths are identical
+    lons = [math.radians(point[0]) for point in points]
+    cosLats = [math.cos(math.radians(point[1])) for point in points]
+    sinLats = [math.sin(math.radians(point[1])) for point in points]
+
+    PH_ConciseDataBuffer = [path[0], path[1]]
+    startingIndex = 1
+    i = 3
+    acceptedRun = 0
+    windowSize = MIN_WINDOW_SIZE
+    while i <= stopIndex:
+        if acceptedRun < MIN_WINDOW_SIZE:
+            # Heading from point i - 3 to the starting point is the previous segment heading, right after a kept point
+            if startingIndex == i - 2:
+                heading_start = segmentHeadingsList[i - 3]
+            else:
+                heading_start = (
+                    geospatial_tools.GEOD.inv(*points[i - 3], *points[startingIndex])[0]
+                    % 360
+                )
+            try:
+                actualChordLength = EARTH_RADIUS * math.acos(
+                    cosLats[startingIndex]
+                    * cosLats[i]
+                    * math.cos(lons[startingIndex] - lons[i])
+                    + sinLats[startingIndex] * sinLats[i]
+                )
+            except ValueError:
+                actualChordLength = getChordLength(points[startingIndex], points[i])
+            rejected = (
+                get_actual_error(
+                    actualChordLength,
+                    heading_start,
+                    segmentHeadingsList[i - 1],
+                )
+                > allowableError
+            )
+            windowEnd = i
+        else:
+            indices = np.arange(i, min(i + windowSize, stopIndex + 1))
+            actualErrors = get_actual_errors(
+                get_chord_lengths(coordinates[startingIndex], coordinates[indices]),
+                geospatial_tools.get_headings(
+                    coordinates[indices - 3], coordinates[startingIndex]
+                ),
+                segmentHeadings[indices - 1],
+            )
+            outOfTolerance = np.flatnonzero(actualErrors > allowableError)
+            rejected = outOfTolerance.size > 0
+            if rejected:
+                i = int(indices[outOfTolerance[0]])
+            windowEnd = int(indices[-1])
+            windowSize = min(windowSize * 2, MAX_WINDOW_SIZE)
+
+        # Step 7, the previous point of the first point out of tolerance is kept, and becomes the new starting point
+        if rejected:
+            PH_ConciseDataBuffer.append(path[i - 1])
+            startingIndex = i - 1
+            acceptedRun = 0
+            windowSize = MIN_WINDOW_SIZE
+            i += 1
+        # Step 8
+        else:
+            acceptedRun += windowEnd - i + 1
+            i = windowEnd + 1
+
+    # Step 9
+    PH_ConciseDataBuffer.append(path[stopIndex])
+    return PH_ConciseDataBuffer
+
+
+def get_actual_error(
+    actualChordLength: float, heading_start: float, heading_next: float
+) -> float:
+    """Steps 2 - 6 of `generate_compressed_path`, the error of a point from its chord length and headings
+
+    Args:
+        actualChordLength (float): chord length from the starting point to the point (meters)
+        heading_start (float): heading at the starting point (degrees)
+        heading_next (float): heading of the segment ending at the point (degrees)
+
+    Returns:
+        float: actual error (meters), infinite for chords longer than CHORD_LENGTH_THRESHOLD
+    """
+    if actualChordLength > CHORD_LENGTH_THRESHOLD:
+        return math.inf
+    deltaHeadings = abs(heading_next - heading_start)
+    if deltaHeadings > 180:
+        deltaHeadings = 360 - deltaHeadings
+    deltaHeadings = abs(math.radians(deltaHeadings))
+    if deltaHeadings < SMALL_DELTA_PHI:
+        return 0
+    estimatedRadius = actualChordLength / (2 * math.sin(deltaHeadings / 2))
+    d = estimatedRadius * math.cos(deltaHeadings / 2)
+    return estimatedRadius - d
+
+
+def get_actual_errors(
+    actualChordLengths: np.ndarray,
+    headingsStart: np.ndarray,
+    headingsNext: np.ndarray,
+) -> np.ndarray:
+    """Vectorized `get_actual_error`
+
+    Args:
+        actualChordLengths (np.ndarray): chord lengths from the starting point to each point (meters)
+        headingsStart (np.ndarray): headings at the starting point (degrees)
+        headingsNext (np.ndarray): headings of the segments ending at each point (degrees)
+
+    Returns:
+        np.ndarray: actual errors (meters)
+    """
+    deltaHeadings = np.abs(headingsNext - headingsStart)
+    deltaHeadings = np.where(deltaHeadings > 180, 360 - deltaHeadings, deltaHeadings)
+    deltaHeadings = np.abs(np.radians(deltaHeadings))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimatedRadius = actualChordLengths / (2 * np.sin(deltaHeadings / 2))
+        actualErrors = estimatedRadius - estimatedRadius * np.cos(deltaHeadings / 2)
+    actualErrors = np.where(deltaHeadings < SMALL_DELTA_PHI, 0, actualErrors)
+    return np.where(actualChordLengths > CHORD_LENGTH_THRESHOLD, np.inf, actualErrors)
+
+
+def generate_compressed_path_iterative(path, allowableError: float = ALLOWABLE_ERROR):
+    """Point by point implementation of `generate_compressed_path`, kept as the reference for tests and benchmarks"""
+    if len(path) <= 3:
+        return path
 
     PH_ConciseDataBuffer = []
 
@@ -70,7 +244,7 @@ def generate_compressed_path(path):
         eval = True
         actualChordLength = getChordLength(pStarting, pNext)
         if actualChordLength > CHORD_LENGTH_THRESHOLD:
-            actualError = ALLOWABLE_ERROR + 1
+            actualError = allowableError + 1
             eval = False
             # Go to step 7
 
@@ -102,7 +276,7 @@ def generate_compressed_path(path):
             actualError = estimatedRadius - d
 
         # Step 7
-        if actualError > ALLOWABLE_ERROR:
+        if actualError > allowableError:
             incrementDist = actualChordLength
             totalDist += incrementDist
             PH_ConciseDataBuffer.append(path[i - 1])
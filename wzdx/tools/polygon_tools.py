@@ -1,25 +1,98 @@
+import logging
+import math
+
 import geopy
-import pyproj
+import numpy as np
+import shapely
 from geopy.distance import geodesic
-from shapely.geometry import Point
+from shapely.geometry import LineString, Point
 from shapely.geometry.polygon import Polygon
 
+from . import geospatial_tools
+from .linear_referencing import METERS_PER_DEGREE_LATITUDE
+
 CORNER_PRECISION_DEGREES = 10
+BUFFER_GEODESIC = "geodesic"
+BUFFER_PROJECTED = "projected"
+MITRE_LIMIT = 2.0  # mitre joins of sharper turns are bevelled
 
 
 def generate_buffer_polygon_from_linestring(
-    geometry: list, polygon_width_in_meters: float
+    geometry: list,
+    polygon_width_in_meters: float,
+    mode: str = BUFFER_GEODESIC,
+    capStyle: str = "flat",
+    joinStyle: str = "mitre",
 ):
     """Generate a polygon from a Linestring using polygon_width_in_meters as a buffer.
 
+    In geodesic mode (default), each vertex is offset by half the width to the left and right of the heading of the segment
+    ending at it, for all vertices at once. In projected mode, the Linestring is buffered by shapely in local planar
+    (equirectangular) coordinates, which is faster and handles sharp turns, with the given cap and join styles.
+
     Args:
         geometry: Linestring (long/lat)
         polygon_width_in_meters: width in meters
+        mode: BUFFER_GEODESIC or BUFFER_PROJECTED. Defaults to BUFFER_GEODESIC.
+        capStyle: projected mode end cap style, "flat", "square" or "round". Defaults to "flat".
+        joinStyle: projected mode join style, "mitre", "bevel" or "round". Defaults to "mitre".
+
+    Returns:
+        Polygon of lat/long points
     """
 
     if not geometry or type(geometry) != list or len(geometry) <= 1:
         return None
-    geodesic_pyproj = pyproj.Geod(ellps="WGS84")
+    coordinates = np.asarray([point[:2] for point in geometry], dtype=float)
+
+    if mode == BUFFER_PROJECTED:
+        scale = np.array(
+            [
+                METERS_PER_DEGREE_LATITUDE
+                * math.cos(math.radians(float(np.mean(coordinates[:, 1])))),
+                METERS_PER_DEGREE_LATITUDE,
+            ]
+        )
+        buffered = LineString(coordinates * scale).buffer(
+            polygon_width_in_meters / 2,
+            cap_style=capStyle,
+            join_style=joinStyle,
+            mitre_limit=MITRE_LIMIT,
+        )
+        # Same lat/long order as the geodesic buffer
+        return Polygon((np.asarray(buffered.exterior.coords) / scale)[:, ::-1])
+
+    # Heading of the segment ending at each point, the first point uses the heading of the first segment
+    headings = geospatial_tools.get_headings(coordinates[:-1], coordinates[1:])
+    headings = np.concatenate([headings[:1], headings])
+
+    # Left and right points from direction and distance
+    left_points = geospatial_tools.get_geodesic_end_points(
+        coordinates, headings - 90, polygon_width_in_meters / 2
+    )
+    right_points = geospatial_tools.get_geodesic_end_points(
+        coordinates, headings + 90, polygon_width_in_meters / 2
+    )
+
+    # All left points, then all right points in reverse order, then the first point again to close the polygon
+    # This order is critical to prevent crisscrossing in the polygon
+    polygon_points = np.concatenate([left_points, right_points[::-1], left_points[:1]])
+    return Polygon(polygon_points[:, ::-1])
+
+
+def generate_buffer_polygon_from_linestring_iterative(
+    geometry: list, polygon_width_in_meters: float
+):
+    """Point by point (geopy) implementation of `generate_buffer_polygon_from_linestring`, kept as the reference for tests and benchmarks
+
+    Args:
+        geometry: Linestring (long/lat)
+        polygon_width_in_meters: width in meters
+    """
+
+    if not geometry or type(geometry) != list or len(geometry) <= 1:
+        return None
+    geodesic_pyproj = geospatial_tools.GEOD
 
     # Initializing lists to create polygon
     polygon_left_points = []
@@ -153,8 +226,6 @@ def polygon_to_polyline_center(coordinates):
     if not coordinates or type(coordinates) != list or len(coordinates) < 5:
         return None
 
-    geodesic = pyproj.Geod(ellps="WGS84")
-
     center_lon = 0
     center_lat = 0
 
@@ -165,13 +236,22 @@ def polygon_to_polyline_center(coordinates):
     center_lon /= len(coordinates)
     center_lat /= len(coordinates)
 
-    distances = []
-
-    for i in range(len(coordinates) - 1):
-        avg_lon = (coordinates[i][0] + coordinates[i + 1][0]) / 2
-        avg_lat = (coordinates[i][1] + coordinates[i + 1][1]) / 2
-        _, __, distance = geodesic.inv(avg_lon, avg_lat, center_lon, center_lat)
-        distances.append([distance, [avg_lon, avg_lat]])
+    # Midpoints of all segments, and their distances from the center, in one calculation
+    midpoints = [
+        [
+            (coordinates[i][0] + coordinates[i + 1][0]) / 2,
+            (coordinates[i][1] + coordinates[i + 1][1]) / 2,
+        ]
+        for i in range(len(coordinates) - 1)
+    ]
+    distances = list(
+        zip(
+            geospatial_tools.get_geodesic_distances(
+                midpoints, [center_lon, center_lat]
+            ).tolist(),
+            midpoints,
+        )
+    )
 
     distances = sorted(distances, key=lambda ls: -ls[0])
 
@@ -180,3 +260,119 @@ def polygon_to_polyline_center(coordinates):
     polyline.append(distances[1][1])
 
     return polyline
+
+
+class PolygonIndex:
+    """Spatial index of polygons (e.g. active work zone polygons), for repeated point in polygon tests of many points.
+    Polygons are prepared once and held in an STRtree, so a batch of points is tested only against the polygons whose
+    bounds contain it, with shapely's vectorized `contains_xy`.
+
+        index = PolygonIndex()
+        index.insert(event_id, polygon)
+        matches = index.query([[39.7, -105.0], [39.8, -105.1]])  # polygon ids containing each point
+        index.remove(event_id)
+
+    Points and polygons use the same lat/long order as `is_point_in_polygon`. The STRtree cannot be modified, so it is
+    rebuilt on the first query after polygons are inserted or removed.
+    """
+
+    def __init__(self, polygons: dict = None):
+        """Initialize the index
+
+        Args:
+            polygons (dict, optional): Polygons by id, each a list of lat/longs or shapely.geometry.polygon.Polygon. Defaults to None.
+        """
+        self.polygons: dict = {}
+        self._ids = []
+        self._tree = None
+        for polygonId, polygon in (polygons or {}).items():
+            self.insert(polygonId, polygon)
+
+    def insert(self, polygonId, polygon) -> bool:
+        """Add a polygon to the index, replacing any polygon with the same id
+
+        Args:
+            polygonId: Polygon id, e.g. event ID
+            polygon: list of lat/longs or shapely.geometry.polygon.Polygon
+
+        Returns:
+            bool: Whether the polygon was added
+        """
+        if type(polygon) == list:
+            polygon = list_to_polygon(polygon)
+        if not polygon or type(polygon) != Polygon:
+            logging.warning(f"Invalid polygon for {polygonId}, not indexed")
+            return False
+        shapely.prepare(polygon)
+        self.polygons[polygonId] = polygon
+        self._tree = None
+        return True
+
+    def remove(self, polygonId) -> bool:
+        """Remove a polygon from the index
+
+        Args:
+            polygonId: Polygon id
+
+        Returns:
+            bool: Whether the polygon was in the index
+        """
+        if self.polygons.pop(polygonId, None) is None:
+            return False
+        self._tree = None
+        return True
+
+    def _get_tree(self) -> shapely.STRtree:
+        if self._tree is None:
+            self._ids = list(self.polygons)
+            self._tree = shapely.STRtree(list(self.polygons.values()))
+        return self._tree
+
+    def query(self, points: list) -> list[list]:
+        """Find the polygons containing each point
+
+        Args:
+            points: list of lat/longs
+
+        Returns:
+            list[list]: Ids of the polygons containing each point, in insertion order
+        """
+        if len(points) == 0:
+            return []
+        coordinates = np.asarray([point[:2] for point in points], dtype=float)
+        matches = [[] for _ in range(len(coordinates))]
+        if not self.polygons:
+            return matches
+
+        # Candidate polygons by bounds, then exact tests of all candidates at once
+        tree = self._get_tree()
+        pointIndexes, polygonIndexes = tree.query(shapely.points(coordinates))
+        contained = shapely.contains_xy(
+            tree.geometries[polygonIndexes],
+            coordinates[pointIndexes, 0],
+            coordinates[pointIndexes, 1],
+        )
+        pointIndexes, polygonIndexes = (
+            pointIndexes[contained],
+            polygonIndexes[contained],
+        )
+        for i in np.lexsort([polygonIndexes, pointIndexes]):
+            matches[pointIndexes[i]].append(self._ids[polygonIndexes[i]])
+        return matches
+
+    def contains(self, point) -> list:
+        """Find the polygons containing a point
+
+        Args:
+            point: lat/long
+
+        Returns:
+            list: Ids of the polygons containing the point
+        """
+        return self.query([point])[0]
+
+    def __len__(self) -> int:
+        return len(self.polygons)
+
+    def __contains__(self, polygonId) -> bool:
+        return polygonId in self.polygons